@@ -0,0 +1,170 @@
+"""
+Kształty alfa (alpha shapes) i otoczki wklęsłe z gotowej triangulacji
+
+Trójkąt należy do kształtu alfa, gdy promień jego okręgu opisanego nie
+przekracza alfa. Promienie, krawędzie i sąsiedztwo trójkątów są liczone raz,
+więc kolejne wartości alfa (i całe ich serie) nie powtarzają triangulacji.
+"""
+import numpy as np
+
+from mesh_topology import _directed_edges, edge_triangles, unique_edges
+
+
+def _radii_and_areas(points, simplices):
+    """Promienie okręgów opisanych i pola trójkątów (m,) z jednego przebiegu"""
+    p = np.asarray(points, dtype=np.float64)[np.asarray(simplices).reshape(-1, 3)]
+    a = np.hypot(*(p[:, 1] - p[:, 2]).T)
+    b = np.hypot(*(p[:, 0] - p[:, 2]).T)
+    c = np.hypot(*(p[:, 0] - p[:, 1]).T)
+    area = np.abs((p[:, 1, 0] - p[:, 0, 0]) * (p[:, 2, 1] - p[:, 0, 1])
+                  - (p[:, 2, 0] - p[:, 0, 0]) * (p[:, 1, 1] - p[:, 0, 1])) / 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        radii = a * b * c / (4 * area)
+    radii[~np.isfinite(radii)] = np.inf
+    return radii, area
+
+
+def circumradii(points, simplices):
+    """Promienie okręgów opisanych (m,), jak R = abc / 4P w statistics_collector; inf dla zdegenerowanych"""
+    return _radii_and_areas(points, simplices)[0]
+
+
+class AlphaShape:
+    """Kształt alfa dla triangulacji (points, simplices).
+
+    ``alpha`` jest promieniem: zostają trójkąty z promieniem okręgu opisanego
+    <= alpha (``np.inf`` - cała triangulacja). Brzeg to krawędzie należące
+    do dokładnie jednego zachowanego trójkąta, skierowane jak w nim (obszar
+    po lewej), więc wielokąty zewnętrzne są CCW, a dziury CW.
+    """
+
+    def __init__(self, points, simplices):
+        self.points = np.asarray(points, dtype=np.float64)
+        self.simplices = np.asarray(simplices, dtype=np.int64).reshape(-1, 3)
+        self.radii, self.areas = _radii_and_areas(self.points, self.simplices)
+
+        # Krawędzie: indeks krawędzi dla każdej krawędzi skierowanej (wiersz i*m + t)
+        self._directed = _directed_edges(self.simplices)
+        _, inverse = unique_edges(self.simplices, return_inverse=True)
+        self._edge_ids = inverse.T.ravel()
+        self.edges, triangles = edge_triangles(self.simplices)
+        # Krawędź jest na brzegu dla lo <= alpha < hi (promienie trójkątów po obu stronach)
+        # (nan po stronie bez trójkąta - krawędź otoczki zostaje brzegiem dla każdego alfa)
+        radii = np.append(self.radii, np.nan)[triangles]
+        self._edge_lo = np.fmin(radii[:, 0], radii[:, 1])
+        self._edge_hi = radii.max(axis=1)
+        self._edge_length = np.hypot(*(self.points[self.edges[:, 0]] - self.points[self.edges[:, 1]]).T)
+        self._triangle_pairs = triangles[(triangles >= 0).all(axis=1)]
+        self._tables = None
+
+    @classmethod
+    def from_triangulation(cls, triangulation):
+        """Z BowyerWatsonTriangulation (i pochodnych) lub scipy.spatial.Delaunay"""
+        points = getattr(triangulation, 'points', None)
+        if points is None:
+            points = triangulation.mesh.points
+        return cls(points, triangulation.simplices)
+
+    def mask(self, alpha):
+        """Maska (m,) trójkątów kształtu"""
+        return self.radii <= alpha
+
+    def simplices_for(self, alpha):
+        return self.simplices[self.mask(alpha)]
+
+    def boundary(self, alpha):
+        """Krawędzie brzegowe (B, 2) - zliczanie wystąpień krawędzi wśród zachowanych trójkątów"""
+        kept = np.tile(self.mask(alpha), 3)
+        ids = self._edge_ids[kept]
+        counts = np.bincount(ids, minlength=len(self.edges))
+        return self._directed[kept][counts[ids] == 1]
+
+    def polygons(self, alpha):
+        """Zamknięte łańcuchy brzegu jako listy tablic indeksów punktów"""
+        edges = self.boundary(alpha)
+        if len(edges) == 0:
+            return []
+        # Następnik krawędzi: krawędź wychodząca z jej końca; w wierzchołkach
+        # z kilkoma wyjściami (styk dwóch części) kolejne wejścia dostają kolejne wyjścia
+        incoming = np.argsort(edges[:, 1])
+        outgoing = np.argsort(edges[:, 0])
+        following = np.empty(len(edges), dtype=np.int64)
+        following[incoming] = outgoing
+        following = following.tolist()
+        visited = bytearray(len(edges))
+        starts = edges[:, 0]
+        loops = []
+        for first in range(len(edges)):
+            if visited[first]:
+                continue
+            loop = []
+            e = first
+            while not visited[e]:
+                visited[e] = 1
+                loop.append(e)
+                e = following[e]
+            loops.append(starts[loop])
+        return loops
+
+    def components(self, alpha):
+        """(liczba spójnych części, etykiety (k,) zachowanych trójkątów); części łączą wspólne krawędzie"""
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        keep = self.mask(alpha)
+        index = np.full(len(self.simplices) + 1, -1, dtype=np.int64)
+        index[:-1][keep] = np.arange(np.count_nonzero(keep))
+        pairs = index[self._triangle_pairs]
+        pairs = pairs[(pairs >= 0).all(axis=1)]
+        k = np.count_nonzero(keep)
+        graph = coo_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(k, k))
+        return connected_components(graph, directed=False)
+
+    def _sweep_tables(self):
+        """Posortowane progi i sumy narastające dla sweep(), liczone przy pierwszym użyciu"""
+        if self._tables is not None:
+            return self._tables
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.csgraph import minimum_spanning_tree
+
+        order = np.argsort(self.radii)
+        tables = [self.radii[order], np.concatenate([[0.0], np.cumsum(self.areas[order])])]
+        for thresholds in (self._edge_lo, self._edge_hi):
+            order = np.argsort(thresholds)
+            tables += [thresholds[order], np.concatenate([[0.0], np.cumsum(self._edge_length[order])])]
+
+        # Progi scalania części: krawędzie minimalnego lasu rozpinającego grafu
+        # sąsiedztwa z wagą max(promienie obu trójkątów) - jak w algorytmie Kruskala
+        # dla każdego alfa łączą te same części, co wszystkie krawędzie <= alfa
+        pairs = self._triangle_pairs
+        weights = self.radii[pairs].max(axis=1)
+        finite = np.isfinite(weights)
+        pairs, weights = pairs[finite], weights[finite]
+        # Rangi zamiast wag: zerowe wagi byłyby pominięte przez minimum_spanning_tree
+        order = np.argsort(weights)
+        ranks = np.empty(len(weights))
+        ranks[order] = np.arange(1, len(weights) + 1)
+        m = len(self.simplices)
+        forest = minimum_spanning_tree(coo_matrix((ranks, (pairs[:, 0], pairs[:, 1])), shape=(m, m)).tocsr())
+        tables.append(np.sort(weights[order][forest.data.astype(np.int64) - 1]))
+        self._tables = tables
+        return tables
+
+    def sweep(self, alphas):
+        """Metryki kształtu dla wielu wartości alfa bez ponownego filtrowania.
+
+        Zwraca słownik tablic: liczba trójkątów, pole, obwód brzegu
+        i liczba spójnych części.
+        """
+        alphas = np.asarray(alphas, dtype=np.float64).ravel()
+        radii, areas, lo, lo_length, hi, hi_length, merges = self._sweep_tables()
+        count = np.searchsorted(radii, alphas, side='right')
+        perimeter = (lo_length[np.searchsorted(lo, alphas, side='right')]
+                     - hi_length[np.searchsorted(hi, alphas, side='right')])
+        return {
+            'alpha': alphas,
+            'num_triangles': count,
+            'area': areas[count],
+            'perimeter': perimeter,
+            'components': count - np.searchsorted(merges, alphas, side='right')
+        }
@@ -0,0 +1,126 @@
+"""
+Triangulacja wielu małych, niezależnych zbiorów punktów naraz
+
+Jeden obiekt BowyerWatsonTriangulation obsługuje wszystkie zbiory, trójkąty
+trafiają do wspólnego bufora, a eksport, przenumerowanie i statystyki są
+liczone raz dla całej partii. Wynik jest spakowany: sklejone simplices
+i przesunięcia (jak w formacie CSR).
+"""
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from bowyer_watson import BowyerWatsonTriangulation
+from statistics_collector import TriangulationStatistics
+
+
+def _triangulate_chunk(task):
+    """Trianguluje listę zbiorów, zwraca (simplices, liczby trójkątów)"""
+    point_sets, options = task
+    triangulation = BowyerWatsonTriangulation(**options)
+    raw = array('i')
+    slots = []
+    for points in point_sets:
+        start = len(raw)
+        mesh = triangulation.build_mesh(np.asarray(points, dtype=np.float64).reshape(-1, 2))
+        if mesh is not None:
+            raw.extend(mesh.triangles)
+        slots.append((len(raw) - start) // 3)
+
+    # Wspólny eksport: bez duchów i wolnych miejsc, liczba trójkątów na zbiór
+    triangles = np.frombuffer(raw, dtype=np.int32).reshape(-1, 3)
+    solid = (triangles >= 0).all(axis=1)
+    owner = np.repeat(np.arange(len(point_sets)), slots)
+    counts = np.bincount(owner[solid], minlength=len(point_sets))
+    return triangles[solid].copy(), counts
+
+
+class TriangulationBatch:
+    """Spakowany wynik triangulate_many.
+
+    Trójkąty zbioru i to ``simplices[offsets[i]:offsets[i + 1]]`` z indeksami
+    lokalnymi (względem punktów tego zbioru), a jego punkty w sklejonej
+    tablicy ``points`` zaczynają się od ``point_offsets[i]``.
+    """
+
+    def __init__(self, points, point_offsets, simplices, offsets):
+        self.points = points
+        self.point_offsets = point_offsets
+        self.simplices = simplices
+        self.offsets = offsets
+        self.statistics = None
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        """Simplices zbioru i"""
+        return self.simplices[self.offsets[i]:self.offsets[i + 1]]
+
+    def global_simplices(self):
+        """Simplices z indeksami w sklejonej tablicy points"""
+        owner = np.repeat(np.arange(len(self)), np.diff(self.offsets))
+        return self.simplices + self.point_offsets[owner, None]
+
+    def compute_statistics(self):
+        """Statystyki każdego zbioru jednym wektorowym przebiegiem, słownik tablic (k,)"""
+        quality, areas, angles = TriangulationStatistics().calculate_batch(
+            self.points, self.global_simplices())
+        counts = np.diff(self.offsets)
+        filled = np.flatnonzero(counts)
+        starts = self.offsets[:-1][filled]
+
+        def per_set(values, reduce, empty):
+            result = np.full(len(self), empty, dtype=np.float64)
+            if len(filled):
+                result[filled] = reduce.reduceat(values, starts)
+            return result
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.statistics = {
+                'num_triangles': counts,
+                'quality_mean': per_set(quality, np.add, np.nan) / counts,
+                'quality_min': per_set(quality, np.minimum, np.nan),
+                'quality_max': per_set(quality, np.maximum, np.nan),
+                'area_total': per_set(areas, np.add, 0.0),
+                'angle_min': per_set(angles.min(axis=1), np.minimum, np.nan),
+                'angle_max': per_set(angles.max(axis=1), np.maximum, np.nan)
+            }
+        return self.statistics
+
+
+def triangulate_many(point_sets, workers=1, statistics=True, chunks=None, **options):
+    """Trianguluje listę tablic punktów (n_i, 2), zwraca TriangulationBatch.
+
+    ``workers`` > 1 rozdziela zbiory na ``chunks`` porcji (domyślnie 4 na proces)
+    w puli procesów. ``options`` trafiają do BowyerWatsonTriangulation.
+    """
+    point_sets = [np.asarray(points, dtype=np.float64).reshape(-1, 2) for points in point_sets]
+    sizes = np.array([len(points) for points in point_sets], dtype=np.int64)
+    point_offsets = np.zeros(len(point_sets) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=point_offsets[1:])
+    points = np.concatenate(point_sets) if point_sets else np.empty((0, 2))
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(point_sets) > 1:
+        chunks = min(chunks or 4 * workers, len(point_sets))
+        bounds = np.linspace(0, len(point_sets), chunks + 1).astype(int)
+        tasks = [(point_sets[lo:hi], options) for lo, hi in zip(bounds[:-1], bounds[1:])]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_triangulate_chunk, tasks))
+    else:
+        results = [_triangulate_chunk((point_sets, options))]
+
+    simplices = np.concatenate([result[0] for result in results]) if results \
+        else np.empty((0, 3), dtype=np.int32)
+    counts = np.concatenate([result[1] for result in results]) if results \
+        else np.empty(0, dtype=np.int64)
+    offsets = np.zeros(len(point_sets) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    batch = TriangulationBatch(points, point_offsets, simplices, offsets)
+    if statistics:
+        batch.compute_statistics()
+    return batch
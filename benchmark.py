@@ -0,0 +1,367 @@
+"""
+Pomiary wydajności triangulacji Bowyer-Watson
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from alpha_shapes import AlphaShape
+from batch_triangulation import triangulate_many
+from bowyer_watson import BowyerWatsonTriangulation, Triangle
+from constrained_triangulation import ConstrainedDelaunayTriangulation
+from incremental_triangulation import IncrementalTriangulation
+from instrumentation import InsertionProfiler
+from parallel_triangulation import ParallelTriangulation
+from point_location import TriangulationQuery
+from refinement import DelaunayRefinement
+from statistics_collector import TriangulationStatistics
+from streaming_triangulation import StreamingTriangulation
+
+
+def time_triangulation(points, **options):
+    """Czas jednej triangulacji w sekundach"""
+    triangulation = BowyerWatsonTriangulation(**options)
+    start_time = time.perf_counter()
+    triangulation.triangulate(points)
+    return time.perf_counter() - start_time
+
+
+def benchmark_cavity_search(sizes=(10_000, 100_000, 1_000_000), scan_limit=5_000, seed=0):
+    """Porównuje wyszukiwanie wnęki marszem ('walk') z przeglądem wszystkich trójkątów ('scan').
+
+    Tryb 'scan' jest kwadratowy, więc powyżej ``scan_limit`` punktów jego czas
+    jest ekstrapolowany jako O(n^2) z pomiaru dla ``scan_limit`` punktów.
+    """
+    rng = np.random.default_rng(seed)
+    reference = time_triangulation(rng.random((scan_limit, 2)) * 100, search='scan')
+
+    results = []
+    for n in sizes:
+        points = rng.random((n, 2)) * 100
+        walk_time = time_triangulation(points, search='walk')
+        if n <= scan_limit:
+            scan_time = time_triangulation(points, search='scan')
+            estimated = False
+        else:
+            scan_time = reference * (n / scan_limit) ** 2
+            estimated = True
+        results.append({
+            'n_points': n,
+            'walk_time': walk_time,
+            'scan_time': scan_time,
+            'scan_estimated': estimated,
+            'speedup': scan_time / walk_time
+        })
+    return results
+
+
+def print_cavity_benchmark(results):
+    print(f"{'Punkty':>10} {'walk [s]':>12} {'scan [s]':>14} {'Przyspieszenie':>16}")
+    for row in results:
+        scan = f"{row['scan_time']:.3f}" + ('*' if row['scan_estimated'] else ' ')
+        print(f"{row['n_points']:>10} {row['walk_time']:>12.3f} {scan:>14} "
+              f"{row['speedup']:>15.1f}x")
+    if any(row['scan_estimated'] for row in results):
+        print("* czas ekstrapolowany jako O(n^2)")
+
+
+def clustered_points(n_points, seed=0):
+    """Punkty skupione w czterech klastrach, jak `cluster_points` w test.py"""
+    rng = np.random.default_rng(seed)
+    centers = np.array([[25, 25], [75, 75], [25, 75], [75, 25]])
+    labels = rng.integers(0, len(centers), n_points)
+    return rng.normal(centers[labels], 5)
+
+
+def benchmark_insertion_order(points, orders=('input', 'hilbert', 'morton', 'brio')):
+    """Czas triangulacji dla różnych porządków wstawiania"""
+    return {order: time_triangulation(points, order=order) for order in orders}
+
+
+def benchmark_incremental(n_points=10_000, updates=100, seed=0):
+    """Średni koszt jednej aktualizacji (wstawienie lub usunięcie + statystyki)
+    w porównaniu z pełnym przeliczeniem triangulacji i statystyk"""
+    rng = np.random.default_rng(seed)
+    points = rng.random((n_points, 2)) * 100
+    triangulation = IncrementalTriangulation(points)
+    triangulation.statistics()
+
+    start_time = time.perf_counter()
+    for _ in range(updates):
+        triangulation.insert(rng.random(2) * 100)
+        triangulation.statistics()
+    insert_time = (time.perf_counter() - start_time) / updates
+
+    start_time = time.perf_counter()
+    for vertex in rng.choice(n_points, updates, replace=False):
+        triangulation.remove(vertex)
+        triangulation.statistics()
+    remove_time = (time.perf_counter() - start_time) / updates
+
+    start_time = time.perf_counter()
+    simplices = BowyerWatsonTriangulation().triangulate(points)
+    TriangulationStatistics().calculate_statistics(points, simplices)
+    full_time = time.perf_counter() - start_time
+
+    return {
+        'n_points': n_points,
+        'insert_time': insert_time,
+        'remove_time': remove_time,
+        'full_time': full_time
+    }
+
+
+def benchmark_parallel(n_points=200_000, worker_counts=(1, 2, 4, 8, 16, 32), seed=0):
+    """Czas i przyspieszenie triangulacji pasami względem wersji szeregowej"""
+    rng = np.random.default_rng(seed)
+    points = rng.random((n_points, 2)) * 100
+
+    start_time = time.perf_counter()
+    serial = BowyerWatsonTriangulation(order='brio').triangulate(points)
+    serial_time = time.perf_counter() - start_time
+    canonical = np.unique(np.sort(serial, axis=1), axis=0)
+
+    results = []
+    for workers in worker_counts:
+        triangulation = ParallelTriangulation(workers=workers, order='brio')
+        start_time = time.perf_counter()
+        simplices = triangulation.triangulate(points)
+        elapsed = time.perf_counter() - start_time
+        results.append({
+            'workers': workers,
+            'time': elapsed,
+            'speedup': serial_time / elapsed,
+            'seam_points': triangulation.seam_points,
+            'matches_serial': np.array_equal(
+                np.unique(np.sort(simplices, axis=1), axis=0), canonical)
+        })
+    return serial_time, results
+
+
+def benchmark_point_location(n_points=100_000, n_queries=1_000_000, seed=0):
+    """Przepustowość zapytań (zapytania/s) względem scipy: find_simplex i cKDTree"""
+    from scipy.spatial import Delaunay, cKDTree
+
+    rng = np.random.default_rng(seed)
+    points = rng.random((n_points, 2)) * 100
+    queries = rng.random((n_queries, 2)) * 110 - 5
+    triangulation = BowyerWatsonTriangulation(order='brio')
+    triangulation.triangulate(points)
+    scipy_tri = Delaunay(points)
+    tree = cKDTree(points)
+
+    start_time = time.perf_counter()
+    query = TriangulationQuery.from_triangulation(triangulation)
+    build_time = time.perf_counter() - start_time
+
+    def throughput(function):
+        start_time = time.perf_counter()
+        result = function(queries)
+        return n_queries / (time.perf_counter() - start_time), result
+
+    ours_simplex, simplices = throughput(query.find_simplex)
+    scipy_simplex, scipy_simplices = throughput(scipy_tri.find_simplex)
+    ours_nearest, nearest = throughput(query.nearest_vertex)
+    kdtree_nearest, (_, kdtree) = throughput(tree.query)
+    return {
+        'build_time': build_time,
+        'find_simplex': ours_simplex,
+        'scipy_find_simplex': scipy_simplex,
+        'nearest_vertex': ours_nearest,
+        'kdtree_query': kdtree_nearest,
+        'outside_agree': bool(np.array_equal(simplices < 0, scipy_simplices < 0)),
+        'nearest_agree': bool(np.allclose(np.hypot(*(points[nearest] - queries).T),
+                                          np.hypot(*(points[kdtree] - queries).T)))
+    }
+
+
+def benchmark_constrained(n_segments=100_000, n_points=100_000, lines=100, seed=0):
+    """Czas wymuszania odcinków (łamane sinusoidalne w kwadracie z brzegiem)
+    względem triangulacji samych punktów"""
+    rng = np.random.default_rng(seed)
+    per_line = n_segments // lines
+    x = np.linspace(0, 100, per_line + 1)
+    polylines = [np.column_stack([x, (i + 0.5) * 100 / lines
+                                  + 0.3 * 100 / lines * np.sin(x * rng.uniform(0.1, 1))])
+                 for i in range(lines)]
+    points = np.vstack([rng.random((n_points, 2)) * 100] + polylines)
+    first = n_points + np.arange(lines)[:, None] * (per_line + 1) + np.arange(per_line)
+    segments = np.column_stack([first.ravel(), first.ravel() + 1])
+
+    triangulation = ConstrainedDelaunayTriangulation(seed=seed)
+    start_time = time.perf_counter()
+    triangulation.insert_many(points)
+    points_time = time.perf_counter() - start_time
+
+    simplices = triangulation.simplices.astype(np.int64)
+    n = len(points)
+    edges = np.concatenate([simplices[:, [0, 1]], simplices[:, [1, 2]], simplices[:, [2, 0]]])
+    edges = np.sort(edges, axis=1)
+    missing = np.count_nonzero(~np.isin(segments[:, 0] * n + segments[:, 1],
+                                        edges[:, 0] * n + edges[:, 1]))
+
+    start_time = time.perf_counter()
+    triangulation.insert_segments(segments)
+    segments_time = time.perf_counter() - start_time
+    return {
+        'n_points': n,
+        'n_segments': len(segments),
+        'missing': missing,
+        'points_time': points_time,
+        'segments_time': segments_time,
+        'constraints': len(triangulation.constraints)
+    }
+
+
+def benchmark_refinement(n_points=1_000, triangles=100_000, min_angle=28.0, seed=0):
+    """Czas poprawy jakości do około ``triangles`` trójkątów (ograniczenie pola)"""
+    rng = np.random.default_rng(seed)
+    triangulation = ConstrainedDelaunayTriangulation(rng.random((n_points, 2)) * 100, seed=seed)
+    refinement = DelaunayRefinement(min_angle=min_angle, max_area=100 * 100 / triangles * 1.5)
+    statistics = refinement.refine(triangulation)
+    return {
+        'triangles': statistics['num_triangles'],
+        'points_added': statistics['points_added'],
+        'angle_min': statistics['angle_min'],
+        'quality_min': statistics['quality_min'],
+        'time': statistics['refinement_time']
+    }
+
+
+def benchmark_batch(n_sets=2_000, sizes=(10, 500), workers=(1, 4), seed=0):
+    """Wiele małych zbiorów: osobne wywołania (z statystykami) vs triangulate_many"""
+    rng = np.random.default_rng(seed)
+    point_sets = [rng.random((size, 2)) * 100
+                  for size in rng.integers(sizes[0], sizes[1] + 1, n_sets)]
+
+    start_time = time.perf_counter()
+    statistics = TriangulationStatistics()
+    for points in point_sets:
+        statistics.calculate_statistics(points, BowyerWatsonTriangulation().triangulate(points))
+    results = {'separate': time.perf_counter() - start_time}
+    for count in workers:
+        start_time = time.perf_counter()
+        triangulate_many(point_sets, workers=count)
+        results[f'batch_{count}'] = time.perf_counter() - start_time
+    return results
+
+
+def benchmark_streaming(n_points=200_000, chunk_size=10_000, seed=0):
+    """Strumień porcji posortowanych po x do pliku vs triangulacja w pamięci"""
+    points = np.random.default_rng(seed).random((n_points, 2)) * 100
+    points = points[np.argsort(points[:, 0])]
+    in_memory = time_triangulation(points, order='hilbert')
+    with tempfile.TemporaryDirectory() as directory:
+        chunks = (points[start:start + chunk_size] for start in range(0, n_points, chunk_size))
+        summary = StreamingTriangulation().triangulate_stream(
+            chunks, os.path.join(directory, 'stream.bwmesh'))
+    summary['in_memory_time'] = in_memory
+    return summary
+
+
+def benchmark_alpha_shapes(n_points=20_000, n_alphas=50, seed=0):
+    """Seria wartości alfa: filtrowanie obiektami Triangle dla każdego alfa vs AlphaShape.sweep"""
+    points = clustered_points(n_points, seed)
+    simplices = BowyerWatsonTriangulation(order='hilbert').triangulate(points)
+    alphas = np.linspace(0.5, 5.0, n_alphas)
+
+    start_time = time.perf_counter()
+    for simplex in simplices[:len(simplices) // 10]:
+        Triangle(*points[simplex]).circumradius
+    # Python dla 10% trójkątów i jednego alfa, ekstrapolowane na całą serię
+    naive = (time.perf_counter() - start_time) * 10 * n_alphas
+    start_time = time.perf_counter()
+    shape = AlphaShape(points, simplices)
+    shape.sweep(alphas)
+    return {'naive_estimated': naive, 'sweep': time.perf_counter() - start_time}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--scan-limit', type=int, default=5_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument('--profile', action='store_true',
+                        help='tylko triangulacja z rozbiciem czasu na fazy')
+    args = parser.parse_args()
+
+    if args.profile:
+        rng = np.random.default_rng(args.seed)
+        for n in args.sizes:
+            print(f"=== Profil triangulacji, {n} punktów ===\n")
+            profiler = InsertionProfiler()
+            BowyerWatsonTriangulation(profiler=profiler).triangulate(rng.random((n, 2)) * 100)
+            profiler.print_summary()
+            print()
+        return
+
+    print("=== Wyszukiwanie wnęki: marsz + BFS vs przegląd wszystkich trójkątów ===\n")
+    print_cavity_benchmark(benchmark_cavity_search(args.sizes, args.scan_limit, args.seed))
+
+    n = args.sizes[0]
+    print(f"\n=== Porządek wstawiania, {n} punktów w klastrach ===\n")
+    for order, elapsed in benchmark_insertion_order(clustered_points(n, args.seed)).items():
+        print(f"{order:>10} {elapsed:>10.3f} s")
+
+    print(f"\n=== Aktualizacja przyrostowa vs pełne przeliczenie, {n} punktów ===\n")
+    result = benchmark_incremental(n, seed=args.seed)
+    print(f"Wstawienie + statystyki: {result['insert_time'] * 1e3:.3f} ms")
+    print(f"Usunięcie + statystyki:  {result['remove_time'] * 1e3:.3f} ms")
+    print(f"Pełne przeliczenie:      {result['full_time'] * 1e3:.3f} ms")
+
+    print(f"\n=== Triangulacja równoległa, {n} punktów ===\n")
+    serial_time, results = benchmark_parallel(n, args.workers, args.seed)
+    print(f"Szeregowo: {serial_time:.3f} s")
+    for row in results:
+        print(f"{row['workers']:>4} proc.: {row['time']:>8.3f} s  "
+              f"przyspieszenie {row['speedup']:>5.2f}x  "
+              f"punkty szwów {row['seam_points']:>7}  "
+              f"zgodność {'tak' if row['matches_serial'] else 'NIE'}")
+
+    print(f"\n=== Zapytania o położenie, {n} punktów, 10^6 zapytań ===\n")
+    result = benchmark_point_location(n, seed=args.seed)
+    print(f"Budowa indeksu: {result['build_time']:.3f} s")
+    print(f"find_simplex:   {result['find_simplex']:>12,.0f} zapytań/s  "
+          f"(scipy {result['scipy_find_simplex']:,.0f}/s, "
+          f"zgodność {'tak' if result['outside_agree'] else 'NIE'})")
+    print(f"nearest_vertex: {result['nearest_vertex']:>12,.0f} zapytań/s  "
+          f"(cKDTree {result['kdtree_query']:,.0f}/s, "
+          f"zgodność {'tak' if result['nearest_agree'] else 'NIE'})")
+
+    print(f"\n=== Odcinki wymuszone, {n} punktów + 10^5 odcinków ===\n")
+    result = benchmark_constrained(n_points=n, seed=args.seed)
+    print(f"Triangulacja punktów:  {result['points_time']:.3f} s ({result['n_points']} punktów)")
+    print(f"Wymuszenie odcinków:   {result['segments_time']:.3f} s "
+          f"({result['n_segments']} odcinków, brakujących w triangulacji Delaunay'a: "
+          f"{result['missing']})")
+
+    print("\n=== Wiele małych zbiorów (2000 zbiorów po 10-500 punktów) ===\n")
+    result = benchmark_batch(workers=[1] + [count for count in args.workers if count > 1][:1],
+                             seed=args.seed)
+    for name, elapsed in result.items():
+        print(f"{name:>10} {elapsed:>10.3f} s")
+
+    print("\n=== Poprawa jakości (Ruppert), kąt minimalny 28° ===\n")
+    result = benchmark_refinement(seed=args.seed)
+    print(f"{result['triangles']} trójkątów (+{result['points_added']} punktów) "
+          f"w {result['time']:.3f} s, najmniejszy kąt {result['angle_min']:.2f}°, "
+          f"jakość min. {result['quality_min']:.3f}")
+
+    print("\n=== Kształty alfa (20000 punktów w klastrach, 50 wartości alfa) ===\n")
+    result = benchmark_alpha_shapes(seed=args.seed)
+    print(f"filtrowanie w Pythonie ~{result['naive_estimated']:.3f} s (ekstrapolacja), "
+          f"AlphaShape.sweep {result['sweep']:.3f} s")
+
+    print("\n=== Triangulacja strumieniowa (200000 punktów, porcje po 10000) ===\n")
+    result = benchmark_streaming(seed=args.seed)
+    print(f"{result['num_triangles']} trójkątów w {result['triangulation_time']:.3f} s "
+          f"(w pamięci {result['in_memory_time']:.3f} s), szczyt frontu: "
+          f"{result['peak_triangles']} trójkątów, {result['peak_vertices']} wierzchołków")
+
+
+if __name__ == "__main__":
+    main()
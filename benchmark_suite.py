@@ -0,0 +1,183 @@
+"""
+Zestaw pomiarów skalowania triangulacji względem scipy.spatial.Delaunay
+
+Dla każdego rozkładu punktów i rozmiaru (skala logarytmiczna) mierzy
+czas kilku powtórzeń (mediana i rozstęp międzykwartylowy) oraz szczytowe
+zużycie pamięci (tracemalloc). Wyniki zapisywane są do JSON, aby można
+było porównywać kolejne przebiegi.
+"""
+import argparse
+import datetime
+import json
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+from delaunay_triangulation import ENGINES, triangulate_with
+
+DISTRIBUTIONS = ('uniform', 'clustered', 'cocircular', 'grid', 'collinear')
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+def generate_distribution(name, n_points, seed=0):
+    """Punkty testowe o zadanym rozkładzie (w kwadracie [0, 100]^2)"""
+    rng = np.random.default_rng(seed)
+    if name == 'uniform':
+        return rng.random((n_points, 2)) * 100
+    if name == 'clustered':
+        centers = np.array([[25, 25], [75, 75], [25, 75], [75, 25]])
+        return rng.normal(centers[rng.integers(0, len(centers), n_points)], 5)
+    if name == 'cocircular':
+        # Jak w test.py: punkty na okręgu i jeden w środku
+        angles = np.linspace(0, 2 * np.pi, n_points - 1, endpoint=False)
+        circle = np.column_stack([50 + 30 * np.cos(angles), 50 + 30 * np.sin(angles)])
+        return np.vstack([circle, [[50, 50]]])
+    if name == 'grid':
+        side = int(np.ceil(np.sqrt(n_points)))
+        x, y = np.meshgrid(np.linspace(0, 100, side), np.linspace(0, 100, side))
+        return np.column_stack([x.ravel(), y.ravel()])[:n_points]
+    if name == 'collinear':
+        # Prawie wszystkie punkty na jednej prostej i po jednym z każdej strony
+        t = rng.random(n_points - 2) * 100
+        line = np.column_stack([t, 0.5 * t + 10])
+        return np.vstack([line, [[50, 80], [50, 0]]])
+    raise ValueError(f"Nieznany rozkład punktów: {name!r}")
+
+
+def measure(engine, points, repeats=5):
+    """Czasy powtórzeń silnika z ENGINES (perf_counter), szczytowa pamięć i liczba trójkątów"""
+    times = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        simplices = triangulate_with(engine, points)['simplices']
+        times.append(time.perf_counter() - start_time)
+
+    # Osobny przebieg pod tracemalloc, by śledzenie nie zaburzało czasów
+    tracemalloc.start()
+    try:
+        triangulate_with(engine, points)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    q1, median, q3 = np.percentile(times, [25, 50, 75])
+    return {
+        'times': times,
+        'median': float(median),
+        'iqr': float(q3 - q1),
+        'peak_memory_bytes': int(peak),
+        'num_triangles': int(len(simplices))
+    }
+
+
+def run_suite(distributions=DISTRIBUTIONS, sizes=DEFAULT_SIZES, engines=tuple(ENGINES),
+              repeats=5, max_seconds=60.0, seed=0):
+    """Pełny zestaw pomiarów.
+
+    Gdy pojedynczy przebieg silnika przekroczy ``max_seconds``, większe
+    rozmiary dla tego silnika i rozkładu są pomijane.
+    """
+    records = []
+    for distribution in distributions:
+        too_slow = set()
+        # Liczba powtórzeń osobno dla każdego silnika
+        runs = dict.fromkeys(engines, repeats)
+        for n in sizes:
+            points = generate_distribution(distribution, n, seed)
+            for engine in engines:
+                record = {'distribution': distribution, 'n_points': n, 'engine': engine}
+                if engine in too_slow:
+                    record['skipped'] = True
+                    records.append(record)
+                    continue
+                try:
+                    record.update(measure(engine, points, runs[engine]))
+                except Exception as error:  # np. QhullError dla danych zdegenerowanych
+                    record['error'] = f"{type(error).__name__}: {error}"
+                else:
+                    if record['median'] > max_seconds:
+                        too_slow.add(engine)
+                    elif record['median'] * runs[engine] > max_seconds:
+                        # Przy długich przebiegach wystarczy mniej powtórzeń
+                        runs[engine] = max(1, runs[engine] // 2)
+                records.append(record)
+                print(format_record(record))
+    return {
+        'metadata': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeats': repeats,
+            'seed': seed
+        },
+        'records': records
+    }
+
+
+def format_record(record):
+    head = f"{record['distribution']:>10} {record['n_points']:>9} {record['engine']:>14}"
+    if record.get('skipped'):
+        return f"{head}  pominięto (limit czasu)"
+    if 'error' in record:
+        return f"{head}  błąd: {record['error'].splitlines()[0]}"
+    return (f"{head}  {record['median']:>10.4f} s  IQR {record['iqr']:.4f} s  "
+            f"{record['peak_memory_bytes'] / 2**20:>9.1f} MiB  {record['num_triangles']:>9} trójkątów")
+
+
+def save_results(results, path):
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2)
+
+
+def load_results(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare_results(baseline, current, threshold=1.2):
+    """Porównuje mediany czasów dwóch przebiegów; zwraca listę regresji"""
+    def key(record):
+        return record['distribution'], record['n_points'], record['engine']
+
+    previous = {key(r): r for r in baseline['records'] if 'median' in r}
+    regressions = []
+    for record in current['records']:
+        old = previous.get(key(record))
+        if old is None or 'median' not in record:
+            continue
+        ratio = record['median'] / old['median']
+        marker = '  <-- regresja' if ratio > threshold else ''
+        print(f"{' '.join(map(str, key(record))):>40}  {old['median']:.4f} s -> "
+              f"{record['median']:.4f} s  ({ratio:.2f}x){marker}")
+        if ratio > threshold:
+            regressions.append((key(record), ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--distributions', nargs='+', default=list(DISTRIBUTIONS))
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--max-seconds', type=float, default=60.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', metavar='BASELINE_JSON',
+                        help='porównaj z wcześniejszym przebiegiem')
+    args = parser.parse_args()
+
+    results = run_suite(args.distributions, args.sizes, args.engines,
+                        args.repeats, args.max_seconds, args.seed)
+    save_results(results, args.output)
+    print(f"\nZapisano wyniki do {args.output}")
+    if args.compare:
+        print("\n=== Porównanie z przebiegiem bazowym ===")
+        compare_results(load_results(args.compare), results)
+
+
+if __name__ == "__main__":
+    main()
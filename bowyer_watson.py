@@ -1,6 +1,13 @@
 import numpy as np
 from typing import List, Tuple, Set
 import math
+import time
+from array import array
+
+from insertion_order import ORDERS, insertion_order
+from mesh_topology import unique_edges
+from predicates import circumcenter, get_counters, incircle, orient2d
+from triangle_mesh import TriangleMesh, GHOST
 
 class Triangle:
     def __init__(self, p1, p2, p3):
@@ -10,33 +17,24 @@ class Triangle:
     def calculate_circumcircle(self):
         p1, p2, p3 = self.vertices
         
-        # Współrzędne wierzchołków
-        ax, ay = p1[0], p1[1]
-        bx, by = p2[0], p2[1]
-        cx, cy = p3[0], p3[1]
-        
-        # Obliczenie wyznacznika
-        D = 2 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
-        
-        if abs(D) < 1e-10:  # Punkty współliniowe
+        # Środek okręgu opisanego (None dla punktów współliniowych)
+        center = circumcenter(p1[0], p1[1], p2[0], p2[1], p3[0], p3[1])
+        if center is None:
             return np.array([0, 0]), float('inf')
         
-        # Środek okręgu opisanego
-        ux = ((ax**2 + ay**2) * (by - cy) + (bx**2 + by**2) * (cy - ay) + 
-              (cx**2 + cy**2) * (ay - by)) / D
-        uy = ((ax**2 + ay**2) * (cx - bx) + (bx**2 + by**2) * (ax - cx) + 
-              (cx**2 + cy**2) * (bx - ax)) / D
-        
-        circumcenter = np.array([ux, uy])
-        
         # Promień okręgu opisanego
-        circumradius = np.linalg.norm(p1 - circumcenter)
+        circumradius = math.hypot(p1[0] - center[0], p1[1] - center[1])
         
-        return circumcenter, circumradius
+        return np.array(center), circumradius
     
     def contains_in_circumcircle(self, point):
-        distance = np.linalg.norm(point - self.circumcenter)
-        return distance <= self.circumradius + 1e-10  # Tolerancja numeryczna
+        (ax, ay), (bx, by), (cx, cy) = self.vertices
+        orientation = orient2d(ax, ay, bx, by, cx, cy)
+        if orientation == 0:  # Okrąg o nieskończonym promieniu
+            return True
+        # Test dokładny, punkty na okręgu są traktowane jako wewnętrzne
+        det = incircle(ax, ay, bx, by, cx, cy, point[0], point[1])
+        return det == 0 or (det > 0) == (orientation > 0)
     
     def __eq__(self, other):
         if not isinstance(other, Triangle):
@@ -49,93 +47,309 @@ class Triangle:
 
 class BowyerWatsonTriangulation:
     
-    def __init__(self):
-        self.triangles = []
+    SEARCH_MODES = ('walk', 'scan')
+    
+    def __init__(self, search='walk', order=None, seed=None, profiler=None):
+        if search not in self.SEARCH_MODES:
+            raise ValueError(f"Nieznany tryb wyszukiwania wnęki: {search!r}")
+        if order is not None and order not in ORDERS:
+            raise ValueError(f"Nieznany porządek wstawiania: {order!r}")
+        self.search = search
+        # Porządek wstawiania: None/'input', 'hilbert', 'morton' lub 'brio'
+        self.order = order
+        self.seed = seed
+        # Opcjonalny InsertionProfiler (instrumentation.py); None - brak narzutu
+        self.profiler = profiler
+        self.mesh = None
+        self.simplices = np.empty((0, 3), dtype=np.int32)
+        self.neighbors = np.empty((0, 3), dtype=np.int32)
+        self._last = 0
+        self._buckets = None
+        # Liczba dokładnych obliczeń predykatów w ostatniej triangulacji
+        self.predicate_fallbacks = {}
+    
+    def find_initial_triangle(self, mesh, order):
+        """Zwraca trzy pierwsze niewspółliniowe punkty (CCW) lub None"""
+        xs, ys = mesh.xs, mesh.ys
+        a = order[0]
+        b = None
+        for i in order[1:]:
+            if xs[i] != xs[a] or ys[i] != ys[a]:
+                b = i
+                break
+        if b is None:
+            return None
+        for c in order:
+            o = orient2d(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c])
+            if o > 0:
+                return a, b, c
+            if o < 0:
+                return a, c, b
+        return None
+    
+    def _init_mesh(self, mesh, a, b, c):
+        # Trójkąt startowy i trzy duchy na jego krawędziach
+        t = mesh.add_triangle(a, b, c)
+        g_ab = mesh.add_triangle(b, a, GHOST)
+        g_bc = mesh.add_triangle(c, b, GHOST)
+        g_ca = mesh.add_triangle(a, c, GHOST)
+        mesh.link(t, 0, g_bc, 2)
+        mesh.link(t, 1, g_ca, 2)
+        mesh.link(t, 2, g_ab, 2)
+        # Duchy sąsiadują ze sobą przez krawędzie do wierzchołka GHOST
+        mesh.link(g_ab, 0, g_ca, 1)
+        mesh.link(g_ab, 1, g_bc, 0)
+        mesh.link(g_bc, 1, g_ca, 0)
+        return t
+    
+    def _in_conflict(self, mesh, t, px, py):
+        """Czy punkt leży w (uogólnionym) okręgu opisanym trójkąta t"""
+        xs, ys = mesh.xs, mesh.ys
+        k = 3 * t
+        a = mesh.triangles[k]
+        b = mesh.triangles[k + 1]
+        c = mesh.triangles[k + 2]
+        if c == GHOST:
+            # Okrąg ducha to otwarta półpłaszczyzna na zewnątrz krawędzi
+            # wraz z otwartym odcinkiem (a, b)
+            ax, ay, bx, by = xs[a], ys[a], xs[b], ys[b]
+            o = orient2d(ax, ay, bx, by, px, py)
+            if o != 0:
+                return o > 0
+            if ax != bx:
+                return min(ax, bx) < px < max(ax, bx)
+            return min(ay, by) < py < max(ay, by)
+        return incircle(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c], px, py) > 0
     
-    def create_super_triangle(self, points):
-        # Znalezienie ograniczeń punktów
-        min_x = np.min(points[:, 0])
-        max_x = np.max(points[:, 0])
-        min_y = np.min(points[:, 1])
-        max_y = np.max(points[:, 1])
+    def _init_buckets(self, points):
+        # Siatka kubełków z ostatnim trójkątem utworzonym w każdej komórce
+        # (jump-and-walk: marsz startuje blisko punktu, a nie od ostatniego trójkąta)
+        lo = points.min(axis=0)
+        self._bucket_span = np.maximum(points.max(axis=0) - lo, 1e-300)
+        self._bucket_origin = (float(lo[0]), float(lo[1]))
+        self._bucket_count = 0
+        self._buckets = array('i', [self._last])
+        self._set_bucket_size(1)
+    
+    def _set_bucket_size(self, size):
+        self._bucket_grid = (self._bucket_origin[0], self._bucket_origin[1],
+                             size / float(self._bucket_span[0]),
+                             size / float(self._bucket_span[1]), size)
+    
+    def _refine_buckets(self):
+        # Podwojenie rozdzielczości - komórki dziedziczą trójkąt po rodzicu,
+        # łączny koszt przebudów jest liniowy
+        old = self._buckets
+        size = self._bucket_grid[4]
+        fine = 2 * size
+        self._buckets = array('i', [old[(j // 2) * size + i // 2]
+                                    for j in range(fine) for i in range(fine)])
+        self._set_bucket_size(fine)
+    
+    def _bucket(self, px, py):
+        x0, y0, sx, sy, size = self._bucket_grid
+        i = min(max(int((px - x0) * sx), 0), size - 1)
+        j = min(max(int((py - y0) * sy), 0), size - 1)
+        return j * size + i
+    
+    def _locate(self, mesh, px, py):
+        """Marsz widocznościowy od trójkąta z kubełka do trójkąta w konflikcie z punktem"""
+        tri = mesh.triangles
+        nbr = mesh.neighbors
+        xs, ys = mesh.xs, mesh.ys
+        t = self._last
+        if self._buckets is not None:
+            t = self._buckets[self._bucket(px, py)]
+            if tri[3 * t] < 0:
+                t = self._last
+        if tri[3 * t + 2] == GHOST:
+            if self._in_conflict(mesh, t, px, py):
+                return t
+            t = nbr[3 * t + 2]
+        previous = GHOST
+        while True:
+            k = 3 * t
+            a, b, c = tri[k], tri[k + 1], tri[k + 2]
+            if c == GHOST:
+                # Wyjście poza otoczkę - punkt leży na zewnątrz krawędzi ducha
+                return t
+            ax, ay, bx, by, cx, cy = xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]
+            if nbr[k + 2] != previous and orient2d(ax, ay, bx, by, px, py) < 0:
+                previous, t = t, nbr[k + 2]
+            elif nbr[k] != previous and orient2d(bx, by, cx, cy, px, py) < 0:
+                previous, t = t, nbr[k]
+            elif nbr[k + 1] != previous and orient2d(cx, cy, ax, ay, px, py) < 0:
+                previous, t = t, nbr[k + 1]
+            else:
+                if ((px == ax and py == ay) or (px == bx and py == by)
+                        or (px == cx and py == cy)):
+                    return None  # Punkt powtórzony
+                return t
+    
+    def _grow_cavity(self, mesh, start, px, py):
+        """Przeszukiwanie wszerz po sąsiadach od trójkąta startowego"""
+        tri = mesh.triangles
+        nbr = mesh.neighbors
+        cavity = [start]
+        bad = {start}
+        boundary = []
+        stack = [start]
+        while stack:
+            t = stack.pop()
+            k = 3 * t
+            for i in range(3):
+                outer = nbr[k + i]
+                if outer in bad:
+                    continue
+                if self._in_conflict(mesh, outer, px, py):
+                    bad.add(outer)
+                    cavity.append(outer)
+                    stack.append(outer)
+                else:
+                    # Nieudzielona półkrawędź - fragment brzegu wnęki
+                    boundary.append((tri[k + (i + 1) % 3], tri[k + (i + 2) % 3],
+                                     outer, mesh.neighbor_index(outer, t)))
+        return cavity, boundary
+    
+    def _scan_cavity(self, mesh, px, py):
+        """Przegląd wszystkich trójkątów siatki"""
+        tri = mesh.triangles
+        nbr = mesh.neighbors
+        cavity = [t for t in mesh.live_triangles()
+                  if self._in_conflict(mesh, t, px, py)]
+        bad = set(cavity)
+        boundary = []
+        for t in cavity:
+            k = 3 * t
+            for i in range(3):
+                outer = nbr[k + i]
+                if outer not in bad:
+                    boundary.append((tri[k + (i + 1) % 3], tri[k + (i + 2) % 3],
+                                     outer, mesh.neighbor_index(outer, t)))
+        return cavity, boundary
+    
+    def _cavity_from(self, mesh, start, px, py):
+        """Argumenty _insert od trójkąta znalezionego przez _locate"""
+        return self._grow_cavity(mesh, start, px, py)
+    
+    def _find_cavity(self, mesh, px, py):
+        """Zwraca (wnęka, krawędzie brzegowe) lub None dla punktu powtórzonego"""
+        if self.search == 'scan':
+            cavity, boundary = self._scan_cavity(mesh, px, py)
+            # Pusta wnęka oznacza punkt powtórzony
+            return (cavity, boundary) if cavity else None
+        start = self._locate(mesh, px, py)
+        if start is None:
+            return None
+        return self._cavity_from(mesh, start, px, py)
+    
+    def _insertion_sizes(self, found):
+        """(rozmiar wnęki, liczba krawędzi jej brzegu) ostatniego wstawienia - dla profilera"""
+        cavity, boundary = found
+        return len(cavity), len(boundary)
+    
+    def _insert(self, mesh, v, cavity, boundary):
+        """Zastępuje wnękę wachlarzem trójkątów wokół wierzchołka v"""
+        tri = mesh.triangles
+        nbr = mesh.neighbors
         
-        # Margines
-        margin = max(max_x - min_x, max_y - min_y) * 0.5
+        for t in cavity:
+            mesh.remove_triangle(t)
         
-        # Wierzchołki super-trójkąta
-        p1 = np.array([min_x - margin, min_y - margin])
-        p2 = np.array([max_x + margin, min_y - margin])
-        p3 = np.array([(min_x + max_x) / 2, max_y + 2 * margin])
+        new = [mesh.add_triangle(a, b, v) for a, b, _, _ in boundary]
+        starts = {edge[0]: t for edge, t in zip(boundary, new)}
+        ends = {edge[1]: t for edge, t in zip(boundary, new)}
         
-        return Triangle(p1, p2, p3)
+        for (a, b, outer, j), t in zip(boundary, new):
+            # Sąsiedzi w kolejności (naprzeciw a, naprzeciw b, naprzeciw v)
+            verts = (a, b, v)
+            nbrs = (starts[b], ends[a], outer)
+            # Obrót tak, by wierzchołek GHOST był zawsze na pozycji 2
+            s = 1 if a == GHOST else 2 if b == GHOST else 0
+            k = 3 * t
+            for i in range(3):
+                tri[k + i] = verts[(i + s) % 3]
+                nbr[k + i] = nbrs[(i + s) % 3]
+            nbr[3 * outer + j] = t
+        self._last = new[-1]
+        if self._buckets is not None:
+            self._remember(mesh, v, new[0])
+        return new
     
-    def triangulate(self, points):
-        if len(points) < 3:
-            return []
-        
-        # 1. Tworzenie super-trójkąta
-        super_triangle = self.create_super_triangle(points)
-        self.triangles = [super_triangle]
+    def _remember(self, mesh, v, t):
+        """Trójkąt t przy wierzchołku v jako start marszów z kubełka punktu v"""
+        self._buckets[self._bucket(mesh.xs[v], mesh.ys[v])] = t
+        self._bucket_count += 1
+        if self._bucket_count > 2 * len(self._buckets):
+            self._refine_buckets()
+    
+    def _build(self, mesh, order):
+        """Wstawia wierzchołki w podanej kolejności, False gdy są współliniowe"""
+        # 1. Trójkąt startowy z trzech niewspółliniowych punktów
+        initial = self.find_initial_triangle(mesh, order)
+        if initial is None:
+            return False
+        self._last = self._init_mesh(mesh, *initial)
+        self._buckets = None
+        if self.search == 'walk' and self.order in (None, 'input'):
+            # Przy porządku przestrzennym ostatni trójkąt jest już blisko punktu
+            self._init_buckets(mesh.points[order])
         
         # 2. Dodawanie punktów pojedynczo
-        for point in points:
-            # Znajdowanie trójkątów, których okręgi opisane zawierają nowy punkt
-            bad_triangles = []
-            for triangle in self.triangles:
-                if triangle.contains_in_circumcircle(point):
-                    bad_triangles.append(triangle)
-            
-            # Znajdowanie krawędzi wielokąta
-            polygon = []
-            for i, triangle1 in enumerate(bad_triangles):
-                for j in range(3):
-                    edge = [triangle1.vertices[j], triangle1.vertices[(j + 1) % 3]]
-                    
-                    # Sprawdzanie czy krawędź jest współdzielona
-                    is_shared = False
-                    for k, triangle2 in enumerate(bad_triangles):
-                        if i != k:
-                            vertices2 = set(map(tuple, triangle2.vertices))
-                            if (tuple(edge[0]) in vertices2 and 
-                                tuple(edge[1]) in vertices2):
-                                is_shared = True
-                                break
-                    
-                    if not is_shared:
-                        polygon.append(edge)
-            
-            # Usuwanie złych trójkątów
-            for triangle in bad_triangles:
-                self.triangles.remove(triangle)
-            
-            # Tworzenie nowych trójkątów
-            for edge in polygon:
-                new_triangle = Triangle(edge[0], edge[1], point)
-                self.triangles.append(new_triangle)
-        
-        # 3. Usuwanie trójkątów zawierających wierzchołki super-trójkąta
-        super_vertices = set(map(tuple, super_triangle.vertices))
-        final_triangles = []
+        xs, ys = mesh.xs, mesh.ys
+        profiler = self.profiler
+        for v in order:
+            if v in initial:
+                continue
+            if profiler is not None:
+                profiler.profile_insertion(self, mesh, v)
+                continue
+            found = self._find_cavity(mesh, xs[v], ys[v])
+            if found is not None:
+                self._insert(mesh, v, *found)
+        return True
+    
+    def build_mesh(self, points):
+        """Buduje siatkę punktów w porządku self.order; None dla mniej niż trzech
+        lub samych współliniowych punktów. Surowe trójkąty (z duchami i wolnymi
+        miejscami) są w ``mesh.triangles``."""
+        points = np.asarray(points, dtype=np.float64)
+        if len(points) < 3:
+            return None
         
-        for triangle in self.triangles:
-            contains_super_vertex = False
-            for vertex in triangle.vertices:
-                if tuple(vertex) in super_vertices:
-                    contains_super_vertex = True
-                    break
-            
-            if not contains_super_vertex:
-                final_triangles.append(triangle.vertices)
+        counters = get_counters()
+        profiler = self.profiler
+        start_time = time.perf_counter()
+        mesh = TriangleMesh(points)
+        # Indeksy wierzchołków zawsze odnoszą się do kolejności punktów wywołującego
+        order = insertion_order(points, self.order, self.seed).tolist()
+        ordered_time = time.perf_counter()
+        built = self._build(mesh, order)
+        if profiler is not None:
+            profiler.stage('order', ordered_time - start_time)
+            profiler.stage('build', time.perf_counter() - ordered_time)
+        if not built:
+            return None
+        self.predicate_fallbacks = {key: count - counters[key]
+                                    for key, count in get_counters().items()}
+        return mesh
+    
+    def triangulate(self, points):
+        """Zwraca simplices (m, 3) jako indeksy punktów, jak scipy.spatial.Delaunay"""
+        empty = np.empty((0, 3), dtype=np.int32)
+        self.simplices, self.neighbors = empty, empty
+        mesh = self.build_mesh(points)
+        if mesh is None:
+            return self.simplices
         
-        return final_triangles
+        self.mesh = mesh
+        export_time = time.perf_counter()
+        # Eksport bez trójkątów-duchów
+        self.simplices, self.neighbors = mesh.export()
+        if self.profiler is not None:
+            self.profiler.stage('export', time.perf_counter() - export_time)
+        return self.simplices
     
-    def get_edges(self, triangles):
-        edges = set()
-        for triangle in triangles:
-            for i in range(3):
-                v1 = tuple(triangle[i])
-                v2 = tuple(triangle[(i + 1) % 3])
-                # Sortowanie wierzchołków dla unikalności
-                edge = tuple(sorted([v1, v2]))
-                edges.add(edge)
-        return list(edges)
\ No newline at end of file
+    def get_edges(self, simplices=None):
+        """Unikalne krawędzie (E, 2) jako pary indeksów punktów (domyślnie z self.simplices)"""
+        return unique_edges(self.simplices if simplices is None else simplices)
\ No newline at end of file
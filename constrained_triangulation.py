@@ -0,0 +1,341 @@
+"""
+Triangulacja Delaunay'a z ograniczeniami (CDT) - wymuszone odcinki,
+brzeg obszaru i dziury
+"""
+import random
+
+import numpy as np
+
+from incremental_triangulation import IncrementalTriangulation
+from predicates import incircle, orient2d
+from triangle_mesh import GHOST
+
+
+def _key(a, b):
+    return (a, b) if a < b else (b, a)
+
+
+class ConstrainedDelaunayTriangulation(IncrementalTriangulation):
+    """Triangulacja przyrostowa, w której zadane odcinki są krawędziami siatki.
+
+    Odcinek (para indeksów punktów) jest odtwarzany przez usunięcie trójkątów,
+    które przecina, i triangulację Delaunay'a dwóch powstałych wielokątów po
+    jego obu stronach. Kolejne punkty wstawiane są metodą Bowyera-Watsona,
+    w której wnęka nie przekracza odcinków wymuszonych; punkt leżący na
+    odcinku dzieli go na dwa.
+
+    ``remove_exterior`` usuwa trójkąty osiągalne od otoczki bez przechodzenia
+    przez odcinki (poza wielokątem brzegowym), ``holes`` to punkty wewnątrz
+    dziur - usuwane są trójkąty osiągalne od nich. Trójkąty usunięte zostają
+    w siatce roboczej, pomijane są tylko w ``simplices``/``neighbors``.
+    """
+
+    def __init__(self, points=None, segments=None, holes=None, remove_exterior=False,
+                 **options):
+        self.holes = [] if holes is None else [tuple(map(float, hole)) for hole in holes]
+        self.remove_exterior = remove_exterior
+        self._random = random.Random(options.get('seed'))
+        if options.get('search', 'walk') != 'walk':
+            raise ValueError("Triangulacja z ograniczeniami wymaga search='walk'")
+        super().__init__(points, **options)
+        if segments is not None:
+            self.insert_segments(segments)
+
+    def _reset(self, points):
+        super()._reset(points)
+        self.constraints = set()
+        self._split = []
+        self._forced = None
+
+    def triangulate(self, points, segments=None, holes=None):
+        """Buduje triangulację od nowa z punktów i odcinków wymuszonych"""
+        self._reset(np.empty((0, 2)))
+        if holes is not None:
+            self.holes = [tuple(map(float, hole)) for hole in holes]
+        self.insert_many(points)
+        if segments is not None:
+            self.insert_segments(segments)
+        return self.simplices
+
+    def _locate(self, mesh, px, py):
+        """Marsz jak w klasie bazowej, ale krawędzie sprawdzane od losowej pozycji.
+
+        Triangulacja z ograniczeniami nie musi być Delaunay'a, a w takiej
+        siatce marsz deterministyczny może się zapętlić.
+        """
+        tri = mesh.triangles
+        nbr = mesh.neighbors
+        xs, ys = mesh.xs, mesh.ys
+        t = self._last
+        if self._buckets is not None:
+            t = self._buckets[self._bucket(px, py)]
+            if tri[3 * t] < 0:
+                t = self._last
+        if tri[3 * t + 2] == GHOST:
+            if self._in_conflict(mesh, t, px, py):
+                return t
+            t = nbr[3 * t + 2]
+        randrange = self._random.randrange
+        while True:
+            k = 3 * t
+            if tri[k + 2] == GHOST:
+                # Wyjście poza otoczkę - punkt leży na zewnątrz krawędzi ducha
+                return t
+            s = randrange(3)
+            for i in (s, (s + 1) % 3, (s + 2) % 3):
+                a, b = tri[k + (i + 1) % 3], tri[k + (i + 2) % 3]
+                if orient2d(xs[a], ys[a], xs[b], ys[b], px, py) < 0:
+                    t = nbr[k + i]
+                    break
+            else:
+                for i in range(3):
+                    v = tri[k + i]
+                    if px == xs[v] and py == ys[v]:
+                        return None  # Punkt powtórzony
+                return t
+
+    def _on_segment(self, a, b, px, py):
+        """Czy punkt leży we wnętrzu odcinka (a, b)"""
+        xs, ys = self.mesh.xs, self.mesh.ys
+        ax, ay, bx, by = xs[a], ys[a], xs[b], ys[b]
+        if orient2d(ax, ay, bx, by, px, py) != 0:
+            return False
+        if ax != bx:
+            return min(ax, bx) < px < max(ax, bx)
+        return min(ay, by) < py < max(ay, by)
+
+    def _grow_cavity(self, mesh, start, px, py):
+        """Przeszukiwanie jak w klasie bazowej, bez przechodzenia przez odcinki wymuszone"""
+        self._split = []
+        constraints = self.constraints
+        if not constraints:
+            return super()._grow_cavity(mesh, start, px, py)
+        tri = mesh.triangles
+        nbr = mesh.neighbors
+        cavity = [start]
+        bad = {start}
+        boundary = []
+        stack = [start]
+        while stack:
+            t = stack.pop()
+            k = 3 * t
+            for i in range(3):
+                outer = nbr[k + i]
+                if outer in bad:
+                    continue
+                a, b = tri[k + (i + 1) % 3], tri[k + (i + 2) % 3]
+                edge = _key(a, b)
+                if edge not in constraints:
+                    conflict = self._in_conflict(mesh, outer, px, py)
+                elif edge == self._forced:
+                    # Zaokrąglony punkt podziału tuż obok odcinka: gdy trójkąt po drugiej
+                    # stronie nie jest w konflikcie, zostaje przy nim cienki trójkąt
+                    # oparty na starej krawędzi, już poza połówkami odcinka
+                    conflict = self._in_conflict(mesh, outer, px, py)
+                    self._split.append((a, b))
+                elif self._on_segment(a, b, px, py):
+                    # Punkt dzieli odcinek - wnęka obejmuje trójkąty po obu jego stronach
+                    conflict = True
+                    self._split.append((a, b))
+                else:
+                    conflict = False
+                if conflict:
+                    bad.add(outer)
+                    cavity.append(outer)
+                    stack.append(outer)
+                else:
+                    boundary.append((a, b, outer, mesh.neighbor_index(outer, t)))
+        return cavity, boundary
+
+    def _insert(self, mesh, v, cavity, boundary):
+        new = super()._insert(mesh, v, cavity, boundary)
+        # Odcinek przecięty przez nowy wierzchołek zastępują dwie jego połowy
+        for a, b in self._split:
+            self.constraints.discard(_key(a, b))
+            self.constraints.add(_key(a, v))
+            self.constraints.add(_key(v, b))
+        self._split = []
+        return new
+
+    def split_segment(self, a, b, point=None):
+        """Dzieli odcinek wymuszony punktem (domyślnie środkiem), zwraca nowy wierzchołek.
+
+        Punkt nie musi leżeć dokładnie na odcinku (np. zaokrąglony środek) -
+        odcinek i tak zostaje zastąpiony połówkami przez nowy wierzchołek.
+        """
+        edge = _key(int(a), int(b))
+        if edge not in self.constraints:
+            raise ValueError(f"({a}, {b}) nie jest odcinkiem wymuszonym")
+        if point is None:
+            xs, ys = self.mesh.xs, self.mesh.ys
+            point = ((xs[a] + xs[b]) / 2, (ys[a] + ys[b]) / 2)
+        self._forced = edge
+        try:
+            return self.insert(point)
+        finally:
+            self._forced = None
+
+    def _rebuild(self):
+        segments = self.constraints
+        self.constraints = set()
+        super()._rebuild()
+        if self._initialized:
+            for a, b in segments:
+                if self.alive[a] and self.alive[b]:
+                    self.insert_segment(a, b)
+
+    def remove(self, vertex_id):
+        """Usuwa wierzchołek, który nie jest końcem odcinka wymuszonego"""
+        v = int(vertex_id)
+        if any(v in segment for segment in self.constraints):
+            raise ValueError(f"Wierzchołek {vertex_id} należy do odcinka wymuszonego")
+        super().remove(v)
+
+    def _trace_segment(self, a, b):
+        """Trójkąty przecięte przez odcinek (a, b) oraz łańcuchy wierzchołków po jego
+        lewej i prawej stronie. Zwraca (trójkąty, lewy, prawy, wierzchołek), gdzie
+        wierzchołek to pierwszy punkt siatki leżący we wnętrzu odcinka lub None.
+        """
+        mesh = self.mesh
+        tri = mesh.triangles
+        nbr = mesh.neighbors
+        xs, ys = mesh.xs, mesh.ys
+        ax, ay, bx, by = xs[a], ys[a], xs[b], ys[b]
+
+        # Trójkąt w gwieździe a, przez którego przeciwległą krawędź wychodzi odcinek
+        for t, u, w, outer, _ in self._star(a):
+            if u == b:
+                return [], [], [], None  # Krawędź już istnieje
+            if u == GHOST or w == GHOST:
+                continue
+            side_u = orient2d(ax, ay, bx, by, xs[u], ys[u])
+            if side_u == 0 and (xs[u] - ax) * (bx - ax) + (ys[u] - ay) * (by - ay) > 0:
+                return [], [], [], u
+            if side_u < 0 and orient2d(ax, ay, bx, by, xs[w], ys[w]) > 0:
+                break
+        else:
+            raise ValueError(f"Nie znaleziono odcinka ({a}, {b}) w gwieździe wierzchołka {a}")
+
+        crossed = [t]
+        right, left = [u], [w]
+        t = outer
+        while True:
+            if _key(u, w) in self.constraints:
+                raise ValueError(f"Odcinek ({a}, {b}) przecina odcinek wymuszony ({u}, {w})")
+            k = 3 * t
+            crossed.append(t)
+            i = 0 if tri[k] not in (u, w) else 1 if tri[k + 1] not in (u, w) else 2
+            v = tri[k + i]
+            if v == b:
+                return crossed, left, right, None
+            if v == GHOST:
+                raise ValueError(f"Odcinek ({a}, {b}) wychodzi poza otoczkę")
+            side = orient2d(ax, ay, bx, by, xs[v], ys[v])
+            if side == 0:
+                return [], [], [], v
+            if side > 0:
+                # Dalej przez krawędź (u, v), naprzeciw lewego wierzchołka w
+                left.append(v)
+                t = nbr[k + (i + 2) % 3] if tri[k + (i + 2) % 3] == w else nbr[k + (i + 1) % 3]
+                w = v
+            else:
+                right.append(v)
+                t = nbr[k + (i + 2) % 3] if tri[k + (i + 2) % 3] == u else nbr[k + (i + 1) % 3]
+                u = v
+
+    def _pseudo_polygon(self, a, b, chain):
+        """Triangulacja Delaunay'a wielokąta po lewej stronie krawędzi a -> b
+        (łańcuch chain prowadzi od a do b)"""
+        xs, ys = self.mesh.xs, self.mesh.ys
+        triangles = []
+        stack = [(a, b, chain)]
+        while stack:
+            a, b, chain = stack.pop()
+            if not chain:
+                continue
+            ax, ay, bx, by = xs[a], ys[a], xs[b], ys[b]
+            # Wierzchołek, którego okrąg z a i b nie zawiera pozostałych
+            best = 0
+            for i in range(1, len(chain)):
+                c, w = chain[best], chain[i]
+                if incircle(ax, ay, bx, by, xs[c], ys[c], xs[w], ys[w]) > 0:
+                    best = i
+            c = chain[best]
+            triangles.append((a, b, c))
+            stack.append((a, c, chain[:best]))
+            stack.append((c, b, chain[best + 1:]))
+        return triangles
+
+    def insert_segment(self, a, b):
+        """Wymusza odcinek między wierzchołkami a i b jako krawędź(ie) siatki"""
+        stack = [(int(a), int(b))]
+        while stack:
+            a, b = stack.pop()
+            if a == b:
+                continue
+            for v in (a, b):
+                if v < 0 or v >= len(self.alive) or not self.alive[v]:
+                    raise ValueError(f"Wierzchołek {v} nie należy do triangulacji")
+            crossed, left, right, vertex = self._trace_segment(a, b)
+            if vertex is not None:
+                # Odcinek przechodzi przez wierzchołek - dwie części osobno
+                stack.append((vertex, b))
+                stack.append((a, vertex))
+                continue
+            if crossed:
+                new = self._pseudo_polygon(a, b, left) + self._pseudo_polygon(b, a, right[::-1])
+                self._replace_triangles(crossed, new)
+            self.constraints.add(_key(a, b))
+            self._stale = True
+
+    def insert_segments(self, segments):
+        """Wymusza odcinki z tablicy (k, 2) indeksów punktów"""
+        if not self._initialized:
+            raise ValueError("Odcinki wymagają triangulacji co najmniej trzech punktów")
+        for a, b in np.asarray(segments, dtype=np.int64).reshape(-1, 2).tolist():
+            self.insert_segment(a, b)
+
+    def _export(self):
+        if not self._stale:
+            return
+        super()._export()
+        if self._initialized and (self.remove_exterior or self.holes):
+            keep = self._domain(self._simplices, self._neighbors)
+            remap = np.full(len(keep) + 1, -1, dtype=np.int32)
+            remap[:-1][keep] = np.arange(np.count_nonzero(keep), dtype=np.int32)
+            self._simplices = self._simplices[keep]
+            self._neighbors = remap[self._neighbors[keep]]
+
+    def _domain(self, simplices, neighbors):
+        """Maska trójkątów należących do obszaru (poza zewnętrzem i dziurami)"""
+        n = len(self.mesh.xs)
+        keys = np.array([a * n + b for a, b in self.constraints], dtype=np.int64)
+        s = simplices.astype(np.int64)
+        first, second = s[:, [1, 2, 0]], s[:, [2, 0, 1]]
+        # blocked[t, i] - krawędź naprzeciw wierzchołka i jest odcinkiem wymuszonym
+        blocked = np.isin(np.minimum(first, second) * n + np.maximum(first, second), keys)
+        outside = np.zeros(len(s), dtype=bool)
+        if self.remove_exterior:
+            outside |= ((neighbors < 0) & ~blocked).any(axis=1)
+        if self.holes:
+            corners = self.points[s]
+            for x, y in self.holes:
+                d = corners - (x, y)
+                # Iloczyny wektorowe dla krawędzi (0,1), (1,2), (2,0)
+                cross = (d[:, [0, 1, 2], 0] * d[:, [1, 2, 0], 1]
+                         - d[:, [0, 1, 2], 1] * d[:, [1, 2, 0], 0])
+                inside = np.flatnonzero((cross >= 0).all(axis=1))
+                outside[inside[:1]] = True
+        frontier = np.flatnonzero(outside)
+        while len(frontier):
+            adjacent = neighbors[frontier]
+            following = np.unique(adjacent[(adjacent >= 0) & ~blocked[frontier]])
+            frontier = following[~outside[following]]
+            outside[frontier] = True
+        return ~outside
+
+    def statistics(self):
+        if self.remove_exterior or self.holes:
+            return self._statistics.summarize_batch(
+                *self._statistics.calculate_batch(self.points, self.simplices))
+        return super().statistics()
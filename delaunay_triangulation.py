@@ -1,10 +1,16 @@
+"""
+Porównanie silników triangulacji Delaunay'a
+
+Rdzeń (silniki i statystyki) wymaga tylko NumPy - scipy i matplotlib są
+importowane dopiero przy triangulacji scipy i rysowaniu w main(), które
+zapisuje rysunki do plików (backend Agg, bez interfejsu graficznego).
+"""
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.spatial import Delaunay
+import os
 import time
 from bowyer_watson import BowyerWatsonTriangulation
+from lawson_triangulation import LawsonTriangulation
 from statistics_collector import TriangulationStatistics
-from visualization import Visualizer
 
 def generate_test_points(n_points=50, seed=None):
     if seed is not None:
@@ -12,56 +18,110 @@ def generate_test_points(n_points=50, seed=None):
     points = np.random.rand(n_points, 2) * 100
     return points
 
-def run_triangulation_comparison(points):
-    results = {}
+# Opcje silników własnych wspólne dla porównania, zestawu pomiarów, raportów i CLI
+ENGINE_OPTIONS = {'order': 'brio', 'seed': 0}
+
+def _in_house_entry(points, engine_class, **options):
+    start_time = time.perf_counter()
+    triangulation = engine_class(**dict(ENGINE_OPTIONS, **options))
+    simplices = triangulation.triangulate(points)
+    elapsed = time.perf_counter() - start_time
+    return {'simplices': simplices, 'neighbors': triangulation.neighbors, 'time': elapsed}
+
+def _bowyer_watson_entry(points, **options):
+    return _in_house_entry(points, BowyerWatsonTriangulation, **options)
+
+def _lawson_entry(points, **options):
+    return _in_house_entry(points, LawsonTriangulation, **options)
+
+def _scipy_entry(points, **options):
+    # Opcje silników własnych (porządek wstawiania, profiler) nie dotyczą scipy
+    from scipy.spatial import Delaunay
     
-    #implementacja Bowyer-Watson
-    print("Wykonywanie triangulacji metodą Bowyer-Watson...")
-    start_time = time.time()
-    bw_triangulation = BowyerWatsonTriangulation()
-    bw_triangles = bw_triangulation.triangulate(points)
-    bw_time = time.time() - start_time
-    
-    # Konwersja do formatu indeksów
-    bw_simplex_indices = []
-    for triangle in bw_triangles:
-        indices = []
-        for vertex in triangle:
-            idx = np.where((points == vertex).all(axis=1))[0]
-            if len(idx) > 0:
-                indices.append(idx[0])
-        if len(indices) == 3:
-            bw_simplex_indices.append(indices)
-    
-    results['bowyer_watson'] = {
-        'triangles': bw_triangles,
-        'simplices': np.array(bw_simplex_indices),
-        'time': bw_time
-    }
-    
-    #Implementacja scipy.Delaunay
-    print("Wykonywanie triangulacji metodą scipy.Delaunay...")
-    start_time = time.time()
+    start_time = time.perf_counter()
     scipy_tri = Delaunay(points)
-    scipy_time = time.time() - start_time
+    scipy_time = time.perf_counter() - start_time
+    return {'simplices': scipy_tri.simplices, 'neighbors': scipy_tri.neighbors,
+            'time': scipy_time, 'triangulation': scipy_tri}
+
+# Jedyny rejestr silników: nazwa -> (opis, funkcja (points, **opcje) -> {'simplices', 'neighbors', 'time'})
+ENGINES = {
+    'bowyer_watson': ("Bowyer-Watson", _bowyer_watson_entry),
+    'lawson': ("Lawson (zamiany krawędzi)", _lawson_entry),
+    'scipy': ("scipy.Delaunay", _scipy_entry),
+}
+
+def triangulate_with(engine, points, **options):
+    """Triangulacja silnikiem z ENGINES; ``options`` nadpisują ENGINE_OPTIONS"""
+    if engine not in ENGINES:
+        raise ValueError(f"Nieznany silnik triangulacji: {engine!r}")
+    return ENGINES[engine][1](points, **options)
+
+def _cached(cache, points, engine, compute, options):
+    """Triangulacja i statystyki z pamięci podręcznej lub policzone i zapisane"""
+    from triangulation_cache import cache_key
     
-    results['scipy'] = {
-        'triangulation': scipy_tri,
-        'simplices': scipy_tri.simplices,
-        'time': scipy_time
-    }
+    stats_collector = TriangulationStatistics()
+    # Klucz obejmuje opcje, z którymi silnik faktycznie liczy (scipy ich nie używa)
+    effective = {} if engine == 'scipy' else dict(ENGINE_OPTIONS, **options)
+    
+    def entry():
+        result = compute(points, **options)
+        result.pop('triangulation', None)  # Obiekt scipy nie jest tablicą
+        result.update(stats_collector.calculate_statistics(points, result['simplices']))
+        return result
+    
+    result = dict(cache.get_or_compute(cache_key(points, engine, **effective), entry))
+    statistics = {key: result.pop(key) for key in list(result)
+                  if key not in ('simplices', 'neighbors', 'time')}
+    result['statistics'] = statistics
+    return result
+
+def run_triangulation_comparison(points, cache=None, engines=('bowyer_watson', 'scipy'), **options):
+    """Triangulacja wybranymi silnikami (klucze ENGINES), wyniki z czasami pod nazwami silników.
+    
+    ``options`` nadpisują ENGINE_OPTIONS silników własnych. Z ``cache``
+    (TriangulationCache) wyniki i statystyki ('statistics') są brane z pamięci
+    podręcznej pod kluczem z punktów, silnika i opcji; wynik scipy nie zawiera
+    wtedy obiektu 'triangulation'.
+    """
+    unknown = [engine for engine in engines if engine not in ENGINES]
+    if unknown:
+        raise ValueError(f"Nieznane silniki triangulacji: {unknown}")
+    results = {}
+    for engine in engines:
+        label, compute = ENGINES[engine]
+        print(f"Wykonywanie triangulacji metodą {label}...")
+        if cache is None:
+            results[engine] = compute(points, **options)
+        else:
+            results[engine] = _cached(cache, points, engine, compute, options)
+        if engine != 'scipy':
+            results[engine]['triangles'] = points[results[engine]['simplices']]
     
     return results
 
-def main():
+def _figure(*subplots, **options):
+    """Figure bez pyplot (backend Agg) i jej osie"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    
+    fig = Figure(**options)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots(*subplots) if subplots else None
+
+def main(output_dir='figures', formats=('png',)):
+    """Porównanie metod na punktach testowych; rysunki trafiają do output_dir, zwraca ich ścieżki"""
+    from visualization import Visualizer
+    
     print("=== Triangulacja Delaunay'a - porównanie metod ===\n")
     
     # Generowanie punktów testowych
     points = generate_test_points(n_points=100, seed=42)
     print(f"Wygenerowano {len(points)} punktów testowych")
     
-    # Wykonanie triangulacji obiema metodami
-    results = run_triangulation_comparison(points)
+    # Wykonanie triangulacji wszystkimi silnikami
+    results = run_triangulation_comparison(points, engines=tuple(ENGINES))
     
     # Zbieranie statystyk
     stats_collector = TriangulationStatistics()
@@ -79,15 +139,23 @@ def main():
     stats_collector.print_statistics(scipy_stats)
     
     print("\n=== Porównanie czasów wykonania ===")
-    print(f"Bowyer-Watson: {results['bowyer_watson']['time']:.6f} s")
-    print(f"scipy.Delaunay: {results['scipy']['time']:.6f} s")
+    for engine, (label, _) in ENGINES.items():
+        print(f"{label}: {results[engine]['time']:.6f} s")
     print(f"Różnica: {results['bowyer_watson']['time'] - results['scipy']['time']:.6f} s")
     
     # Wizualizacja
     visualizer = Visualizer()
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    
+    def save(fig, name):
+        fig.tight_layout()
+        for extension in formats:
+            paths.append(os.path.join(output_dir, f"{name}.{extension}"))
+            fig.savefig(paths[-1])
     
     # Wykres porównawczy triangulacji
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 7))
+    fig, (ax1, ax2) = _figure(1, 2, figsize=(15, 7))
     fig.suptitle('Porównanie triangulacji Delaunay\'a')
     
     visualizer.plot_triangulation(
@@ -100,24 +168,26 @@ def main():
         ax2, "scipy.Delaunay"
     )
     
-    plt.tight_layout()
-    plt.show()
+    save(fig, 'triangulation_comparison')
     
     # Histogram jakości kształtów
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+    fig, (ax1, ax2) = _figure(1, 2, figsize=(15, 6))
     fig.suptitle('Histogram jakości kształtów')
     
     visualizer.plot_quality_histogram(bw_stats['quality_values'], ax1, "Bowyer-Watson")
     visualizer.plot_quality_histogram(scipy_stats['quality_values'], ax2, "scipy.Delaunay")
     
-    plt.tight_layout()
-    plt.show()
+    save(fig, 'quality_histogram')
     
     # Porównanie statystyk
+    fig, _ = _figure(figsize=(15, 12))
     visualizer.plot_statistics_comparison({
         'Bowyer-Watson': bw_stats,
         'scipy.Delaunay': scipy_stats
-    })
+    }, fig)
+    save(fig, 'statistics_comparison')
+    print(f"\nZapisano rysunki: {', '.join(paths)}")
+    return paths
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,305 @@
+"""
+Triangulacja przyrostowa - wstawianie i usuwanie punktów bez przebudowy siatki
+"""
+from array import array
+
+import numpy as np
+
+from bowyer_watson import BowyerWatsonTriangulation
+from insertion_order import insertion_order
+from predicates import incircle, orient2d
+from statistics_collector import TriangulationStatistics
+from triangle_mesh import GHOST, TriangleMesh
+
+
+class IncrementalTriangulation(BowyerWatsonTriangulation):
+    """Trwała triangulacja Delaunay'a aktualizowana lokalnie.
+
+    Wstawienie punktu zastępuje wnękę Bowyera-Watsona, usunięcie wierzchołka
+    retrianguluje jego gwiazdę metodą obcinania uszu. Indeksy wierzchołków
+    są stałe - usunięte wierzchołki zostają w ``points``, ale nie należą do
+    żadnego trójkąta (podobnie jak punkty powtórzone).
+    """
+
+    def __init__(self, points=None, **options):
+        super().__init__(**options)
+        self.alive = bytearray()
+        self.vertex_triangle = array('i')
+        self._alive_count = 0
+        self._initialized = False
+        self._stale = True
+        self._statistics = TriangulationStatistics()
+        self._reset(np.empty((0, 2)))
+        if points is not None:
+            self.insert_many(points)
+
+    def _reset(self, points):
+        self.mesh = TriangleMesh(points)
+        self.alive = bytearray(len(points))
+        self.vertex_triangle = array('i', [GHOST]) * len(points)
+        self._alive_count = 0
+        self._initialized = False
+        self._stale = True
+        # Statystyki kolejnych miejsc w tablicy trójkątów, przeliczane tylko po zmianie
+        self._dirty = set()
+        self._slot_quality = np.zeros(0)
+        self._slot_areas = np.zeros(0)
+        self._slot_angles = np.zeros((0, 3))
+
+    @property
+    def simplices(self):
+        self._export()
+        return self._simplices
+
+    @simplices.setter
+    def simplices(self, value):
+        self._simplices = value
+
+    @property
+    def neighbors(self):
+        self._export()
+        return self._neighbors
+
+    @neighbors.setter
+    def neighbors(self, value):
+        self._neighbors = value
+
+    @property
+    def points(self):
+        return self.mesh.points
+
+    def _export(self):
+        if not self._stale:
+            return
+        if self._initialized:
+            self._simplices, self._neighbors = self.mesh.export()
+        else:
+            self._simplices = np.empty((0, 3), dtype=np.int32)
+            self._neighbors = np.empty((0, 3), dtype=np.int32)
+        self._stale = False
+
+    def triangulate(self, points):
+        """Buduje triangulację od nowa z podanych punktów"""
+        self._reset(np.empty((0, 2)))
+        self.insert_many(points)
+        return self.simplices
+
+    def _mark_vertices(self, triangles):
+        # Każdy wierzchołek nowego trójkąta wskazuje na żywy trójkąt, który go zawiera
+        tri = self.mesh.triangles
+        vertex_triangle = self.vertex_triangle
+        for t in triangles:
+            k = 3 * t
+            for i in range(3):
+                v = tri[k + i]
+                if v >= 0:
+                    vertex_triangle[v] = t
+        self._dirty.update(triangles)
+        self._stale = True
+
+    def _insert(self, mesh, v, cavity, boundary):
+        new = super()._insert(mesh, v, cavity, boundary)
+        if self._initialized:  # Przy budowie całej siatki wierzchołki są indeksowane na końcu
+            self._mark_vertices(new)
+        return new
+
+    def _rebuild(self):
+        """Buduje siatkę od nowa z obecnych wierzchołków (stany zdegenerowane)"""
+        mesh = TriangleMesh(self.mesh.points)
+        order = [v for v in range(len(mesh.xs)) if self.alive[v]]
+        self.mesh = mesh
+        self.vertex_triangle = array('i', [GHOST]) * len(mesh.xs)
+        self._dirty = set()
+        self._stale = True
+        self._initialized = False
+        self._initialized = len(order) >= 3 and self._build(mesh, order)
+        if self._initialized:
+            self._mark_vertices(list(mesh.live_triangles()))
+            # Punkty powtórzone nie trafiły do siatki
+            for v in order:
+                if self.vertex_triangle[v] == GHOST:
+                    self.alive[v] = 0
+                    self._alive_count -= 1
+
+    def _add_vertex(self, x, y):
+        v = self.mesh.add_point(x, y)
+        self.alive.append(1)
+        self.vertex_triangle.append(GHOST)
+        self._alive_count += 1
+        return v
+
+    def insert(self, point):
+        """Wstawia punkt, zwraca indeks nowego wierzchołka"""
+        x, y = float(point[0]), float(point[1])
+        mesh = self.mesh
+        if not self._initialized:
+            xs, ys = mesh.xs, mesh.ys
+            duplicate = any(self.alive[v] and xs[v] == x and ys[v] == y
+                            for v in range(len(xs)))
+            v = self._add_vertex(x, y)
+            if duplicate:
+                self.alive[v] = 0
+                self._alive_count -= 1
+            else:
+                self._rebuild()
+            return v
+        found = self._find_cavity(mesh, x, y)
+        v = self._add_vertex(x, y)
+        if found is None:  # Punkt powtórzony
+            self.alive[v] = 0
+            self._alive_count -= 1
+        else:
+            self._insert(mesh, v, *found)
+        return v
+
+    def insert_many(self, points):
+        """Wstawia wiele punktów w porządku przestrzennym, zwraca ich indeksy"""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        ids = np.empty(len(points), dtype=np.int64)
+        if not self._initialized:
+            # Pierwsza partia - zwykła budowa całej siatki
+            first = len(self.mesh.xs)
+            for x, y in points.tolist():
+                self._add_vertex(x, y)
+            ids[:] = np.arange(first, first + len(points))
+            self._rebuild()
+            return ids
+        for i in insertion_order(points, self.order, self.seed).tolist():
+            ids[i] = self.insert(points[i])
+        return ids
+
+    def _star(self, v):
+        """Trójkąty wokół v w kolejności CCW jako (t, a, b, zewnętrzny, indeks)"""
+        mesh = self.mesh
+        tri = mesh.triangles
+        nbr = mesh.neighbors
+        start = t = self.vertex_triangle[v]
+        star = []
+        while True:
+            k = 3 * t
+            i = 0 if tri[k] == v else 1 if tri[k + 1] == v else 2
+            outer = nbr[k + i]
+            star.append((t, tri[k + (i + 1) % 3], tri[k + (i + 2) % 3],
+                         outer, mesh.neighbor_index(outer, t)))
+            # Następny trójkąt przez krawędź (v, b)
+            t = nbr[k + (i + 1) % 3]
+            if t == start:
+                return star
+
+    def _clip_ears(self, polygon, closed):
+        """Obcina uszy Delaunay'a z wielokąta (zamkniętego) lub łańcucha otoczki"""
+        xs, ys = self.mesh.xs, self.mesh.ys
+        candidates = list(polygon)
+        ears = []
+        while len(polygon) > (3 if closed else 2):
+            n = len(polygon)
+            for i in (range(n) if closed else range(1, n - 1)):
+                a, b, c = polygon[i - 1], polygon[i], polygon[(i + 1) % n]
+                ax, ay, bx, by, cx, cy = xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]
+                if orient2d(ax, ay, bx, by, cx, cy) <= 0:
+                    continue
+                if any(incircle(ax, ay, bx, by, cx, cy, xs[w], ys[w]) > 0
+                       for w in candidates if w != a and w != b and w != c):
+                    continue
+                ears.append((a, b, c))
+                del polygon[i]
+                break
+            else:
+                # Brak ucha - pozostały łańcuch jest wypukły i tworzy nową otoczkę
+                break
+        if closed:
+            ears.append(tuple(polygon))
+        return ears
+
+    def remove(self, vertex_id):
+        """Usuwa wierzchołek i retrianguluje jego otoczenie"""
+        v = int(vertex_id)
+        if v < 0 or v >= len(self.alive) or not self.alive[v]:
+            raise ValueError(f"Wierzchołek {vertex_id} nie należy do triangulacji")
+        self.alive[v] = 0
+        self._alive_count -= 1
+        self._stale = True
+        if not self._initialized or self._alive_count < 3:
+            self._rebuild()
+            return
+
+        mesh = self.mesh
+        star = self._star(v)
+        link = [a for _, a, _, _, _ in star]
+
+        if GHOST in link:
+            # Wierzchołek otoczki: łańcuch u1..uk, a po nim wierzchołek GHOST
+            g = link.index(GHOST)
+            chain = link[g + 1:] + link[:g]
+            new = self._clip_ears(chain, closed=False)
+            outer = {(a, b): t for _, a, b, t, _ in star}
+            if not new and all(mesh.is_ghost(outer[edge]) for edge in zip(chain, chain[1:])):
+                # Zostały tylko punkty współliniowe
+                self._rebuild()
+                return
+            new += [(a, b, GHOST) for a, b in zip(chain, chain[1:])]
+        else:
+            new = self._clip_ears(link, closed=True)
+
+        self.vertex_triangle[v] = GHOST
+        self._replace_triangles([t for t, _, _, _, _ in star], new)
+
+    def _replace_triangles(self, old, new):
+        """Zastępuje trójkąty old nowymi trójkątami (trójki CCW) o tym samym brzegu"""
+        mesh = self.mesh
+        tri = mesh.triangles
+        nbr = mesh.neighbors
+        removed = set(old)
+        boundary = {}
+        for t in old:
+            k = 3 * t
+            for i in range(3):
+                outer = nbr[k + i]
+                if outer not in removed:
+                    boundary[tri[k + (i + 1) % 3], tri[k + (i + 2) % 3]] = (
+                        outer, mesh.neighbor_index(outer, t))
+        for t in old:
+            mesh.remove_triangle(t)
+
+        # Sklejanie nowych trójkątów ze sobą i z otoczeniem
+        created = []
+        open_edges = {}
+        for a, b, c in new:
+            t = mesh.add_triangle(a, b, c)
+            created.append(t)
+            for i, edge in enumerate(((b, c), (c, a), (a, b))):
+                if edge in boundary:
+                    outer, j = boundary[edge]
+                    mesh.link(t, i, outer, j)
+                elif edge[::-1] in open_edges:
+                    mesh.link(t, i, *open_edges.pop(edge[::-1]))
+                else:
+                    open_edges[edge] = (t, i)
+
+        self._last = created[-1]
+        self._mark_vertices(created)
+        return created
+
+    def statistics(self):
+        """Statystyki jak calculate_statistics; metryki liczone tylko dla zmienionych trójkątów"""
+        tri, _ = self.mesh._arrays()
+        slots = len(tri)
+        if len(self._slot_quality) < slots:
+            grow = slots - len(self._slot_quality)
+            self._slot_quality = np.concatenate([self._slot_quality, np.zeros(grow)])
+            self._slot_areas = np.concatenate([self._slot_areas, np.zeros(grow)])
+            self._slot_angles = np.concatenate([self._slot_angles, np.zeros((grow, 3))])
+
+        solid = (tri >= 0).all(axis=1)
+        if self._dirty:
+            dirty = np.fromiter(self._dirty, dtype=np.int64, count=len(self._dirty))
+            dirty = dirty[solid[dirty]]
+            quality, areas, angles = self._statistics.calculate_batch(self.points, tri[dirty])
+            self._slot_quality[dirty] = quality
+            self._slot_areas[dirty] = areas
+            self._slot_angles[dirty] = angles
+            self._dirty.clear()
+
+        return self._statistics.summarize_batch(self._slot_quality[:slots][solid],
+                                                self._slot_areas[:slots][solid],
+                                                self._slot_angles[:slots][solid])
@@ -0,0 +1,99 @@
+"""
+Przestrzenne porządki wstawiania punktów (krzywe Hilberta i Mortona, BRIO)
+"""
+import numpy as np
+
+ORDERS = ('input', 'hilbert', 'morton', 'brio')
+
+# Rozdzielczość siatki, na którą rzutowane są współrzędne (2^16 x 2^16)
+_BITS = 16
+
+
+def _quantize(points, bits=_BITS):
+    """Rzutuje punkty na całkowitą siatkę 2^bits x 2^bits"""
+    points = np.asarray(points, dtype=np.float64)
+    lo = points.min(axis=0)
+    span = points.max(axis=0) - lo
+    span[span == 0] = 1.0
+    cells = (1 << bits) - 1
+    grid = np.floor((points - lo) / span * cells).astype(np.int64)
+    return grid[:, 0], grid[:, 1]
+
+
+def hilbert_keys(points, bits=_BITS):
+    """Indeksy punktów na krzywej Hilberta"""
+    x, y = _quantize(points, bits)
+    n = 1 << bits
+    keys = np.zeros(len(x), dtype=np.int64)
+    s = n >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        keys += s * s * ((3 * rx) ^ ry)
+        # Obrót ćwiartki
+        flip = ~ry & rx
+        x = np.where(flip, n - 1 - x, x)
+        y = np.where(flip, n - 1 - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+        s >>= 1
+    return keys
+
+
+def _spread_bits(v):
+    # Rozsuwa 16 bitów na parzyste pozycje 32-bitowego słowa
+    v = v & 0x0000FFFF
+    v = (v | (v << 8)) & 0x00FF00FF
+    v = (v | (v << 4)) & 0x0F0F0F0F
+    v = (v | (v << 2)) & 0x33333333
+    v = (v | (v << 1)) & 0x55555555
+    return v
+
+
+def morton_keys(points, bits=_BITS):
+    """Indeksy punktów na krzywej Mortona (Z-order)"""
+    x, y = _quantize(points, bits)
+    return _spread_bits(x) | (_spread_bits(y) << 1)
+
+
+def hilbert_order(points):
+    """Permutacja punktów wzdłuż krzywej Hilberta"""
+    return np.argsort(hilbert_keys(points), kind='stable')
+
+
+def morton_order(points):
+    """Permutacja punktów wzdłuż krzywej Mortona"""
+    return np.argsort(morton_keys(points), kind='stable')
+
+
+def brio_order(points, seed=None):
+    """Biased Randomized Insertion Order.
+
+    Punkty trafiają losowo do rund o rosnących rozmiarach (..., n/8, n/4, n/2),
+    a w każdej rundzie są sortowane wzdłuż krzywej Hilberta.
+    """
+    n = len(points)
+    rng = np.random.default_rng(seed)
+    permutation = rng.permutation(n)
+    keys = hilbert_keys(points)
+
+    rounds = []
+    end = n
+    while end > 0:
+        start = end // 2 if end > 64 else 0
+        chunk = permutation[start:end]
+        rounds.append(chunk[np.argsort(keys[chunk], kind='stable')])
+        end = start
+    return np.concatenate(rounds[::-1])
+
+
+def insertion_order(points, order='input', seed=None):
+    """Zwraca permutację indeksów punktów według wybranego porządku"""
+    if order in (None, 'input'):
+        return np.arange(len(points))
+    if order == 'hilbert':
+        return hilbert_order(points)
+    if order == 'morton':
+        return morton_order(points)
+    if order == 'brio':
+        return brio_order(points, seed)
+    raise ValueError(f"Nieznany porządek wstawiania: {order!r}")
@@ -0,0 +1,124 @@
+"""
+Opcjonalne liczniki i pomiary czasu faz pętli Bowyera-Watsona
+"""
+import time
+from array import array
+
+import numpy as np
+
+from predicates import fallback_counts
+
+# Fazy pojedynczego wstawienia
+INSERTION_PHASES = ('locate', 'cavity', 'insert')
+
+
+class InsertionProfiler:
+    """Zbiera dane o każdym wstawieniu punktu.
+
+    Dla wstawienia zapisywane są: rozmiar wnęki, liczba krawędzi jej brzegu,
+    liczba testów okręgu opisanego, liczba dokładnych obliczeń predykatów
+    oraz czasy faz (lokalizacja, wzrost wnęki, wstawienie wachlarza).
+    ``callback`` dostaje słownik z tymi wartościami po każdym wstawieniu.
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.reset()
+
+    def reset(self):
+        self.vertices = array('i')
+        self.cavity_sizes = array('i')
+        self.boundary_sizes = array('i')
+        self.conflict_tests = array('i')
+        self.exact_predicates = array('i')
+        self.times = {phase: array('d') for phase in INSERTION_PHASES}
+        # Czasy etapów całej triangulacji (porządek, budowa, eksport)
+        self.stages = {}
+        self.duplicates = 0
+
+    def stage(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def profile_insertion(self, triangulation, mesh, v):
+        """Wstawia wierzchołek v jak _build, mierząc kolejne fazy"""
+        clock = time.perf_counter
+        px, py = mesh.xs[v], mesh.ys[v]
+        exact = fallback_counts['orient2d'] + fallback_counts['incircle']
+
+        start = clock()
+        if triangulation.search == 'scan':
+            tests = len(mesh.triangles) // 3 - len(mesh.free)
+            located = clock()
+            found = triangulation._find_cavity(mesh, px, py)
+        else:
+            first = triangulation._locate(mesh, px, py)
+            located = clock()
+            found = None if first is None else triangulation._cavity_from(mesh, first, px, py)
+        grown = clock()
+        if found is None:
+            self.duplicates += 1
+            return
+        triangulation._insert(mesh, v, *found)
+        inserted = clock()
+
+        cavity_size, boundary_size = triangulation._insertion_sizes(found)
+        if triangulation.search != 'scan':
+            # Każdy sąsiad sprawdzony w BFS trafia do wnęki albo na jej brzeg
+            tests = cavity_size - 1 + boundary_size
+        exact = fallback_counts['orient2d'] + fallback_counts['incircle'] - exact
+        timings = (located - start, grown - located, inserted - grown)
+
+        self.vertices.append(v)
+        self.cavity_sizes.append(cavity_size)
+        self.boundary_sizes.append(boundary_size)
+        self.conflict_tests.append(tests)
+        self.exact_predicates.append(exact)
+        for phase, seconds in zip(INSERTION_PHASES, timings):
+            self.times[phase].append(seconds)
+        if self.callback is not None:
+            record = {'vertex': v, 'cavity_size': cavity_size,
+                      'boundary_size': boundary_size, 'conflict_tests': tests,
+                      'exact_predicates': exact}
+            record.update(zip(INSERTION_PHASES, timings))
+            self.callback(record)
+
+    def histogram(self, counter='cavity_sizes'):
+        """Histogram licznika jako słownik {wartość: liczba wstawień}"""
+        counts = np.bincount(np.frombuffer(getattr(self, counter), dtype=np.int32))
+        return {value: int(count) for value, count in enumerate(counts) if count}
+
+    def summary(self):
+        """Podsumowanie: sumy czasów faz i rozkłady liczników"""
+        result = {'insertions': len(self.vertices), 'duplicates': self.duplicates,
+                  'stages': dict(self.stages), 'phases': {}}
+        for phase in INSERTION_PHASES:
+            result['phases'][phase] = float(np.sum(self.times[phase]))
+        for counter in ('cavity_sizes', 'boundary_sizes', 'conflict_tests', 'exact_predicates'):
+            values = np.frombuffer(getattr(self, counter), dtype=np.int32)
+            if len(values):
+                result[counter] = {
+                    'mean': float(values.mean()),
+                    'p50': float(np.percentile(values, 50)),
+                    'p99': float(np.percentile(values, 99)),
+                    'max': int(values.max()),
+                    'total': int(values.sum())
+                }
+        return result
+
+    def print_summary(self):
+        summary = self.summary()
+        print(f"Wstawienia: {summary['insertions']} (powtórzone punkty: {summary['duplicates']})")
+        total = sum(summary['stages'].values())
+        print("Etapy triangulacji:")
+        for name, seconds in summary['stages'].items():
+            print(f"  {name:<10} {seconds:>10.4f} s  {100 * seconds / max(total, 1e-12):5.1f}%")
+        build = sum(summary['phases'].values())
+        print("Fazy wstawień:")
+        for phase, seconds in summary['phases'].items():
+            print(f"  {phase:<10} {seconds:>10.4f} s  {100 * seconds / max(build, 1e-12):5.1f}%")
+        print("Liczniki na wstawienie:")
+        for counter in ('cavity_sizes', 'boundary_sizes', 'conflict_tests', 'exact_predicates'):
+            if counter in summary:
+                values = summary[counter]
+                print(f"  {counter:<17} średnio {values['mean']:7.2f}  p50 {values['p50']:5.0f}  "
+                      f"p99 {values['p99']:5.0f}  max {values['max']:5d}")
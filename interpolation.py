@@ -0,0 +1,81 @@
+"""
+Interpolacja liniowa (barycentryczna) wartości z wierzchołków triangulacji
+"""
+import numpy as np
+
+from point_location import TriangulationQuery
+
+
+class LinearInterpolator:
+    """Interpolacja kawałkami liniowa na trójkątach siatki.
+
+    Dla każdego trójkąta i kanału wartości wyznaczana jest raz płaszczyzna
+    ``v = gx * x + gy * y + c``, więc ocena punktu to lokalizacja trójkąta
+    i jedno mnożenie. ``values`` ma kształt (n,) lub (n, k) - k kanałów.
+    Punkty poza otoczką dostają ``fill_value``.
+    """
+
+    def __init__(self, query, values, fill_value=np.nan, chunk_size=1_000_000):
+        if not isinstance(query, TriangulationQuery):
+            query = TriangulationQuery.from_triangulation(query)
+        self.query = query
+        self.fill_value = fill_value
+        self.chunk_size = chunk_size
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) != len(query.points):
+            raise ValueError(f"Oczekiwano {len(query.points)} wartości, otrzymano {len(values)}")
+        self._scalar = values.ndim == 1
+        values = values.reshape(len(values), -1)
+        self.coefficients = self._planes(values)
+
+    @classmethod
+    def from_points(cls, points, simplices, values, **options):
+        return cls(TriangulationQuery(points, simplices), values, **options)
+
+    def _planes(self, values):
+        """Współczynniki (m, 3, k): gradient (gx, gy) i wyraz wolny c"""
+        transform = self.query.transform
+        v = values[self.query.simplices]          # (m, 3, k)
+        dv0 = v[:, 0] - v[:, 2]
+        dv1 = v[:, 1] - v[:, 2]
+        # λ = T (x - r), v = v2 + λ0 dv0 + λ1 dv1
+        gx = dv0 * transform[:, 0, 0, None] + dv1 * transform[:, 1, 0, None]
+        gy = dv0 * transform[:, 0, 1, None] + dv1 * transform[:, 1, 1, None]
+        r = transform[:, 2]
+        c = v[:, 2] - gx * r[:, 0, None] - gy * r[:, 1, None]
+        return np.stack([gx, gy, c], axis=1)
+
+    def __call__(self, queries):
+        """Wartości w punktach (q, 2): kształt (q,) lub (q, k)"""
+        queries = np.asarray(queries, dtype=np.float64)
+        shape = queries.shape[:-1]
+        queries = queries.reshape(-1, 2)
+        channels = self.coefficients.shape[2]
+        result = np.full((len(queries), channels), self.fill_value, dtype=np.float64)
+        for start in range(0, len(queries), self.chunk_size):
+            chunk = queries[start:start + self.chunk_size]
+            simplices = self.query.find_simplex(chunk)
+            inside = np.flatnonzero(simplices >= 0)
+            planes = self.coefficients[simplices[inside]]
+            points = chunk[inside]
+            result[start + inside] = (planes[:, 0] * points[:, 0, None]
+                                      + planes[:, 1] * points[:, 1, None] + planes[:, 2])
+        if self._scalar:
+            return result.reshape(shape)
+        return result.reshape(shape + (channels,))
+
+    def regrid(self, x, y):
+        """Wartości na siatce regularnej: tablica (len(y), len(x)) lub (len(y), len(x), k).
+
+        Punkty siatki są tworzone porcjami wierszy, a nie naraz.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        channels = self.coefficients.shape[2]
+        result = np.empty((len(y), len(x), channels))
+        rows = max(1, self.chunk_size // max(len(x), 1))
+        for start in range(0, len(y), rows):
+            grid_x, grid_y = np.meshgrid(x, y[start:start + rows])
+            block = np.stack([grid_x, grid_y], axis=-1)
+            result[start:start + rows] = self(block).reshape(len(grid_y), len(x), channels)
+        return result[..., 0] if self._scalar else result
@@ -0,0 +1,136 @@
+"""
+Triangulacja Delaunay'a przez wstawianie punktów i zamiany krawędzi (Lawson)
+
+Punkt dzieli trójkąt, w którym leży, na trzy, a następnie krawędzie
+naprzeciw nowego wierzchołka są zamieniane (flip), dopóki sąsiad ma punkt
+w swoim okręgu opisanym. Siatka, duchy, marsz i porządek wstawiania są
+wspólne z BowyerWatsonTriangulation - różni się tylko krok wstawiania:
+na punkt przypadają dwa nowe miejsca w tablicach, a zamiany nadpisują
+istniejące trójkąty w miejscu.
+"""
+from bowyer_watson import BowyerWatsonTriangulation
+from predicates import orient2d
+from triangle_mesh import GHOST
+
+
+class LawsonTriangulation(BowyerWatsonTriangulation):
+    """Silnik z zamianami krawędzi o tym samym interfejsie co BowyerWatsonTriangulation.
+
+    Krawędzie z duchem też podlegają zamianom: okrąg ducha to półpłaszczyzna
+    za krawędzią otoczki, więc punkt spoza otoczki przez zamiany z duchami
+    dołącza do otoczki wszystkie widoczne z niego krawędzie.
+    ``search='scan'`` szuka trójkąta zawierającego punkt przeglądem całej siatki.
+    """
+
+    def __init__(self, search='walk', order=None, seed=None, profiler=None):
+        super().__init__(search=search, order=order, seed=seed, profiler=profiler)
+        # Liczba zamian krawędzi w ostatniej triangulacji i w ostatnim wstawieniu
+        self.flips = 0
+        self._last_flips = 0
+
+    def _scan_locate(self, mesh, px, py):
+        """Przegląd wszystkich trójkątów: zawierający punkt albo duch w konflikcie"""
+        tri = mesh.triangles
+        xs, ys = mesh.xs, mesh.ys
+        for t in mesh.live_triangles():
+            k = 3 * t
+            a, b, c = tri[k], tri[k + 1], tri[k + 2]
+            if c == GHOST:
+                if self._in_conflict(mesh, t, px, py):
+                    return t
+                continue
+            ax, ay, bx, by, cx, cy = xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]
+            if ((px == ax and py == ay) or (px == bx and py == by)
+                    or (px == cx and py == cy)):
+                return None  # Punkt powtórzony
+            if (orient2d(ax, ay, bx, by, px, py) >= 0 and orient2d(bx, by, cx, cy, px, py) >= 0
+                    and orient2d(cx, cy, ax, ay, px, py) >= 0):
+                return t
+        return None
+
+    def _cavity_from(self, mesh, start, px, py):
+        return (start,)
+
+    def _find_cavity(self, mesh, px, py):
+        """Trójkąt zawierający punkt (lub duch, za którego krawędzią leży), None dla powtórzonego"""
+        if self.search == 'scan':
+            t = self._scan_locate(mesh, px, py)
+        else:
+            t = self._locate(mesh, px, py)
+        return None if t is None else (t,)
+
+    def _insertion_sizes(self, found):
+        """Wstawienie z z zamianami odpowiada wnęce 1 + z trójkątów z brzegiem 3 + z"""
+        return 1 + self._last_flips, 3 + self._last_flips
+
+    @staticmethod
+    def _set(tri, nbr, t, a, b, c, na, nb, nc):
+        """Zapisuje trójkąt (a, b, c) z sąsiadami, GHOST zawsze na pozycji 2"""
+        if a == GHOST:
+            a, b, c, na, nb, nc = b, c, a, nb, nc, na
+        elif b == GHOST:
+            a, b, c, na, nb, nc = c, a, b, nc, na, nb
+        k = 3 * t
+        tri[k] = a
+        tri[k + 1] = b
+        tri[k + 2] = c
+        nbr[k] = na
+        nbr[k + 1] = nb
+        nbr[k + 2] = nc
+
+    def _insert(self, mesh, v, t):
+        """Podział trójkąta t na trzy wokół v i zamiany krawędzi naprzeciw v"""
+        tri = mesh.triangles
+        nbr = mesh.neighbors
+        k = 3 * t
+        a, b, c = tri[k], tri[k + 1], tri[k + 2]
+        na, nb, nc = nbr[k], nbr[k + 1], nbr[k + 2]
+        t1 = mesh.add_triangle(a, b, c)
+        t2 = mesh.add_triangle(a, b, c)
+        ia, ib = 3 * na + mesh.neighbor_index(na, t), 3 * nb + mesh.neighbor_index(nb, t)
+        self._set(tri, nbr, t, a, b, v, t1, t2, nc)
+        self._set(tri, nbr, t1, b, c, v, t2, t, na)
+        self._set(tri, nbr, t2, c, a, v, t, t1, nb)
+        nbr[ia] = t1
+        nbr[ib] = t2
+
+        px, py = mesh.xs[v], mesh.ys[v]
+        in_conflict = self._in_conflict
+        flips = 0
+        stack = [t, t1, t2]
+        while stack:
+            t = stack.pop()
+            k = 3 * t
+            # Trójkąt (v, x, y) i sąsiad u za krawędzią (x, y)
+            i = 0 if tri[k] == v else 1 if tri[k + 1] == v else 2
+            u = nbr[k + i]
+            if not in_conflict(mesh, u, px, py):
+                continue
+            x, y = tri[k + (i + 1) % 3], tri[k + (i + 2) % 3]
+            n_vx, n_yv = nbr[k + (i + 2) % 3], nbr[k + (i + 1) % 3]
+            m = 3 * u
+            j = mesh.neighbor_index(u, t)
+            d = tri[m + j]
+            # u = (d, y, x): za krawędzią (x, d) leży n_xd, za (d, y) - n_dy
+            n_xd, n_dy = nbr[m + (j + 1) % 3], nbr[m + (j + 2) % 3]
+            # Zamiana (x, y) -> (v, d): t = (v, x, d), u = (v, d, y)
+            ixd = 3 * n_xd + mesh.neighbor_index(n_xd, u)
+            iyv = 3 * n_yv + mesh.neighbor_index(n_yv, t)
+            self._set(tri, nbr, t, v, x, d, n_xd, u, n_vx)
+            self._set(tri, nbr, u, v, d, y, n_dy, n_yv, t)
+            nbr[ixd] = t
+            nbr[iyv] = u
+            flips += 1
+            stack.append(t)
+            stack.append(u)
+
+        self.flips += flips
+        self._last_flips = flips
+        self._last = t
+        if self._buckets is not None:
+            self._remember(mesh, v, t)
+        return t
+
+    def triangulate(self, points):
+        self.flips = 0
+        return super().triangulate(points)
@@ -0,0 +1,183 @@
+"""
+Binarny format pliku siatki z odczytem przez np.memmap
+
+Układ pliku (little-endian, każda sekcja wyrównana do 64 bajtów):
+    nagłówek 64 B: magic, wersja, flagi, liczba punktów, liczba trójkątów
+    punkty       float64 (n, 2)
+    simplices    int32   (m, 3)
+    neighbors    int32   (m, 3)   - opcjonalnie
+    quality      float64 (m,)     - opcjonalnie, kolumny statystyk
+    areas        float64 (m,)
+    angles       float64 (m, 3)
+"""
+import shutil
+import struct
+import tempfile
+
+import numpy as np
+
+from statistics_collector import StreamingStatistics, TriangulationStatistics
+
+MAGIC = b'BWMESH\x00\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sIIQQ')
+HEADER_SIZE = 64
+ALIGNMENT = 64
+
+# Flagi sekcji opcjonalnych
+HAS_NEIGHBORS = 1
+HAS_STATISTICS = 2
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _layout(n_points, n_triangles, flags):
+    """Lista (nazwa, dtype, kształt, przesunięcie) sekcji pliku"""
+    sections = [('points', '<f8', (n_points, 2)), ('simplices', '<i4', (n_triangles, 3))]
+    if flags & HAS_NEIGHBORS:
+        sections.append(('neighbors', '<i4', (n_triangles, 3)))
+    if flags & HAS_STATISTICS:
+        sections += [('quality', '<f8', (n_triangles,)), ('areas', '<f8', (n_triangles,)),
+                     ('angles', '<f8', (n_triangles, 3))]
+    layout = []
+    offset = HEADER_SIZE
+    for name, dtype, shape in sections:
+        layout.append((name, dtype, shape, offset))
+        offset = _align(offset + np.dtype(dtype).itemsize * int(np.prod(shape)))
+    return layout, offset
+
+
+def save_mesh(path, points, simplices, neighbors=None, statistics=False):
+    """Zapisuje siatkę do pliku.
+
+    ``statistics`` to False, True (kolumny liczone przez calculate_batch)
+    albo gotowa krotka (quality, areas, angles).
+    """
+    points = np.asarray(points, dtype='<f8').reshape(-1, 2)
+    simplices = np.asarray(simplices, dtype='<i4').reshape(-1, 3)
+    columns = {'points': points, 'simplices': simplices}
+    flags = 0
+    if neighbors is not None:
+        flags |= HAS_NEIGHBORS
+        columns['neighbors'] = np.asarray(neighbors, dtype='<i4').reshape(-1, 3)
+    if statistics is not False and statistics is not None:
+        if statistics is True:
+            statistics = TriangulationStatistics().calculate_batch(points, simplices)
+        flags |= HAS_STATISTICS
+        quality, areas, angles = statistics
+        columns['quality'] = np.asarray(quality, dtype='<f8')
+        columns['areas'] = np.asarray(areas, dtype='<f8')
+        columns['angles'] = np.asarray(angles, dtype='<f8').reshape(-1, 3)
+
+    layout, size = _layout(len(points), len(simplices), flags)
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, flags, len(points), len(simplices))
+                   .ljust(HEADER_SIZE, b'\x00'))
+        for name, dtype, shape, offset in layout:
+            file.seek(offset)
+            file.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+        file.truncate(size)
+
+
+def save_triangulation(path, triangulation, statistics=False):
+    """Zapisuje wynik BowyerWatsonTriangulation (i pochodnych) lub scipy.spatial.Delaunay"""
+    points = getattr(triangulation, 'points', None)
+    if points is None:
+        points = triangulation.mesh.points
+    save_mesh(path, points, triangulation.simplices, triangulation.neighbors, statistics)
+
+
+class MeshWriter:
+    """Zapis siatki porcjami, bez trzymania całości w pamięci.
+
+    Punkty trafiają od razu do pliku docelowego, trójkąty do pliku
+    tymczasowego, dołączanego przy ``close()`` razem z nagłówkiem.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.n_points = 0
+        self.n_triangles = 0
+        self._file = open(path, 'wb')
+        self._file.write(bytes(HEADER_SIZE))
+        self._simplices = tempfile.TemporaryFile()
+
+    def add_points(self, points):
+        points = np.ascontiguousarray(points, dtype='<f8').reshape(-1, 2)
+        self._file.write(points.tobytes())
+        self.n_points += len(points)
+
+    def add_triangles(self, simplices):
+        simplices = np.ascontiguousarray(simplices, dtype='<i4').reshape(-1, 3)
+        self._simplices.write(simplices.tobytes())
+        self.n_triangles += len(simplices)
+
+    def close(self):
+        if self._file.closed:
+            return
+        layout, size = _layout(self.n_points, self.n_triangles, 0)
+        self._file.seek(layout[1][3])
+        self._simplices.seek(0)
+        shutil.copyfileobj(self._simplices, self._file)
+        self._file.truncate(size)
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, 0, self.n_points, self.n_triangles))
+        self._file.close()
+        self._simplices.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class MeshFile:
+    """Siatka odczytana z pliku; tablice są np.memmap (bez wczytywania do RAM)"""
+
+    def __init__(self, path, mode='r'):
+        with open(path, 'rb') as file:
+            header = file.read(HEADER_SIZE)
+        if len(header) < HEADER.size:
+            raise ValueError(f"Plik {path!r} jest zbyt krótki na nagłówek siatki")
+        magic, version, flags, n_points, n_triangles = HEADER.unpack_from(header)
+        if magic != MAGIC:
+            raise ValueError(f"Plik {path!r} nie jest plikiem siatki")
+        if version != VERSION:
+            raise ValueError(f"Nieobsługiwana wersja pliku siatki: {version}")
+        self.path = path
+        self.flags = flags
+        self.neighbors = None
+        self.quality = self.areas = self.angles = None
+        layout, _ = _layout(n_points, n_triangles, flags)
+        for name, dtype, shape, offset in layout:
+            if 0 in shape:
+                array = np.empty(shape, dtype=dtype)
+            else:
+                array = np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=shape)
+            setattr(self, name, array)
+
+    def __len__(self):
+        return len(self.simplices)
+
+    @property
+    def has_statistics(self):
+        return bool(self.flags & HAS_STATISTICS)
+
+    def statistics(self, chunk_size=1_000_000, **options):
+        """Statystyki jak calculate_streaming_statistics, z zapisanych kolumn jeśli są"""
+        if not self.has_statistics:
+            return TriangulationStatistics().calculate_streaming_statistics(
+                self.points, self.simplices, chunk_size, **options)
+        accumulator = StreamingStatistics(**options)
+        for i in range(0, len(self), chunk_size):
+            accumulator.update(self.quality[i:i + chunk_size], self.areas[i:i + chunk_size],
+                               self.angles[i:i + chunk_size])
+        return accumulator.result()
+
+
+def load_mesh(path, mode='r'):
+    """Otwiera plik siatki przez np.memmap (mode 'r' lub 'r+')"""
+    return MeshFile(path, mode)
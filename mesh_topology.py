@@ -0,0 +1,147 @@
+"""
+Topologia siatki liczona wektorowo z tablicy simplices: krawędzie, sąsiedztwo,
+brzeg i diagram Voronoi (dualny do triangulacji Delaunay'a)
+"""
+import numpy as np
+
+
+def _directed_edges(simplices):
+    """Krawędzie skierowane (3m, 2); wiersz i*m + t to krawędź naprzeciw wierzchołka i w t"""
+    return np.stack([simplices[:, [1, 2]], simplices[:, [2, 0]], simplices[:, [0, 1]]]).reshape(-1, 2)
+
+
+def _edge_keys(edges, n):
+    lo = np.minimum(edges[:, 0], edges[:, 1])
+    hi = np.maximum(edges[:, 0], edges[:, 1])
+    return lo * n + hi
+
+
+def unique_edges(simplices, return_inverse=False):
+    """Unikalne krawędzie (E, 2) jako pary indeksów (mniejszy, większy).
+
+    Z ``return_inverse`` zwraca też (m, 3) indeksy krawędzi naprzeciw
+    kolejnych wierzchołków trójkątów.
+    """
+    simplices = np.asarray(simplices, dtype=np.int64).reshape(-1, 3)
+    n = int(simplices.max()) + 1 if len(simplices) else 1
+    keys, inverse = np.unique(_edge_keys(_directed_edges(simplices), n), return_inverse=True)
+    edges = np.column_stack([keys // n, keys % n])
+    if return_inverse:
+        return edges, inverse.reshape(3, -1).T
+    return edges
+
+
+def edge_triangles(simplices):
+    """Krawędzie (E, 2) i trójkąty po ich obu stronach (E, 2), -1 na brzegu"""
+    simplices = np.asarray(simplices, dtype=np.int64).reshape(-1, 3)
+    m = len(simplices)
+    if m == 0:
+        return np.empty((0, 2), dtype=np.int64), np.empty((0, 2), dtype=np.int64)
+    n = int(simplices.max()) + 1
+    keys = _edge_keys(_directed_edges(simplices), n)
+    # Jedno sortowanie: kolejne wystąpienia tej samej krawędzi są obok siebie
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    first = np.flatnonzero(np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]]))
+    shared = np.flatnonzero(np.diff(np.append(first, len(keys))) > 1)
+    edges = np.column_stack([sorted_keys[first] // n, sorted_keys[first] % n])
+    triangles = np.full((len(first), 2), -1, dtype=np.int64)
+    triangles[:, 0] = order[first] % m
+    triangles[shared, 1] = order[first[shared] + 1] % m
+    return edges, triangles
+
+
+def boundary_edges(simplices):
+    """Krawędzie brzegowe (B, 2) skierowane tak, jak w swoich trójkątach (obszar po lewej)"""
+    simplices = np.asarray(simplices, dtype=np.int64).reshape(-1, 3)
+    if len(simplices) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+    directed = _directed_edges(simplices)
+    _, inverse, counts = np.unique(_edge_keys(directed, int(simplices.max()) + 1),
+                                   return_inverse=True, return_counts=True)
+    return directed[counts[inverse] == 1]
+
+
+def vertex_adjacency(simplices, n_points=None):
+    """Sąsiedzi wierzchołków w formacie CSR: sąsiedzi v to indices[indptr[v]:indptr[v + 1]]"""
+    simplices = np.asarray(simplices, dtype=np.int64).reshape(-1, 3)
+    if n_points is None:
+        n_points = int(simplices.max()) + 1 if len(simplices) else 0
+    return _csr(unique_edges(simplices), n_points)
+
+
+def _csr(edges, n_points):
+    """Krawędzie nieskierowane (E, 2) -> sąsiedztwo CSR w obu kierunkach"""
+    source = np.concatenate([edges[:, 0], edges[:, 1]])
+    target = np.concatenate([edges[:, 1], edges[:, 0]])
+    order = np.argsort(source * n_points + target)
+    indptr = np.zeros(n_points + 1, dtype=np.int64)
+    np.cumsum(np.bincount(source, minlength=n_points), out=indptr[1:])
+    return indptr, target[order]
+
+
+def circumcenters(points, simplices):
+    """Środki okręgów opisanych (m, 2); trójkąty zdegenerowane dają inf lub nan"""
+    p = np.asarray(points, dtype=np.float64)[np.asarray(simplices).reshape(-1, 3)]
+    a = p[:, 0]
+    b = p[:, 1] - a
+    c = p[:, 2] - a
+    d = 2.0 * (b[:, 0] * c[:, 1] - b[:, 1] * c[:, 0])
+    b2 = (b * b).sum(axis=1)
+    c2 = (c * c).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x = (c[:, 1] * b2 - b[:, 1] * c2) / d
+        y = (b[:, 0] * c2 - c[:, 0] * b2) / d
+    return a + np.column_stack([x, y])
+
+
+class VoronoiDiagram:
+    """Diagram Voronoi jako dual triangulacji Delaunay'a.
+
+    ``vertices`` to środki okręgów opisanych (wierzchołek i odpowiada trójkątowi i),
+    ``ridge_points`` / ``ridge_vertices`` - pary punktów rozdzielanych przez
+    krawędź Voronoi i jej końce (-1 dla półprostej na zewnątrz otoczki, jak w
+    scipy.spatial.Voronoi). Komórki są w formacie CSR: wierzchołki komórki p
+    (kolejno CCW) to ``region_vertices[region_indptr[p]:region_indptr[p + 1]]``,
+    komórki sąsiednie - ``neighbors[neighbor_indptr[p]:neighbor_indptr[p + 1]]``.
+    """
+
+    def __init__(self, points, simplices):
+        self.points = np.asarray(points, dtype=np.float64)
+        simplices = np.asarray(simplices, dtype=np.int64).reshape(-1, 3)
+        n = len(self.points)
+        self.vertices = circumcenters(self.points, simplices)
+        self.ridge_points, self.ridge_vertices = edge_triangles(simplices)
+        self.neighbor_indptr, self.neighbors = _csr(self.ridge_points, n)
+
+        # Wierzchołki komórek: trójkąty incydentne z punktem, uporządkowane kątem
+        # środka okręgu wokół punktu
+        owner = simplices.ravel()
+        triangle = np.repeat(np.arange(len(simplices)), 3)
+        offset = self.vertices[triangle] - self.points[owner]
+        angle = np.arctan2(offset[:, 1], offset[:, 0])
+        # Jeden klucz zmiennoprzecinkowy: punkt + kąt przesunięty do [0, 2pi] (< 8)
+        order = np.argsort(owner * 8.0 + (angle + np.pi))
+        self.region_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(owner, minlength=n), out=self.region_indptr[1:])
+        self.region_vertices = triangle[order]
+
+        # Komórki punktów otoczki są nieograniczone
+        self.unbounded = np.zeros(n, dtype=bool)
+        self.unbounded[self.ridge_points[self.ridge_vertices[:, 1] < 0].ravel()] = True
+
+    @classmethod
+    def from_triangulation(cls, triangulation):
+        """Z BowyerWatsonTriangulation (i pochodnych) lub scipy.spatial.Delaunay"""
+        points = getattr(triangulation, 'points', None)
+        if points is None:
+            points = triangulation.mesh.points
+        return cls(points, triangulation.simplices)
+
+    def region(self, p):
+        """Indeksy wierzchołków komórki punktu p (CCW)"""
+        return self.region_vertices[self.region_indptr[p]:self.region_indptr[p + 1]]
+
+    def cell_neighbors(self, p):
+        """Punkty, których komórki sąsiadują z komórką p"""
+        return self.neighbors[self.neighbor_indptr[p]:self.neighbor_indptr[p + 1]]
@@ -0,0 +1,197 @@
+"""
+Równoległa triangulacja Delaunay'a metodą dziel i zwyciężaj
+
+Punkty są dzielone na pionowe pasy, każdy pas jest triangulowany
+algorytmem Bowyera-Watsona w osobnym procesie. Trójkąt pasa, którego
+okrąg opisany leży w całości wewnątrz pasa, jest trójkątem Delaunay'a
+całego zbioru ("bezpieczny"). Pozostały obszar wzdłuż szwów jest
+triangulowany ponownie z wierzchołków niebezpiecznych trójkątów,
+a z wyniku wybierane są tylko trójkąty leżące poza bezpiecznymi.
+Tablice punktów i trójkątów są przekazywane przez pamięć współdzieloną.
+
+Dla punktów w położeniu ogólnym wynik to ten sam zbiór trójkątów co
+triangulacja szeregowa. Przy remisach (co najmniej cztery punkty na
+jednym pustym okręgu, np. siatki i współrzędne całkowite) triangulacja
+Delaunay'a nie jest jednoznaczna: pasy i szwy wstawiają punkty w innej
+kolejności niż wersja szeregowa, więc komórki współokręgowe mogą być
+podzielone inaczej - wynik jest poprawną triangulacją Delaunay'a, ale nie
+musi być identyczny.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from bowyer_watson import BowyerWatsonTriangulation
+from triangle_mesh import neighbors_from_simplices
+
+
+def _triangulate_strip(task):
+    """Trianguluje pas [start, end) i zapisuje bezpieczne trójkąty do pamięci współdzielonej"""
+    names, n_points, start, end, x_lo, x_hi, options = task
+    shm_points, shm_triangles, shm_interior = (shared_memory.SharedMemory(name=name)
+                                                 for name in names)
+    try:
+        points = np.ndarray((n_points, 2), dtype=np.float64, buffer=shm_points.buf)
+        triangles = np.ndarray((2 * n_points, 3), dtype=np.int32, buffer=shm_triangles.buf)
+        interior = np.ndarray((n_points,), dtype=np.bool_, buffer=shm_interior.buf)
+
+        strip = points[start:end]
+        triangulation = BowyerWatsonTriangulation(**options)
+        simplices = triangulation.triangulate(strip)
+        safe = safe_triangles(strip, simplices, x_lo, x_hi)
+
+        # Wierzchołek jest wewnętrzny, gdy nie leży na otoczce pasa, a wszystkie
+        # jego trójkąty są bezpieczne - wtedy jego gwiazda jest już ostateczna
+        incident = np.bincount(simplices.ravel(), minlength=len(strip))
+        unsafe = np.bincount(simplices[~safe].ravel(), minlength=len(strip))
+        on_hull = np.zeros(len(strip), dtype=bool)
+        hull_triangles, hull_slots = np.nonzero(triangulation.neighbors < 0)
+        for shift in (1, 2):
+            on_hull[simplices[hull_triangles, (hull_slots + shift) % 3]] = True
+        interior[start:end] = (incident > 0) & (unsafe == 0) & ~on_hull
+
+        kept = simplices[safe] + start
+        triangles[2 * start:2 * start + len(kept)] = kept
+        return len(kept)
+    finally:
+        for shm in (shm_points, shm_triangles, shm_interior):
+            shm.close()
+
+
+def safe_triangles(points, simplices, x_lo, x_hi):
+    """Maska trójkątów, których okrąg opisany leży ściśle wewnątrz pasa (x_lo, x_hi)"""
+    p1 = points[simplices[:, 0]]
+    b = points[simplices[:, 1]] - p1
+    c = points[simplices[:, 2]] - p1
+    d = 2.0 * (b[:, 0] * c[:, 1] - b[:, 1] * c[:, 0])
+    b2 = (b ** 2).sum(axis=1)
+    c2 = (c ** 2).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ux = (c[:, 1] * b2 - b[:, 1] * c2) / d
+        uy = (b[:, 0] * c2 - c[:, 0] * b2) / d
+        radius = np.hypot(ux, uy)
+        cx = p1[:, 0] + ux
+        # Zapas na błędy zaokrągleń - trójkąt wątpliwy trafia do naprawy szwu
+        margin = 1e-9 * (np.abs(cx) + radius)
+        safe = (cx - radius - margin > x_lo) & (cx + radius + margin < x_hi)
+    return safe & np.isfinite(radius)
+
+
+class ParallelTriangulation:
+    """Triangulacja pasami w puli procesów z naprawą szwów"""
+
+    def __init__(self, workers=None, strips=None, **options):
+        self.workers = workers or os.cpu_count() or 1
+        self.strips = strips or self.workers
+        # Opcje przekazywane do BowyerWatsonTriangulation (search, order, seed)
+        self.options = options
+        self.simplices = np.empty((0, 3), dtype=np.int32)
+        self.neighbors = np.empty((0, 3), dtype=np.int32)
+        self.seam_points = 0
+
+    def _split(self, xs):
+        """Granice pasów w posortowanych współrzędnych x (bez rozcinania równych x)"""
+        n = len(xs)
+        bounds = [0]
+        for k in range(1, self.strips):
+            i = max(k * n // self.strips, bounds[-1] + 1)
+            while i < n and xs[i] == xs[i - 1]:
+                i += 1
+            # Pas musi mieć co najmniej 3 punkty
+            if i - bounds[-1] >= 3 and n - i >= 3:
+                bounds.append(i)
+        bounds.append(n)
+        return bounds
+
+    def triangulate(self, points):
+        """Zwraca simplices w formacie scipy.spatial.Delaunay.
+
+        Bez remisów te same trójkąty co triangulacja szeregowa; komórki
+        współokręgowe mogą być podzielone inaczej (patrz opis modułu).
+        """
+        points = np.asarray(points, dtype=np.float64)
+        empty = np.empty((0, 3), dtype=np.int32)
+        self.simplices, self.neighbors = empty, empty
+        if len(points) < 3:
+            return self.simplices
+
+        # Punkty powtórzone - jak w wersji szeregowej zostaje pierwsze wystąpienie
+        _, first = np.unique(points, axis=0, return_index=True)
+        by_x = first[np.lexsort((points[first, 1], points[first, 0]))]
+        sorted_points = points[by_x]
+        n = len(sorted_points)
+
+        xs = sorted_points[:, 0]
+        bounds = self._split(xs)
+        seams = [-np.inf] + [(xs[i - 1] + xs[i]) / 2 for i in bounds[1:-1]] + [np.inf]
+
+        shms = [shared_memory.SharedMemory(create=True, size=max(size, 1))
+                for size in (sorted_points.nbytes, 2 * n * 3 * 4, n)]
+        try:
+            shared_points = np.ndarray((n, 2), dtype=np.float64, buffer=shms[0].buf)
+            shared_points[:] = sorted_points
+            triangles = np.ndarray((2 * n, 3), dtype=np.int32, buffer=shms[1].buf)
+            interior = np.ndarray((n,), dtype=np.bool_, buffer=shms[2].buf)
+            interior[:] = False
+
+            names = tuple(shm.name for shm in shms)
+            tasks = [(names, n, bounds[k], bounds[k + 1], seams[k], seams[k + 1], self.options)
+                     for k in range(len(bounds) - 1)]
+            if self.workers > 1 and len(tasks) > 1:
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    counts = list(executor.map(_triangulate_strip, tasks))
+            else:
+                counts = [_triangulate_strip(task) for task in tasks]
+
+            safe = np.concatenate([triangles[2 * bounds[k]:2 * bounds[k] + count]
+                                   for k, count in enumerate(counts)])
+            seam_vertices = np.flatnonzero(~interior)
+        finally:
+            for shm in shms:
+                shm.close()
+                shm.unlink()
+
+        simplices = self._repair_seams(sorted_points, safe, seam_vertices)
+        self.seam_points = len(seam_vertices)
+        self.simplices = by_x[simplices].astype(np.int32)
+        self.neighbors = neighbors_from_simplices(self.simplices)
+        return self.simplices
+
+    def _repair_seams(self, points, safe, seam_vertices):
+        """Dokłada trójkąty Delaunay'a z obszaru niepokrytego bezpiecznymi trójkątami"""
+        triangulation = BowyerWatsonTriangulation(**self.options)
+        local = triangulation.triangulate(points[seam_vertices])
+        seam = seam_vertices[local]
+        if len(safe) == 0:
+            return seam
+
+        n = len(points)
+        # Skierowane krawędzie bezpiecznych trójkątów; krawędź bez bliźniaczej
+        # krawędzi odwrotnej leży na granicy obszaru szwu
+        safe_start = safe[:, [1, 2, 0]].ravel().astype(np.int64)
+        safe_end = safe[:, [2, 0, 1]].ravel().astype(np.int64)
+        safe_keys = safe_start * n + safe_end
+        border = ~np.isin(safe_end * n + safe_start, safe_keys)
+        border_keys = safe_keys[border]
+        border_undirected = np.concatenate([border_keys,
+                                            safe_end[border] * n + safe_start[border]])
+
+        seam_start = seam[:, [1, 2, 0]].ravel().astype(np.int64)
+        seam_end = seam[:, [2, 0, 1]].ravel().astype(np.int64)
+        seam_keys = seam_start * n + seam_end
+        # Zarodki: trójkąty po drugiej stronie krawędzi granicznych
+        seeds = np.isin(seam_end * n + seam_start, border_keys).reshape(-1, 3).any(axis=1)
+        blocked = np.isin(seam_keys, border_undirected).reshape(-1, 3)
+
+        # Wypełnianie obszaru szwu po sąsiadach, bez przekraczania granicy
+        neighbors = triangulation.neighbors
+        inside = seeds.copy()
+        frontier = np.flatnonzero(seeds)
+        while len(frontier):
+            candidates = np.where(blocked[frontier], -1, neighbors[frontier]).ravel()
+            candidates = np.unique(candidates[candidates >= 0])
+            frontier = candidates[~inside[candidates]]
+            inside[frontier] = True
+        return np.concatenate([safe, seam[inside]])
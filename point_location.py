@@ -0,0 +1,239 @@
+"""
+Zapytania o położenie punktów w triangulacji: trójkąt zawierający punkt
+i najbliższy wierzchołek, liczone wektorowo dla całych partii zapytań
+"""
+import numpy as np
+
+from insertion_order import hilbert_order
+from mesh_topology import vertex_adjacency
+from triangle_mesh import neighbors_from_simplices
+
+# Tolerancja współrzędnych barycentrycznych (jak w scipy.spatial.Delaunay)
+_EPS = 100 * np.finfo(np.float64).eps
+# Liczba wierzchołków próbki, z której startuje zejście dla punktów poza otoczką
+_SAMPLE_SIZE = 256
+
+
+def barycentric_transforms(points, simplices):
+    """Przekształcenia afiniczne (m, 3, 2) w formacie Delaunay.transform.
+
+    Dla punktu x: ``T[:2] @ (x - T[2])`` to dwie pierwsze współrzędne
+    barycentryczne, trzecia jest dopełnieniem do 1. Trójkąty zdegenerowane
+    dostają NaN.
+    """
+    p = np.asarray(points, dtype=np.float64)[simplices]
+    r = p[:, 2]
+    a = p[:, 0] - r
+    b = p[:, 1] - r
+    det = a[:, 0] * b[:, 1] - b[:, 0] * a[:, 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv = 1.0 / np.where(det != 0, det, np.nan)
+    transform = np.empty((len(simplices), 3, 2))
+    transform[:, 0, 0] = b[:, 1] * inv
+    transform[:, 0, 1] = -b[:, 0] * inv
+    transform[:, 1, 0] = -a[:, 1] * inv
+    transform[:, 1, 1] = a[:, 0] * inv
+    transform[:, 2] = r
+    return transform
+
+
+def _fill_nearest(grid, axis):
+    """Zastępuje -1 wartością najbliższej komórki różnej od -1 wzdłuż osi"""
+    grid = np.moveaxis(grid, axis, -1)
+    rows, size = grid.shape
+    index = np.broadcast_to(np.arange(size), grid.shape)
+    filled = grid >= 0
+    before = np.maximum.accumulate(np.where(filled, index, -1), axis=1)
+    after = np.minimum.accumulate(np.where(filled, index, size)[:, ::-1], axis=1)[:, ::-1]
+    use_after = (before < 0) | ((after < size) & (after - index < index - before))
+    source = np.where(use_after, after, before)
+    empty_line = source >= size
+    source[empty_line] = 0
+    result = np.take_along_axis(grid, np.clip(source, 0, size - 1), axis=1)
+    result[empty_line] = -1
+    return np.moveaxis(result, -1, axis)
+
+
+class TriangulationQuery:
+    """Lokalizacja punktów i najbliższe wierzchołki dla gotowej triangulacji.
+
+    ``find_simplex`` wykonuje marsz po sąsiadach równolegle dla wszystkich
+    zapytań, startując z trójkąta przypisanego komórce siatki kubełków
+    (jump-and-walk). ``nearest_vertex`` schodzi zachłannie po krawędziach
+    triangulacji od wierzchołka znalezionego trójkąta - w triangulacji
+    Delaunay'a takie zejście zawsze kończy się w najbliższym wierzchołku.
+    """
+
+    def __init__(self, points, simplices, neighbors=None, chunk_size=1_000_000):
+        self.points = np.asarray(points, dtype=np.float64)
+        self.simplices = np.asarray(simplices, dtype=np.int64).reshape(-1, 3)
+        if neighbors is None:
+            neighbors = neighbors_from_simplices(self.simplices)
+        self.neighbors = np.asarray(neighbors, dtype=np.int64).reshape(-1, 3)
+        self.chunk_size = chunk_size
+        self.transform = barycentric_transforms(self.points, self.simplices)
+        # Osobne kolumny przekształceń - szybsze pobieranie w marszu
+        self._columns = tuple(np.ascontiguousarray(column) for column in (
+            self.transform[:, 0, 0], self.transform[:, 0, 1], self.transform[:, 1, 0],
+            self.transform[:, 1, 1], self.transform[:, 2, 0], self.transform[:, 2, 1]))
+        self._init_grid()
+        self._adjacency = None
+        self._sample = None
+
+    @classmethod
+    def from_triangulation(cls, triangulation, **options):
+        """Z BowyerWatsonTriangulation (i pochodnych) lub scipy.spatial.Delaunay"""
+        points = getattr(triangulation, 'points', None)
+        if points is None:
+            points = triangulation.mesh.points
+        return cls(points, triangulation.simplices, triangulation.neighbors, **options)
+
+    def _init_grid(self):
+        # Około dwóch trójkątów na komórkę; komórka pamięta trójkąt o środku w niej
+        m = len(self.simplices)
+        used = self.points[np.unique(self.simplices)] if m else self.points[:1]
+        self._lo = used.min(axis=0) if len(used) else np.zeros(2)
+        span = (used.max(axis=0) - self._lo) if len(used) else np.ones(2)
+        self._size = max(1, int(np.sqrt(m / 2)))
+        self._scale = self._size / np.maximum(span, 1e-300)
+        seeds = np.full(self._size * self._size, -1, dtype=np.int64)
+        if m:
+            centroids = self.points[self.simplices].mean(axis=1)
+            seeds[self._cells(centroids)] = np.arange(m)
+            grid = seeds.reshape(self._size, self._size)
+            # Puste komórki dziedziczą trójkąt z najbliższej zajętej komórki w wierszu,
+            # a całe puste wiersze - z najbliższego zajętego wiersza
+            grid = _fill_nearest(grid, axis=1)
+            seeds = _fill_nearest(grid, axis=0).ravel()
+        self._seeds = seeds
+        if m:
+            # Ostatecznie komórka startuje z trójkąta zawierającego jej środek
+            # (lub najbliższego mu trójkąta otoczki)
+            centers = (np.arange(self._size) + 0.5) / self._scale[:, None] + self._lo[:, None]
+            center_x, center_y = np.meshgrid(centers[0], centers[1])
+            self._seeds, _ = self._walk(np.column_stack([center_x.ravel(), center_y.ravel()]))
+
+    def _cells(self, xy):
+        ij = ((xy - self._lo) * self._scale).astype(np.int64)
+        np.clip(ij, 0, self._size - 1, out=ij)
+        return ij[:, 1] * self._size + ij[:, 0]
+
+    def _walk(self, queries):
+        """Marsz dla partii zapytań; zwraca (ostatni trójkąt, czy zawiera punkt)"""
+        current = self._seeds[self._cells(queries)]
+        inside = np.zeros(len(queries), dtype=bool)
+        active = np.arange(len(queries))
+        qx, qy = queries[:, 0], queries[:, 1]
+        t00, t01, t10, t11, rx, ry = self._columns
+        hull = self.neighbors < 0
+        # W triangulacji Delaunay'a marsz widocznościowy nie ma cykli;
+        # limit kroków chroni tylko przed danymi niespełniającymi tej własności
+        for _ in range(len(self.simplices) + 1):
+            if len(active) == 0:
+                break
+            t = current[active]
+            dx = qx[active] - rx[t]
+            dy = qy[active] - ry[t]
+            l0 = t00[t] * dx + t01[t] * dy
+            l1 = t10[t] * dx + t11[t] * dy
+            l2 = 1.0 - l0 - l1
+            found = (l0 >= -_EPS) & (l1 >= -_EPS) & (l2 >= -_EPS)
+            inside[active[found]] = True
+            # Punkt za krawędzią otoczki leży poza (wypukłą) otoczką - koniec marszu
+            on_hull = hull[t]
+            outside = (((l0 < -_EPS) & on_hull[:, 0]) | ((l1 < -_EPS) & on_hull[:, 1])
+                       | ((l2 < -_EPS) & on_hull[:, 2]))
+            move = np.flatnonzero(~found & ~outside)
+            # Przejście przez krawędź naprzeciw najbardziej ujemnej współrzędnej
+            l0, l1, l2 = l0[move], l1[move], l2[move]
+            j = np.where(l0 < l1, np.where(l0 < l2, 0, 2), np.where(l1 < l2, 1, 2))
+            active = active[move]
+            current[active] = self.neighbors[t[move], j]
+        return current, inside
+
+    def find_simplex(self, queries):
+        """Indeksy trójkątów zawierających punkty, -1 poza otoczką (jak Delaunay.find_simplex)"""
+        queries = np.asarray(queries, dtype=np.float64).reshape(-1, 2)
+        result = np.full(len(queries), -1, dtype=np.int64)
+        if len(self.simplices) == 0:
+            return result
+        for start in range(0, len(queries), self.chunk_size):
+            chunk = queries[start:start + self.chunk_size]
+            triangles, inside = self._walk(chunk)
+            result[start:start + len(chunk)] = np.where(inside, triangles, -1)
+        return result
+
+    def _adjacency_csr(self):
+        if self._adjacency is None:
+            self._adjacency = vertex_adjacency(self.simplices, len(self.points))
+        return self._adjacency
+
+    def nearest_vertex(self, queries):
+        """Indeksy najbliższych wierzchołków triangulacji"""
+        queries = np.asarray(queries, dtype=np.float64).reshape(-1, 2)
+        result = np.full(len(queries), -1, dtype=np.int64)
+        if len(self.simplices) == 0:
+            return result
+        for start in range(0, len(queries), self.chunk_size):
+            chunk = queries[start:start + self.chunk_size]
+            result[start:start + len(chunk)] = self._descend(chunk)
+        return result
+
+    def _descend(self, queries, budget=1 << 22):
+        indptr, _ = self._adjacency_csr()
+        points = self.points
+        triangles, inside = self._walk(queries)
+        corners = self.simplices[triangles]
+        distances = ((points[corners] - queries[:, None, :]) ** 2).sum(axis=2)
+        best = np.argmin(distances, axis=1)
+        vertex = corners[np.arange(len(queries)), best]
+        distance = distances[np.arange(len(queries)), best]
+
+        # Poza otoczką marsz kończy się przy krawędzi otoczki, czasem daleko
+        # od najbliższego wierzchołka - start z najbliższego punktu rozłożonej próbki
+        if self._sample is None:
+            used = np.unique(self.simplices)
+            step = max(1, len(used) // _SAMPLE_SIZE)
+            self._sample = used[hilbert_order(points[used])[::step]]
+        sample = points[self._sample]
+        outside = np.flatnonzero(~inside)
+        for start in range(0, len(outside), 4096):
+            block = outside[start:start + 4096]
+            sample_distances = ((sample[None, :, :] - queries[block, None, :]) ** 2).sum(axis=2)
+            nearest = np.argmin(sample_distances, axis=1)
+            sample_distance = sample_distances[np.arange(len(block)), nearest]
+            closer = sample_distance < distance[block]
+            vertex[block[closer]] = self._sample[nearest[closer]]
+            distance[block[closer]] = sample_distance[closer]
+
+        active = np.arange(len(queries))
+        while len(active):
+            degree = indptr[vertex[active] + 1] - indptr[vertex[active]]
+            # Partie o ograniczonej łącznej liczbie sąsiadów (wierzchołki o dużym stopniu)
+            batch = np.cumsum(degree) // budget
+            active = np.concatenate([self._descend_step(queries, vertex, distance,
+                                                        active[batch == b])
+                                     for b in np.unique(batch)])
+        return vertex
+
+    def _descend_step(self, queries, vertex, distance, active):
+        """Jeden krok zejścia; zwraca zapytania, które przeszły do bliższego wierzchołka"""
+        indptr, adjacent = self._adjacency
+        points = self.points
+        v = vertex[active]
+        counts = indptr[v + 1] - indptr[v]
+        owner = np.repeat(np.arange(len(active)), counts)
+        offsets = np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
+        candidates = adjacent[indptr[v][owner] + offsets]
+        d = ((points[candidates] - queries[active][owner]) ** 2).sum(axis=1)
+        # Najbliższy sąsiad w każdym segmencie
+        segment_min = np.minimum.reduceat(d, np.cumsum(counts) - counts)
+        is_min = d == segment_min[owner]
+        first = np.flatnonzero(is_min)
+        owners, position = np.unique(owner[first], return_index=True)
+        closer = segment_min < distance[active]
+        improved = closer[owners]
+        moving = active[owners[improved]]
+        vertex[moving] = candidates[first[position[improved]]]
+        distance[moving] = segment_min[owners[improved]]
+        return moving
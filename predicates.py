@@ -0,0 +1,170 @@
+"""
+Odporne predykaty geometryczne: orientacja i test okręgu opisanego
+
+Szybka ścieżka liczy wyznacznik na skalarnych floatach i porównuje go
+z oszacowaniem błędu zaokrągleń (Shewchuk, "Adaptive Precision
+Floating-Point Arithmetic and Fast Robust Geometric Predicates").
+Gdy znak nie jest pewny, wyznacznik jest liczony dokładnie na liczbach
+całkowitych. Zwracana wartość ma zawsze poprawny znak. Wersje ``*_signs``
+liczą znaki dla całych tablic punktów (ten sam filtr, wektorowo).
+"""
+import numpy as np
+
+
+# Epsilon maszynowy dla float64 (połowa odstępu między 1.0 a następną liczbą)
+_EPSILON = 2.0 ** -53
+_CCW_ERRBOUND = (3.0 + 16.0 * _EPSILON) * _EPSILON
+_ICC_ERRBOUND = (10.0 + 96.0 * _EPSILON) * _EPSILON
+
+# Liczba wywołań dokładnej ścieżki od ostatniego resetu
+fallback_counts = {'orient2d': 0, 'incircle': 0}
+
+
+def reset_counters():
+    """Zeruje liczniki dokładnych obliczeń"""
+    for key in fallback_counts:
+        fallback_counts[key] = 0
+
+
+def get_counters():
+    """Kopia liczników dokładnych obliczeń"""
+    return dict(fallback_counts)
+
+
+def _exact_integers(*values):
+    # Floaty to ułamki o mianownikach będących potęgami dwójki - po sprowadzeniu
+    # do wspólnego mianownika dostajemy dokładne liczby całkowite. Wyznaczniki
+    # są jednorodne, więc skalowanie nie zmienia ich znaku.
+    ratios = [value.as_integer_ratio() for value in values]
+    denominator = max(d for _, d in ratios)
+    return [n * (denominator // d) for n, d in ratios]
+
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+
+def orient2d_exact(ax, ay, bx, by, cx, cy):
+    """Znak orientacji trójki punktów w arytmetyce dokładnej"""
+    ax, ay, bx, by, cx, cy = _exact_integers(ax, ay, bx, by, cx, cy)
+    return _sign((ax - cx) * (by - cy) - (ay - cy) * (bx - cx))
+
+
+def incircle_exact(ax, ay, bx, by, cx, cy, dx, dy):
+    """Znak testu okręgu opisanego w arytmetyce dokładnej"""
+    ax, ay, bx, by, cx, cy, dx, dy = _exact_integers(ax, ay, bx, by, cx, cy, dx, dy)
+    adx, ady = ax - dx, ay - dy
+    bdx, bdy = bx - dx, by - dy
+    cdx, cdy = cx - dx, cy - dy
+    return _sign((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+                 + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+                 + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
+
+
+def orient2d(ax, ay, bx, by, cx, cy):
+    """> 0 gdy a, b, c leżą przeciwnie do ruchu wskazówek zegara, < 0 gdy zgodnie, 0 gdy współliniowe"""
+    detleft = (ax - cx) * (by - cy)
+    detright = (ay - cy) * (bx - cx)
+    det = detleft - detright
+    if detleft > 0.0:
+        if detright <= 0.0:
+            return det
+        detsum = detleft + detright
+    elif detleft < 0.0:
+        if detright >= 0.0:
+            return det
+        detsum = -detleft - detright
+    else:
+        return det
+    errbound = _CCW_ERRBOUND * detsum
+    if det >= errbound or -det >= errbound:
+        return det
+    fallback_counts['orient2d'] += 1
+    return orient2d_exact(ax, ay, bx, by, cx, cy)
+
+
+def incircle(ax, ay, bx, by, cx, cy, dx, dy):
+    """> 0 gdy d leży wewnątrz okręgu opisanego na trójkącie CCW (a, b, c), 0 gdy na okręgu"""
+    adx = ax - dx
+    ady = ay - dy
+    bdx = bx - dx
+    bdy = by - dy
+    cdx = cx - dx
+    cdy = cy - dy
+
+    bdxcdy = bdx * cdy
+    cdxbdy = cdx * bdy
+    alift = adx * adx + ady * ady
+    cdxady = cdx * ady
+    adxcdy = adx * cdy
+    blift = bdx * bdx + bdy * bdy
+    adxbdy = adx * bdy
+    bdxady = bdx * ady
+    clift = cdx * cdx + cdy * cdy
+
+    det = (alift * (bdxcdy - cdxbdy)
+           + blift * (cdxady - adxcdy)
+           + clift * (adxbdy - bdxady))
+    # Wartości bezwzględne bez wywołań abs() - to najgorętsza funkcja triangulacji
+    permanent = ((bdxcdy if bdxcdy > 0.0 else -bdxcdy)
+                 + (cdxbdy if cdxbdy > 0.0 else -cdxbdy)) * alift \
+        + ((cdxady if cdxady > 0.0 else -cdxady)
+           + (adxcdy if adxcdy > 0.0 else -adxcdy)) * blift \
+        + ((adxbdy if adxbdy > 0.0 else -adxbdy)
+           + (bdxady if bdxady > 0.0 else -bdxady)) * clift
+    errbound = _ICC_ERRBOUND * permanent
+    if det > errbound or -det > errbound:
+        return det
+    fallback_counts['incircle'] += 1
+    return incircle_exact(ax, ay, bx, by, cx, cy, dx, dy)
+
+
+def circumcenter(ax, ay, bx, by, cx, cy):
+    """Środek okręgu opisanego lub None dla punktów współliniowych"""
+    if orient2d(ax, ay, bx, by, cx, cy) == 0:
+        return None
+    # Współrzędne względem a ograniczają utratę precyzji dla dużych wartości
+    bax, bay = bx - ax, by - ay
+    cax, cay = cx - ax, cy - ay
+    d = 2.0 * (bax * cay - bay * cax)
+    if d == 0.0:
+        return None
+    b2 = bax * bax + bay * bay
+    c2 = cax * cax + cay * cay
+    return (ax + (cay * b2 - bay * c2) / d,
+            ay + (bax * c2 - cax * b2) / d)
+
+
+def orient2d_signs(a, b, c):
+    """Znaki orient2d (k,) dla tablic punktów (k, 2), int8"""
+    a, b, c = (np.asarray(p, dtype=np.float64).reshape(-1, 2) for p in (a, b, c))
+    detleft = (a[:, 0] - c[:, 0]) * (b[:, 1] - c[:, 1])
+    detright = (a[:, 1] - c[:, 1]) * (b[:, 0] - c[:, 0])
+    det = detleft - detright
+    signs = np.sign(det).astype(np.int8)
+    uncertain = np.flatnonzero(np.abs(det) < _CCW_ERRBOUND * (np.abs(detleft) + np.abs(detright)))
+    fallback_counts['orient2d'] += len(uncertain)
+    for i in uncertain.tolist():
+        signs[i] = orient2d_exact(*a[i].tolist(), *b[i].tolist(), *c[i].tolist())
+    return signs
+
+
+def incircle_signs(a, b, c, d):
+    """Znaki incircle (k,) dla tablic punktów (k, 2), int8; trójkąty (a, b, c) CCW"""
+    a, b, c, d = (np.asarray(p, dtype=np.float64).reshape(-1, 2) for p in (a, b, c, d))
+    ad, bd, cd = a - d, b - d, c - d
+    alift = (ad * ad).sum(axis=1)
+    blift = (bd * bd).sum(axis=1)
+    clift = (cd * cd).sum(axis=1)
+    bdxcdy, cdxbdy = bd[:, 0] * cd[:, 1], cd[:, 0] * bd[:, 1]
+    cdxady, adxcdy = cd[:, 0] * ad[:, 1], ad[:, 0] * cd[:, 1]
+    adxbdy, bdxady = ad[:, 0] * bd[:, 1], bd[:, 0] * ad[:, 1]
+    det = (alift * (bdxcdy - cdxbdy) + blift * (cdxady - adxcdy) + clift * (adxbdy - bdxady))
+    permanent = ((np.abs(bdxcdy) + np.abs(cdxbdy)) * alift + (np.abs(cdxady) + np.abs(adxcdy)) * blift
+                 + (np.abs(adxbdy) + np.abs(bdxady)) * clift)
+    signs = np.sign(det).astype(np.int8)
+    uncertain = np.flatnonzero(np.abs(det) <= _ICC_ERRBOUND * permanent)
+    fallback_counts['incircle'] += len(uncertain)
+    for i in uncertain.tolist():
+        signs[i] = incircle_exact(*a[i].tolist(), *b[i].tolist(), *c[i].tolist(), *d[i].tolist())
+    return signs
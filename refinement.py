@@ -0,0 +1,237 @@
+"""
+Poprawa jakości siatki (Delaunay refinement, Ruppert) - wstawianie środków
+okręgów opisanych złych trójkątów i dzielenie naruszonych odcinków
+"""
+import copy
+import heapq
+import math
+import time
+
+import numpy as np
+
+from constrained_triangulation import ConstrainedDelaunayTriangulation, _key
+from predicates import circumcenter
+from triangle_mesh import GHOST
+
+
+class DelaunayRefinement:
+    """Algorytm Rupperta na ConstrainedDelaunayTriangulation.
+
+    Trójkąt jest zły, gdy jego najmniejszy kąt jest mniejszy niż ``min_angle``
+    (stopnie), jakość (calculate_triangle_quality) mniejsza niż ``min_quality``
+    albo pole większe niż ``max_area``. Złe trójkąty czekają w kolejce
+    priorytetowej (najgorsza jakość pierwsza) i są usuwane przez wstawienie
+    środka okręgu opisanego - lokalnie, wnęką Bowyera-Watsona. Odcinek, którego
+    okrąg średnicowy zawiera wierzchołek, jest najpierw dzielony w połowie.
+    Gdy triangulacja nie ma odcinków, brzegiem jest jej otoczka wypukła.
+
+    Gwarancja zakończenia (Ruppert) obejmuje ``min_angle`` do około 20.7°
+    i dane bez kątów ostrych między odcinkami; ``max_points`` ogranicza liczbę
+    punktów Steinera w pozostałych przypadkach.
+    """
+
+    def __init__(self, min_angle=20.0, min_quality=None, max_area=None, max_points=None):
+        self.min_angle = min_angle
+        self.min_quality = min_quality
+        self.max_area = max_area
+        self.max_points = max_points
+        self._sin_min_angle = math.sin(math.radians(min_angle)) if min_angle else 0.0
+
+    def _badness(self, t):
+        """Jakość trójkąta t, jeśli jest zły, w przeciwnym razie None"""
+        mesh = self.triangulation.mesh
+        tri = mesh.triangles
+        xs, ys = mesh.xs, mesh.ys
+        k = 3 * t
+        a, b, c = tri[k], tri[k + 1], tri[k + 2]
+        ax, ay, bx, by, cx, cy = xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]
+        la = math.hypot(bx - cx, by - cy)
+        lb = math.hypot(ax - cx, ay - cy)
+        lc = math.hypot(ax - bx, ay - by)
+        area = abs((bx - ax) * (cy - ay) - (cx - ax) * (by - ay)) / 2
+        product = la * lb * lc
+        if area == 0 or product == 0:
+            return None
+        # sin najmniejszego kąta = najkrótszy bok / (2R), jakość = 2r / R
+        bad = min(la, lb, lc) * 2 * area / product < self._sin_min_angle
+        quality = 16 * area * area / ((la + lb + lc) * product)
+        if self.min_quality is not None and quality < self.min_quality:
+            bad = True
+        if self.max_area is not None and area > self.max_area:
+            bad = True
+        return quality if bad else None
+
+    def _push(self, t):
+        quality = self._badness(t)
+        if quality is not None:
+            k = 3 * t
+            tri = self.triangulation.mesh.triangles
+            heapq.heappush(self._queue, (quality, t, tri[k], tri[k + 1], tri[k + 2]))
+
+    def _apexes(self, a, b):
+        """Wierzchołki naprzeciw krawędzi (a, b) w trójkątach obszaru"""
+        triangulation = self.triangulation
+        inside = self._inside
+        apexes = []
+        for t, u, w, _, _ in triangulation._star(a):
+            if inside[t] and (u == b or w == b):
+                apexes.append(w if u == b else u)
+        return apexes
+
+    def _encroached(self, a, b, apexes=None):
+        """Czy któryś wierzchołek leży wewnątrz okręgu o średnicy (a, b)"""
+        xs, ys = self.triangulation.mesh.xs, self.triangulation.mesh.ys
+        ax, ay, bx, by = xs[a], ys[a], xs[b], ys[b]
+        for p in (self._apexes(a, b) if apexes is None else apexes):
+            px, py = xs[p], ys[p]
+            if (ax - px) * (bx - px) + (ay - py) * (by - py) < 0:
+                return True
+        return False
+
+    def _place(self, x, y, cavity, boundary):
+        """Wstawia punkt we wnękę; nowe trójkąty dziedziczą przynależność do obszaru
+        po trójkątach wnęki przy tych samych krawędziach. Zwraca wierzchołek."""
+        triangulation = self.triangulation
+        mesh = triangulation.mesh
+        nbr = mesh.neighbors
+        inside = self._inside
+        # Trójkąt oparty na niepodzielonej krawędzi dzielonego odcinka leży po jego
+        # drugiej stronie (cienki trójkąt przy otoczce)
+        split = set(triangulation._split)
+        owners = [inside[outer] if (a, b) in split else inside[nbr[3 * outer + j]]
+                  for a, b, outer, j in boundary]
+        v = triangulation._add_vertex(x, y)
+        new = triangulation._insert(mesh, v, cavity, boundary)
+
+        slots = len(mesh.triangles) // 3
+        if len(inside) < slots:
+            inside.extend(bytes(slots - len(inside)))
+        tri = mesh.triangles
+        constraints = triangulation.constraints
+        for t, owner in zip(new, owners):
+            inside[t] = owner
+            if not owner:
+                continue
+            self._push(t)
+            # Krawędź naprzeciw nowego wierzchołka: czy v narusza odcinek
+            k = 3 * t
+            a, b = (tri[k], tri[k + 1]) if tri[k + 2] == v else \
+                (tri[k + 1], tri[k + 2]) if tri[k] == v else (tri[k + 2], tri[k])
+            if a != GHOST and b != GHOST and _key(a, b) in constraints \
+                    and self._encroached(a, b, [v]):
+                self._segments.append((a, b))
+        self.points_added += 1
+        return v
+
+    def _split_segment(self, a, b):
+        triangulation = self.triangulation
+        mesh = triangulation.mesh
+        x, y = (mesh.xs[a] + mesh.xs[b]) / 2, (mesh.ys[a] + mesh.ys[b]) / 2
+        # Wnęka obejmuje oba trójkąty przy odcinku, nawet gdy zaokrąglony
+        # środek nie leży dokładnie na nim
+        triangulation._forced = _key(a, b)
+        try:
+            found = triangulation._find_cavity(mesh, x, y)
+        finally:
+            triangulation._forced = None
+        if found is None:
+            triangulation._split = []
+            return
+        v = self._place(x, y, *found)
+        self.segment_splits += 1
+        for p, q in ((a, v), (v, b)):
+            if self._encroached(p, q):
+                self._segments.append((p, q))
+
+    def refine(self, triangulation):
+        """Poprawia kopię triangulacji, zwraca statystyki końcowe.
+
+        Przekazany obiekt się nie zmienia; poprawiona siatka (z punktami
+        Steinera i - gdy nie było brzegu - otoczką jako odcinkami
+        i ``remove_exterior``) jest w ``self.triangulation``.
+        """
+        if not isinstance(triangulation, ConstrainedDelaunayTriangulation):
+            raise TypeError("Poprawa jakości wymaga ConstrainedDelaunayTriangulation")
+        if not triangulation._initialized:
+            raise ValueError("Triangulacja jest pusta")
+        start_time = time.perf_counter()
+        triangulation = copy.deepcopy(triangulation)
+        self.triangulation = triangulation
+        self.points_added = 0
+        self.segment_splits = 0
+        self.skipped = 0
+        mesh = triangulation.mesh
+        tri, _ = mesh._arrays()
+
+        # Bez brzegu z odcinków brzegiem obszaru jest otoczka wypukła
+        if not triangulation.remove_exterior:
+            for a, b in tri[(tri[:, 2] == GHOST) & (tri[:, 0] >= 0), :2].tolist():
+                triangulation.constraints.add(_key(a, b))
+            triangulation.remove_exterior = True
+
+        # Przynależność miejsc trójkątów do obszaru
+        slots = np.flatnonzero((tri >= 0).all(axis=1))
+        simplices, neighbors = mesh.export()
+        inside = np.zeros(len(tri), dtype=np.uint8)
+        inside[slots[triangulation._domain(simplices, neighbors)]] = 1
+        self._inside = bytearray(inside.tobytes())
+
+        # Początkowa kolejka - metryki liczone wektorowo
+        self._queue = []
+        candidates = np.flatnonzero(inside)
+        if len(candidates):
+            quality, areas, angles = triangulation._statistics.calculate_batch(
+                triangulation.points, tri[candidates])
+            bad = np.zeros(len(candidates), dtype=bool)
+            if self.min_angle:
+                bad |= angles.min(axis=1) < self.min_angle
+            if self.min_quality is not None:
+                bad |= quality < self.min_quality
+            if self.max_area is not None:
+                bad |= areas > self.max_area
+            for t in candidates[bad].tolist():
+                self._push(t)
+        self._segments = [segment for segment in triangulation.constraints
+                          if self._encroached(*segment)]
+
+        xs, ys = mesh.xs, mesh.ys
+        limit = self.max_points
+        while limit is None or self.points_added < limit:
+            if self._segments:
+                a, b = self._segments.pop()
+                if _key(a, b) in triangulation.constraints and self._encroached(a, b):
+                    self._split_segment(a, b)
+                continue
+            if not self._queue:
+                break
+            quality, t, a, b, c = heapq.heappop(self._queue)
+            k = 3 * t
+            triangles = mesh.triangles
+            if (triangles[k], triangles[k + 1], triangles[k + 2]) != (a, b, c):
+                continue  # Trójkąt już nie istnieje
+            x, y = circumcenter(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c])
+            found = triangulation._find_cavity(mesh, x, y)
+            triangulation._split = []
+            if found is None or not self._inside[found[0][0]]:
+                # Środek poza obszarem (za brzegiem lub w dziurze) albo w istniejącym punkcie
+                self.skipped += 1
+                continue
+            # Środek okręgu naruszający odcinki - zamiast niego dzielone są odcinki
+            encroached = [(p, q) for p, q, _, _ in found[1]
+                          if p != GHOST and q != GHOST and _key(p, q) in triangulation.constraints
+                          and (xs[p] - x) * (xs[q] - x) + (ys[p] - y) * (ys[q] - y) < 0]
+            if encroached:
+                for p, q in encroached:
+                    if _key(p, q) in triangulation.constraints:
+                        self._split_segment(p, q)
+                heapq.heappush(self._queue, (quality, t, a, b, c))
+                continue
+            self._place(x, y, *found)
+
+        triangulation._stale = True
+        statistics = triangulation.statistics()
+        statistics['points_added'] = self.points_added
+        statistics['segment_splits'] = self.segment_splits
+        statistics['skipped'] = self.skipped
+        statistics['refinement_time'] = time.perf_counter() - start_time
+        return statistics
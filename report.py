@@ -0,0 +1,169 @@
+"""
+Wsadowe raporty triangulacji bez interfejsu graficznego
+
+Każdy zbiór punktów jest triangulowany, statystyki są liczone raz, a rysunki
+(PNG/SVG, backend Agg) i podsumowanie (JSON/CSV) trafiają do katalogu
+wyjściowego. Zbiory przetwarzane są równolegle w puli procesów.
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from delaunay_triangulation import ENGINES, triangulate_with
+from statistics_collector import TriangulationStatistics
+from visualization import Visualizer
+
+# Skalarne statystyki zapisywane w podsumowaniu
+SUMMARY_FIELDS = ('num_triangles', 'quality_mean', 'quality_median', 'quality_std',
+                  'quality_min', 'quality_max', 'area_mean', 'area_std', 'area_total',
+                  'angle_min', 'angle_max', 'angle_mean')
+CSV_FIELDS = ('dataset', 'engine', 'n_points', 'time') + SUMMARY_FIELDS + ('error',)
+# Większe siatki są w SVG osadzane jako obraz (osie i opisy zostają wektorowe)
+VECTOR_SVG_TRIANGLES = 5_000
+
+
+def load_points(source):
+    """Punkty z tablicy lub pliku .npy / tekstowego (x, y w wierszu)"""
+    if not isinstance(source, (str, os.PathLike)):
+        return np.asarray(source, dtype=np.float64)
+    if str(source).endswith('.npy'):
+        return np.load(source).astype(np.float64)
+    return np.loadtxt(source, delimiter=',' if str(source).endswith('.csv') else None,
+                      ndmin=2)[:, :2]
+
+
+def _report_dataset(task):
+    """Trianguluje jeden zbiór i zapisuje jego rysunki; zwraca wiersze podsumowania"""
+    name, source, output_dir, engines, formats = task
+    points = load_points(source)
+    stats_collector = TriangulationStatistics()
+    visualizer = Visualizer()
+
+    rows = []
+    results = {}
+    for engine in engines:
+        row = {'dataset': name, 'engine': engine, 'n_points': len(points)}
+        rows.append(row)
+        start_time = time.perf_counter()
+        try:
+            simplices = triangulate_with(engine, points)['simplices']
+        except Exception as error:  # np. QhullError - jeden zbiór nie przerywa całego raportu
+            row['error'] = f"{type(error).__name__}: {error}".splitlines()[0]
+            continue
+        row['time'] = time.perf_counter() - start_time
+        if len(simplices) == 0:
+            row['error'] = 'brak trójkątów (punkty współliniowe)'
+            continue
+        # Statystyki liczone raz i używane do rysunków oraz podsumowania
+        stats = stats_collector.calculate_statistics(points, simplices)
+        results[engine] = (simplices, stats)
+        row.update((field, float(stats[field])) for field in SUMMARY_FIELDS)
+
+    # Figure bez pyplot - brak globalnego stanu i blokującego plt.show()
+    fig = Figure(figsize=(7.5 * len(engines), 15))
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(2, len(engines), squeeze=False)
+    fig.suptitle(f'Triangulacja - {name}')
+    for column, engine in enumerate(engines):
+        if engine not in results:
+            axes[0, column].set_title(f"{engine}: {rows[column]['error']}")
+            continue
+        simplices, stats = results[engine]
+        visualizer.plot_triangulation(points, simplices, axes[0, column], engine)
+        visualizer.plot_triangulation_colored_by_quality(
+            points, simplices, stats['quality_values'], axes[1, column], f"{engine} (jakość)")
+    fig.tight_layout()
+    if max((len(simplices) for simplices, _ in results.values()), default=0) > VECTOR_SVG_TRIANGLES:
+        for ax in axes.flat:
+            for collection in ax.collections:
+                collection.set_rasterized(True)
+    for extension in formats:
+        fig.savefig(os.path.join(output_dir, f"{name}.{extension}"))
+    return rows
+
+
+def write_summary(rows, output_dir, summary_formats=('json',)):
+    """Zapisuje wiersze podsumowania jako summary.json i/lub summary.csv"""
+    paths = []
+    for extension in summary_formats:
+        path = os.path.join(output_dir, f"summary.{extension}")
+        with open(path, 'w', newline='') as file:
+            if extension == 'json':
+                json.dump(rows, file, indent=2)
+            elif extension == 'csv':
+                writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+                writer.writeheader()
+                writer.writerows(rows)
+            else:
+                raise ValueError(f"Nieznany format podsumowania: {extension!r}")
+        paths.append(path)
+    return paths
+
+
+def dataset_names(paths):
+    """Nazwy zbiorów z nazw plików bez rozszerzenia; przy powtórzonej nazwie
+    dołączane są kolejne katalogi ścieżki (a/points.npy -> a_points)"""
+    parts = [os.path.splitext(os.path.abspath(path))[0].split(os.sep) for path in paths]
+    depth = [1] * len(parts)
+    while True:
+        names = ['_'.join(p[-d:]) for p, d in zip(parts, depth)]
+        repeated = [i for i, name in enumerate(names) if names.count(name) > 1]
+        if not repeated:
+            return dict(zip(names, paths))
+        if all(depth[i] == len(parts[i]) for i in repeated):
+            raise ValueError(f"Powtórzony zbiór punktów: {paths[repeated[0]]}")
+        for i in repeated:
+            depth[i] = min(depth[i] + 1, len(parts[i]))
+
+
+def generate_report(datasets, output_dir, engines=('bowyer_watson', 'scipy'),
+                    formats=('png',), summary_formats=('json',), workers=None):
+    """Raport dla zbiorów punktów.
+
+    ``datasets`` to słownik nazwa -> tablica punktów lub ścieżka do pliku.
+    Zwraca listę wierszy podsumowania (zbiór x metoda).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = [(name, source, output_dir, tuple(engines), tuple(formats))
+             for name, source in datasets.items()]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_report_dataset, tasks))
+    else:
+        results = [_report_dataset(task) for task in tasks]
+    rows = [row for dataset_rows in results for row in dataset_rows]
+    write_summary(rows, output_dir, summary_formats)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('files', nargs='+', help='pliki .npy, .csv lub tekstowe z punktami')
+    parser.add_argument('--output', default='report')
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES), default=['bowyer_watson', 'scipy'])
+    parser.add_argument('--format', nargs='+', default=['png'], choices=['png', 'svg'])
+    parser.add_argument('--summary', nargs='+', default=['json'], choices=['json', 'csv'])
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    try:
+        datasets = dataset_names(args.files)
+    except ValueError as error:
+        parser.error(str(error))
+    start_time = time.perf_counter()
+    rows = generate_report(datasets, args.output, args.engines, args.format,
+                           args.summary, args.workers)
+    print(f"Raport dla {len(datasets)} zbiorów ({len(rows)} triangulacji) zapisany "
+          f"w {args.output} w {time.perf_counter() - start_time:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -42,7 +42,7 @@ class TriangulationStatistics:
         v1 = p2 - p1
         v2 = p3 - p1
         
-        area = 0.5 * abs(np.cross(v1, v2))
+        area = 0.5 * abs(v1[0] * v2[1] - v1[1] * v2[0])
         return area
     
     def calculate_angles(self, vertices):
@@ -66,33 +66,55 @@ class TriangulationStatistics:
         
         return np.degrees([angle1, angle2, angle3])
     
-    def calculate_statistics(self, points, simplices):
-        statistics = {
-            'num_triangles': len(simplices),
-            'quality_values': [],
-            'areas': [],
-            'angles': [],
-            'min_angles': [],
-            'max_angles': []
-        }
+    def calculate_batch(self, points, simplices):
+        """Oblicza jakość, pola i kąty wszystkich trójkątów naraz"""
+        points = np.asarray(points, dtype=np.float64)
+        simplices = np.asarray(simplices, dtype=np.intp).reshape(-1, 3)
+        p1 = points[simplices[:, 0]]
+        p2 = points[simplices[:, 1]]
+        p3 = points[simplices[:, 2]]
         
-        for simplex in simplices:
-            # Pobranie wierzchołków trójkąta
-            vertices = points[simplex]
-            
-            # Jakość kształtu
-            quality = self.calculate_triangle_quality(vertices)
-            statistics['quality_values'].append(quality)
+        # Wektory i długości boków (a naprzeciw p1, b naprzeciw p2, c naprzeciw p3)
+        v1 = p2 - p1
+        v2 = p3 - p1
+        v3 = p3 - p2
+        a = np.hypot(v3[:, 0], v3[:, 1])
+        b = np.hypot(v2[:, 0], v2[:, 1])
+        c = np.hypot(v1[:, 0], v1[:, 1])
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Jakość kształtu - wzór Herona, jak w calculate_triangle_quality
+            s = (a + b + c) / 2
+            heron = np.sqrt(np.maximum(s * (s - a) * (s - b) * (s - c), 0))
+            inradius = heron / s
+            circumradius = (a * b * c) / (4 * heron)
+            quality = np.where(circumradius > 0, inradius / circumradius, 0)
+            quality = np.minimum(np.nan_to_num(2 * quality), 1.0)
             
-            # Pole
-            area = self.calculate_triangle_area(vertices)
-            statistics['areas'].append(area)
+            # Pole z iloczynu wektorowego
+            areas = 0.5 * np.abs(v1[:, 0] * v2[:, 1] - v1[:, 1] * v2[:, 0])
             
-            # Kąty
-            angles = self.calculate_angles(vertices)
-            statistics['angles'].extend(angles)
-            statistics['min_angles'].append(np.min(angles))
-            statistics['max_angles'].append(np.max(angles))
+            # Kąty - prawo cosinusów
+            angle1 = np.arccos(np.clip(np.einsum('ij,ij->i', v1, v2) / (c * b), -1, 1))
+            angle2 = np.arccos(np.clip((a**2 + c**2 - b**2) / (2 * a * c), -1, 1))
+            angle3 = np.arccos(np.clip((a**2 + b**2 - c**2) / (2 * a * b), -1, 1))
+        angles = np.degrees(np.column_stack([angle1, angle2, angle3]))
+        
+        return quality, areas, angles
+    
+    def calculate_statistics(self, points, simplices):
+        return self.summarize_batch(*self.calculate_batch(points, simplices))
+    
+    def summarize_batch(self, quality_values, areas, angles):
+        """Statystyki zbiorcze z wyników calculate_batch"""
+        statistics = {
+            'num_triangles': len(quality_values),
+            'quality_values': quality_values,
+            'areas': areas,
+            'angles': angles.ravel(),
+            'min_angles': angles.min(axis=1),
+            'max_angles': angles.max(axis=1)
+        }
         
         # Obliczanie statystyk zbiorczych
         statistics['quality_mean'] = np.mean(statistics['quality_values'])
@@ -116,6 +138,22 @@ class TriangulationStatistics:
         
         return statistics
     
+    def calculate_streaming_statistics(self, points, simplices, chunk_size=100_000, **options):
+        """Statystyki liczone porcjami w pamięci niezależnej od liczby trójkątów.
+
+        ``simplices`` może być tablicą (także np.memmap) albo iterowalną
+        kolekcją porcji ``(k, 3)``. Zwraca te same klucze co calculate_statistics,
+        przy czym mediana jest przybliżona, a 'quality_values' to próbka.
+        """
+        accumulator = StreamingStatistics(**options)
+        if isinstance(simplices, np.ndarray):
+            chunks = (simplices[i:i + chunk_size] for i in range(0, len(simplices), chunk_size))
+        else:
+            chunks = simplices
+        for chunk in chunks:
+            accumulator.update(*self.calculate_batch(points, chunk))
+        return accumulator.result()
+    
     def print_statistics(self, stats):
         """Wyświetla statystyki w czytelnej formie"""
         print(f"Liczba trójkątów: {stats['num_triangles']}")
@@ -129,4 +167,110 @@ class TriangulationStatistics:
         print("\nKąty:")
         print(f"  Najmniejszy kąt: {stats['angle_min']:.2f}°")
         print(f"  Największy kąt: {stats['angle_max']:.2f}°")
-        print(f"  Średni kąt: {stats['angle_mean']:.2f}°")
\ No newline at end of file
+        print(f"  Średni kąt: {stats['angle_mean']:.2f}°")
+
+
+class RunningMoments:
+    """Średnia i wariancja liczone strumieniowo (Welford, łączenie porcji wg Chana)"""
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.total = 0.0
+    
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        n = len(values)
+        if n == 0:
+            return
+        chunk_mean = float(np.mean(values))
+        chunk_m2 = float(np.sum((values - chunk_mean) ** 2))
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, float(np.min(values)))
+        self.max = max(self.max, float(np.max(values)))
+        self.total += float(np.sum(values))
+    
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / self.count) if self.count else math.nan
+
+
+class StreamingStatistics:
+    """Akumulator statystyk triangulacji o pamięci O(liczba przedziałów histogramu)"""
+    
+    def __init__(self, bins=20, quantile_bins=1000, sample_size=10_000, seed=None):
+        self.bins = bins
+        self.quality = RunningMoments()
+        self.area = RunningMoments()
+        self.angle = RunningMoments()
+        # Drobny histogram jakości - źródło przybliżonych kwantyli
+        self.quantile_counts = np.zeros(quantile_bins, dtype=np.int64)
+        self.quality_histogram = np.zeros(bins, dtype=np.int64)
+        # Próbka rezerwuarowa wartości jakości (np. do histogramu na wykresie)
+        self.sample = np.empty(sample_size, dtype=np.float64)
+        self._rng = np.random.default_rng(seed)
+    
+    def update(self, quality_values, areas, angles):
+        """Dołącza porcję wyników calculate_batch"""
+        quality_values = np.asarray(quality_values, dtype=np.float64)
+        seen = self.quality.count
+        self.quality.update(quality_values)
+        self.area.update(areas)
+        self.angle.update(angles)
+        
+        self.quality_histogram += np.histogram(quality_values, bins=self.bins, range=(0, 1))[0]
+        self.quantile_counts += np.histogram(
+            quality_values, bins=len(self.quantile_counts), range=(0, 1))[0]
+        
+        # Algorytm R: element o numerze j trafia do próbki z prawdopodobieństwem k/j
+        k = len(self.sample)
+        fill = max(0, min(k - seen, len(quality_values)))
+        self.sample[seen:seen + fill] = quality_values[:fill]
+        rest = quality_values[fill:]
+        if len(rest):
+            positions = np.arange(seen + fill + 1, seen + len(quality_values) + 1)
+            slots = (self._rng.random(len(rest)) * positions).astype(np.int64)
+            keep = slots < k
+            self.sample[slots[keep]] = rest[keep]
+    
+    def quantile(self, q):
+        """Przybliżony kwantyl jakości z interpolacją wewnątrz przedziału"""
+        counts = self.quantile_counts
+        total = counts.sum()
+        if total == 0:
+            return math.nan
+        cumulative = np.cumsum(counts)
+        target = q * total
+        i = min(int(np.searchsorted(cumulative, target)), len(counts) - 1)
+        before = cumulative[i - 1] if i > 0 else 0
+        fraction = (target - before) / counts[i] if counts[i] else 0.0
+        width = 1.0 / len(counts)
+        value = (i + fraction) * width
+        return min(max(value, self.quality.min), self.quality.max)
+    
+    def result(self):
+        """Słownik z kluczami jak w TriangulationStatistics.calculate_statistics"""
+        return {
+            'num_triangles': self.quality.count,
+            'quality_values': self.sample[:min(self.quality.count, len(self.sample))].copy(),
+            'quality_mean': self.quality.mean,
+            'quality_median': self.quantile(0.5),
+            'quality_std': self.quality.std,
+            'quality_min': self.quality.min,
+            'quality_max': self.quality.max,
+            'area_mean': self.area.mean,
+            'area_std': self.area.std,
+            'area_total': self.area.total,
+            'angle_min': self.angle.min,
+            'angle_max': self.angle.max,
+            'angle_mean': self.angle.mean,
+            'quality_histogram': self.quality_histogram.copy(),
+            'quality_bins': np.linspace(0, 1, self.bins + 1)
+        }
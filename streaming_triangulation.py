@@ -0,0 +1,223 @@
+"""
+Triangulacja strumieniowa chmur punktów większych niż pamięć
+
+Punkty przychodzą porcjami posortowanymi wzdłuż osi x. Po każdej porcji
+trójkąty, których okrąg opisany leży w całości na lewo od ostatniego
+wczytanego x, są ostateczne - żaden przyszły punkt nie trafi do ich okręgu.
+Takie trójkąty trafiają od razu na dysk (MeshWriter) i są usuwane z siatki,
+a ich wierzchołki zwalniane. W pamięci zostaje tylko aktywny front.
+"""
+import time
+from array import array
+
+import numpy as np
+
+from bowyer_watson import BowyerWatsonTriangulation
+from insertion_order import insertion_order
+from mesh_io import MeshWriter
+from mesh_topology import circumcenters
+from predicates import orient2d
+from triangle_mesh import FREE, GHOST, TriangleMesh
+
+
+def read_point_chunks(path, chunk_size=1_000_000):
+    """Porcje punktów (k, 2) z pliku .npy lub surowego float64, bez wczytywania całości"""
+    if str(path).endswith('.npy'):
+        points = np.load(path, mmap_mode='r')
+    else:
+        points = np.memmap(path, dtype='<f8', mode='r').reshape(-1, 2)
+    for start in range(0, len(points), chunk_size):
+        yield np.array(points[start:start + chunk_size], dtype=np.float64)
+
+
+class StreamingTriangulation(BowyerWatsonTriangulation):
+    """Triangulacja Delaunay'a strumienia porcji punktów posortowanych po x.
+
+    Trójkąty usunięte z siatki zastępuje jeden stały trójkąt-ściana: trójkąty
+    frontu wskazują na niego jako sąsiada, nigdy nie jest w konflikcie,
+    a marsz, który na niego trafi, kończy się przeglądem aktywnych trójkątów.
+    Indeksy wierzchołków w pliku wynikowym to numery punktów w kolejności
+    strumienia.
+    """
+
+    def __init__(self, order='hilbert', margin=1e-9, **options):
+        super().__init__(search='walk', order=order, **options)
+        # Względny zapas przy porównaniu okręgu z linią finalizacji
+        self.margin = margin
+        self._wall = None
+
+    def _locate(self, mesh, px, py):
+        """Marsz widocznościowy omijający ścianę; przegląd frontu, gdy nie da się
+        jej ominąć"""
+        tri = mesh.triangles
+        nbr = mesh.neighbors
+        xs, ys = mesh.xs, mesh.ys
+        wall = self._wall
+        t = self._last
+        if tri[3 * t + 2] == GHOST:
+            if self._in_conflict(mesh, t, px, py):
+                return t
+            t = nbr[3 * t + 2]
+        previous = GHOST
+        while t != wall:
+            k = 3 * t
+            a, b, c = tri[k], tri[k + 1], tri[k + 2]
+            if c == GHOST:
+                return t
+            ax, ay, bx, by, cx, cy = xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]
+            blocked = False
+            for u, ux, uy, wx, wy in ((nbr[k + 2], ax, ay, bx, by), (nbr[k], bx, by, cx, cy),
+                                      (nbr[k + 1], cx, cy, ax, ay)):
+                if u != previous and orient2d(ux, uy, wx, wy, px, py) < 0:
+                    if u != wall:
+                        previous, t = t, u
+                        break
+                    blocked = True
+            else:
+                if blocked:
+                    break
+                if ((px == ax and py == ay) or (px == bx and py == by)
+                        or (px == cx and py == cy)):
+                    return None  # Punkt powtórzony
+                return t
+        # Marsz zatrzymany przez ścianę - dowolny trójkąt w konflikcie wystarczy,
+        # wnęka jest spójna. Kandydaci: trójkąty zawierające punkt (z tolerancją,
+        # test przybliżony), potem duchy, na końcu wszystkie trójkąty.
+        tri = np.frombuffer(mesh.triangles, dtype=np.int32).reshape(-1, 3)
+        solid = np.flatnonzero((tri >= 0).all(axis=1))
+        xs, ys = np.asarray(mesh.xs), np.asarray(mesh.ys)
+        corners = tri[solid]
+        x, y = xs[corners], ys[corners]
+        inside = np.ones(len(solid), dtype=bool)
+        for i in range(3):
+            j = (i + 1) % 3
+            cross = (x[:, j] - x[:, i]) * (py - y[:, i]) - (y[:, j] - y[:, i]) * (px - x[:, i])
+            inside &= cross >= -1e-9 * (np.abs(x[:, j] - x[:, i]) + np.abs(y[:, j] - y[:, i]))
+        ghosts = np.flatnonzero((tri[:, 2] == GHOST) & (tri[:, 0] >= 0))
+        del tri
+        for candidates in (solid[inside].tolist(), ghosts.tolist(), mesh.live_triangles()):
+            for t in candidates:
+                if self._in_conflict(mesh, t, px, py):
+                    return t
+        return None
+
+    def _add_point(self, x, y, index):
+        """Wierzchołek w wolnym miejscu lokalnym, zwraca jego indeks"""
+        mesh = self.mesh
+        if self._free_vertices:
+            v = self._free_vertices.pop()
+            mesh.xs[v] = x
+            mesh.ys[v] = y
+            self._global[v] = index
+            return v
+        self._global.append(index)
+        return mesh.add_point(x, y)
+
+    def _start(self, points, first):
+        """Siatka z pierwszych punktów, False gdy wszystkie są współliniowe"""
+        mesh = TriangleMesh(points)
+        order = insertion_order(points, self.order, self.seed).tolist()
+        if not self._build(mesh, order):
+            return False
+        self._buckets = None
+        self.mesh = mesh
+        self._global = array('q', range(first, first + len(points)))
+        self._free_vertices = []
+        # Ściana zastępująca sfinalizowane trójkąty: duch o zdegenerowanej
+        # krawędzi (a, a) ma pustą półpłaszczyznę, więc nigdy nie jest w konflikcie
+        a = mesh.triangles[3 * self._last]
+        self._wall = mesh.add_triangle(a, a, GHOST)
+        return True
+
+    def _finalize(self, bound, writer):
+        """Zapisuje i usuwa trójkąty z okręgiem na lewo od bound (None - wszystkie)"""
+        mesh = self.mesh
+        tri = np.frombuffer(mesh.triangles, dtype=np.int32).reshape(-1, 3)
+        nbr = np.frombuffer(mesh.neighbors, dtype=np.int32).reshape(-1, 3)
+        solid = np.flatnonzero((tri >= 0).all(axis=1))
+        if bound is None:
+            final = solid
+        else:
+            points = np.column_stack([mesh.xs, mesh.ys])
+            centers = circumcenters(points, tri[solid])
+            radii = np.hypot(*(centers - points[tri[solid, 0]]).T)
+            with np.errstate(invalid='ignore'):
+                right = centers[:, 0] + radii * (1 + self.margin)
+                final = solid[right < bound - self.margin * abs(bound)]
+        count = len(final)
+        if count:
+            writer.add_triangles(np.frombuffer(self._global, dtype=np.int64)[tri[final]])
+            # Sąsiedzi usuwanych trójkątów wskazują odtąd na ścianę
+            is_final = np.zeros(len(tri), dtype=bool)
+            is_final[final] = True
+            nbr[is_final[nbr] & ~is_final[:, None]] = self._wall
+            tri[final] = FREE
+            mesh.free.extend(final.tolist())
+            alive = tri[tri[:, 0] != FREE]
+            referenced = np.zeros(len(mesh.xs), dtype=bool)
+            referenced[alive[alive >= 0]] = True
+            self._free_vertices = np.flatnonzero(~referenced).tolist()
+            if tri[self._last, 0] == FREE or self._last == self._wall:
+                survivors = np.flatnonzero(tri[:, 0] != FREE)
+                self._last = int(survivors[survivors != self._wall][-1])
+        # Widoki na tablice blokują zmianę ich rozmiaru
+        del tri, nbr
+        return count
+
+    def triangulate_stream(self, chunks, path):
+        """Trianguluje porcje punktów (k, 2) do pliku siatki (mesh_io), zwraca podsumowanie.
+
+        Porcje muszą być niemalejące po x: najmniejsze x porcji nie może być
+        mniejsze niż największe x poprzednich. Plik zawiera wszystkie punkty
+        w kolejności strumienia i trójkąty w kolejności finalizacji.
+        """
+        start_time = time.perf_counter()
+        self.mesh = None
+        self._wall = None
+        peak_triangles = peak_vertices = chunks_read = 0
+        bound = None
+        pending = []
+        with MeshWriter(path) as writer:
+            for points in chunks:
+                points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+                if len(points) == 0:
+                    continue
+                if bound is not None and points[:, 0].min() < bound:
+                    raise ValueError("Porcje punktów muszą być posortowane po x")
+                first = writer.n_points
+                writer.add_points(points)
+                bound = float(points[:, 0].max())
+                chunks_read += 1
+
+                if self.mesh is None:
+                    # Punkty czekają, aż da się zbudować trójkąt startowy
+                    pending.append(points)
+                    buffered = np.concatenate(pending)
+                    offset = writer.n_points - len(buffered)
+                    if len(buffered) < 3 or not self._start(buffered, offset):
+                        continue
+                    pending = []
+                else:
+                    mesh = self.mesh
+                    order = insertion_order(points, self.order, self.seed).tolist()
+                    for i in order:
+                        x, y = float(points[i, 0]), float(points[i, 1])
+                        found = self._find_cavity(mesh, x, y)
+                        if found is not None:
+                            self._insert(mesh, self._add_point(x, y, first + i), *found)
+
+                peak_triangles = max(peak_triangles, len(self.mesh))
+                peak_vertices = max(peak_vertices, len(self.mesh.xs))
+                self._finalize(bound, writer)
+
+            if self.mesh is not None:
+                self._finalize(None, writer)
+            n_points, n_triangles = writer.n_points, writer.n_triangles
+        return {
+            'num_points': n_points,
+            'num_triangles': n_triangles,
+            'chunks': chunks_read,
+            'peak_triangles': peak_triangles,
+            'peak_vertices': peak_vertices,
+            'triangulation_time': time.perf_counter() - start_time
+        }
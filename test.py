@@ -1,12 +1,35 @@
 
+import json
+import os
+from types import SimpleNamespace
 import numpy as np
-import matplotlib.pyplot as plt
-from delaunay_triangulation import main, generate_test_points, run_triangulation_comparison
-from visualization import Visualizer
+from delaunay_triangulation import main, generate_test_points, run_triangulation_comparison, triangulate_with
 from statistics_collector import TriangulationStatistics
+from bowyer_watson import BowyerWatsonTriangulation, Triangle
+from incremental_triangulation import IncrementalTriangulation
+from parallel_triangulation import ParallelTriangulation
+from instrumentation import InsertionProfiler
+from mesh_io import load_mesh, save_triangulation
+from triangulation_cache import TriangulationCache
+from point_location import TriangulationQuery
+from interpolation import LinearInterpolator
+from constrained_triangulation import ConstrainedDelaunayTriangulation
+from refinement import DelaunayRefinement
+from mesh_topology import VoronoiDiagram, boundary_edges
+from batch_triangulation import triangulate_many
+from streaming_triangulation import StreamingTriangulation
+from alpha_shapes import AlphaShape
+from verification import compare_with_scipy, verify_triangulation
+from lawson_triangulation import LawsonTriangulation
+from triangle_mesh import neighbors_from_simplices
+from predicates import incircle, orient2d, orient2d_exact
+from triangulate import IMPORT_BUDGET, measure_import_time, main as triangulate_main
 
 def test_random_points():
     """Test na większym zbiorze losowych punktów"""
+    import matplotlib.pyplot as plt
+    from visualization import Visualizer
+    
     # Generowanie różnych konfiguracji punktów
     np.random.seed(42)
     
@@ -77,7 +100,500 @@ def test_random_points():
         )
         
         plt.tight_layout()
-        plt.show()
+        # Bez blokującego plt.show() - test działa bez interfejsu graficznego
+        plt.close(fig)
+
+
+def degenerate_point_sets():
+    """Siatka z powtórzeniami, punkty na okręgu ze środkiem i prawie współliniowe"""
+    grid = np.array([(x, y) for x in range(8) for y in range(8)], dtype=float)
+    angles = np.linspace(0, 2 * np.pi, 50, endpoint=False)
+    circle = np.vstack([np.column_stack([50 + 30 * np.cos(angles), 50 + 30 * np.sin(angles)]), [[50, 50]]])
+    line = np.vstack([np.column_stack([np.arange(20.0), 2 * np.arange(20.0)]), [[3, 0], [0, 3]]])
+    return [np.vstack([grid, grid[:5]]), circle, line]
+
+
+def test_walk_and_scan_give_the_same_mesh():
+    """Marsz po sąsiadach i przegląd wszystkich trójkątów znajdują te same wnęki"""
+    for points in [generate_test_points(300, seed=2)] + degenerate_point_sets():
+        walk = BowyerWatsonTriangulation(search='walk')
+        scan = BowyerWatsonTriangulation(search='scan')
+        walked, scanned = walk.triangulate(points), scan.triangulate(points)
+        assert set(map(tuple, np.sort(walked, axis=1))) == set(map(tuple, np.sort(scanned, axis=1)))
+        assert verify_triangulation(points, walked, walk.neighbors)['valid']
+        assert verify_triangulation(points, scanned, scan.neighbors)['valid']
+
+
+def test_insertion_orders_keep_caller_indexing():
+    """Porządki przestrzenne zwracają te same trójkąty w indeksach punktów wywołującego"""
+    points = generate_test_points(400, seed=14)
+    expected = set(map(tuple, np.sort(BowyerWatsonTriangulation(order='input').triangulate(points), axis=1)))
+    for order in ('hilbert', 'morton', 'brio'):
+        triangulation = BowyerWatsonTriangulation(order=order, seed=1)
+        simplices = triangulation.triangulate(points)
+        assert set(map(tuple, np.sort(simplices, axis=1))) == expected, order
+        # Orientacja CCW i sąsiedztwo liczone względem punktów w kolejności wejścia
+        assert verify_triangulation(points, simplices, triangulation.neighbors)['valid'], order
+
+
+def test_robust_predicates_on_degenerate_input():
+    """Dokładna ścieżka predykatów rozstrzyga remisy na okręgu, siatce i przy dużym przesunięciu"""
+    assert incircle(0.0, 0.0, 4.0, 0.0, 4.0, 4.0, 0.0, 4.0) == 0
+    assert orient2d(0.5, 0.5, 12.0, 12.0, 24.0, 24.0) == 0
+    # Punkt o ułamek ulp od prostej - wynik zgodny z arytmetyką dokładną
+    x = np.nextafter(0.5, 1.0)
+    assert orient2d(x, 0.5, 12.0, 12.0, 24.0, 24.0) == orient2d_exact(x, 0.5, 12.0, 12.0, 24.0, 24.0) != 0
+
+    grid = np.array([(x, y) for x in range(10) for y in range(10)], dtype=float)
+    circle_points = degenerate_point_sets()[1]
+    # Przesunięcie ~1e12: odstępy punktów bliskie ulp, wiele remisów i prawie współliniowych trójek
+    offset = generate_test_points(200, seed=15) * 1e-4 + 1e12
+    for points in (circle_points, grid, grid + 1e12, offset):
+        triangulation = BowyerWatsonTriangulation()
+        simplices = triangulation.triangulate(points)
+        assert sum(triangulation.predicate_fallbacks.values()) > 0
+        assert verify_triangulation(points, simplices, triangulation.neighbors)['valid']
+
+
+def test_batch_statistics_match_per_triangle():
+    """Statystyki wsadowe zgodne z obliczeniami dla pojedynczych trójkątów"""
+    points = generate_test_points(200, seed=7)
+    simplices = BowyerWatsonTriangulation().triangulate(points)
+    stats_collector = TriangulationStatistics()
+    
+    quality, areas, angles = stats_collector.calculate_batch(points, simplices)
+    for i, simplex in enumerate(simplices):
+        vertices = points[simplex]
+        assert np.isclose(quality[i], stats_collector.calculate_triangle_quality(vertices))
+        assert np.isclose(areas[i], stats_collector.calculate_triangle_area(vertices))
+        assert np.allclose(angles[i], stats_collector.calculate_angles(vertices))
+    
+    stats = stats_collector.calculate_statistics(points, simplices)
+    assert stats['num_triangles'] == len(simplices)
+    assert np.isclose(stats['area_total'], np.sum(areas))
+    assert stats['quality_histogram'].sum() == len(simplices)
+
+
+def test_streaming_statistics_match_batch():
+    """Statystyki strumieniowe zgodne z pełnymi statystykami"""
+    points = generate_test_points(500, seed=3)
+    simplices = BowyerWatsonTriangulation().triangulate(points)
+    stats_collector = TriangulationStatistics()
+    
+    full = stats_collector.calculate_statistics(points, simplices)
+    streamed = stats_collector.calculate_streaming_statistics(points, simplices, chunk_size=97)
+    for key in ('num_triangles', 'quality_mean', 'quality_std', 'quality_min', 'quality_max',
+                'area_mean', 'area_std', 'area_total', 'angle_min', 'angle_max', 'angle_mean'):
+        assert np.isclose(full[key], streamed[key]), key
+    assert np.array_equal(full['quality_histogram'], streamed['quality_histogram'])
+    assert abs(full['quality_median'] - streamed['quality_median']) < 1e-3
+
+
+def test_incremental_matches_full_triangulation():
+    """Wstawianie i usuwanie punktów daje tę samą siatkę co pełna triangulacja"""
+    points = generate_test_points(100, seed=11)
+    triangulation = IncrementalTriangulation(points[:60])
+    triangulation.insert_many(points[60:])
+    for vertex in range(0, 100, 3):
+        triangulation.remove(vertex)
+    
+    remaining = np.array([v for v in range(100) if v % 3])
+    expected = remaining[BowyerWatsonTriangulation().triangulate(points[remaining])]
+    canonical = lambda simplices: sorted(map(tuple, np.sort(simplices, axis=1).tolist()))
+    assert canonical(triangulation.simplices) == canonical(expected)
+    
+    stats = triangulation.statistics()
+    full = TriangulationStatistics().calculate_statistics(points, expected)
+    assert np.isclose(stats['area_total'], full['area_total'])
+    assert np.isclose(stats['quality_mean'], full['quality_mean'])
+
+
+def test_parallel_matches_serial_and_handles_ties():
+    """Pasy z naprawą szwów: bez remisów wynik szeregowy, z remisami poprawna triangulacja"""
+    points = generate_test_points(2000, seed=16)
+    expected = set(map(tuple, np.sort(BowyerWatsonTriangulation().triangulate(points), axis=1)))
+    for workers, strips in ((1, 4), (2, 3)):
+        triangulation = ParallelTriangulation(workers=workers, strips=strips)
+        simplices = triangulation.triangulate(points)
+        assert set(map(tuple, np.sort(simplices, axis=1))) == expected
+        assert triangulation.seam_points > 0
+
+    # Remisy: współrzędne całkowite z powtórzeniami i regularna siatka
+    integers = np.random.default_rng(16).integers(0, 40, (2000, 2)).astype(float)
+    grid = np.array([(x, y) for x in range(40) for y in range(30)], dtype=float)
+    for points in (integers, grid):
+        triangulation = ParallelTriangulation(workers=1, strips=4)
+        simplices = triangulation.triangulate(points)
+        assert verify_triangulation(points, simplices, triangulation.neighbors)['valid']
+
+
+def test_profiler_does_not_change_result():
+    """Profilowanie wstawień daje tę samą triangulację i liczy każde wstawienie"""
+    points = generate_test_points(300, seed=5)
+    records = []
+    profiler = InsertionProfiler(callback=records.append)
+    profiled = BowyerWatsonTriangulation(profiler=profiler).triangulate(points)
+    assert np.array_equal(profiled, BowyerWatsonTriangulation().triangulate(points))
+    summary = profiler.summary()
+    assert summary['insertions'] == len(records) == len(points) - 3
+    assert sum(profiler.histogram().values()) == len(records)
+
+
+def test_mesh_file_roundtrip(tmp_path):
+    """Zapis i odczyt siatki przez np.memmap zachowuje tablice i statystyki"""
+    points = generate_test_points(200, seed=9)
+    triangulation = BowyerWatsonTriangulation()
+    triangulation.triangulate(points)
+    path = tmp_path / 'mesh.bwm'
+    save_triangulation(path, triangulation, statistics=True)
+    
+    mesh = load_mesh(path)
+    assert np.array_equal(mesh.points, points)
+    assert np.array_equal(mesh.simplices, triangulation.simplices)
+    assert np.array_equal(mesh.neighbors, triangulation.neighbors)
+    full = TriangulationStatistics().calculate_statistics(points, triangulation.simplices)
+    assert np.isclose(mesh.statistics()['area_total'], full['area_total'])
+
+
+def test_cache_returns_stored_results(tmp_path):
+    """Powtórne wywołanie bierze wynik z pamięci, a potem z warstwy dyskowej"""
+    points = generate_test_points(150, seed=4)
+    cache = TriangulationCache(directory=tmp_path)
+    first = run_triangulation_comparison(points, cache=cache)
+    second = run_triangulation_comparison(points, cache=cache)
+    assert np.array_equal(first['bowyer_watson']['simplices'], second['bowyer_watson']['simplices'])
+    assert cache.metrics()['hits'] == 2 and cache.metrics()['misses'] == 2
+    
+    from_disk = TriangulationCache(directory=tmp_path)
+    third = run_triangulation_comparison(points, cache=from_disk)
+    assert np.isclose(third['scipy']['statistics']['quality_mean'],
+                      first['scipy']['statistics']['quality_mean'])
+    assert from_disk.metrics()['disk_hits'] == 2
+    
+    # Inne opcje silnika to inny klucz - także w nowej pamięci na tym samym katalogu
+    other = TriangulationCache(directory=tmp_path)
+    fresh = run_triangulation_comparison(points, cache=other, order='input')
+    assert other.metrics()['misses'] == 1 and other.metrics()['disk_hits'] == 1
+    expected = triangulate_with('bowyer_watson', points, order='input')['simplices']
+    assert np.array_equal(fresh['bowyer_watson']['simplices'], expected)
+
+
+def test_point_queries_match_brute_force():
+    """find_simplex zgadza się ze scipy, nearest_vertex z przeglądem wszystkich punktów"""
+    from scipy.spatial import Delaunay
+    points = generate_test_points(300, seed=12)
+    triangulation = BowyerWatsonTriangulation()
+    triangulation.triangulate(points)
+    query = TriangulationQuery.from_triangulation(triangulation)
+    queries = np.random.default_rng(1).random((2000, 2)) * 120 - 10
+    
+    simplices = query.find_simplex(queries)
+    assert np.array_equal(simplices < 0, Delaunay(points).find_simplex(queries) < 0)
+    inside = simplices >= 0
+    transform = query.transform[simplices[inside]]
+    coordinates = np.einsum('kij,kj->ki', transform[:, :2], queries[inside] - transform[:, 2])
+    assert (coordinates >= -1e-9).all() and (coordinates.sum(axis=1) <= 1 + 1e-9).all()
+    
+    distances = np.linalg.norm(points[None, :, :] - queries[:, None, :], axis=2)
+    nearest = query.nearest_vertex(queries)
+    assert np.allclose(distances[np.arange(len(queries)), nearest], distances.min(axis=1))
+
+
+def test_linear_interpolation_is_exact_for_planes():
+    """Interpolacja barycentryczna odtwarza funkcje liniowe w każdym kanale"""
+    points = generate_test_points(200, seed=8)
+    values = np.column_stack([2 * points[:, 0] - points[:, 1] + 3, points[:, 1]])
+    triangulation = BowyerWatsonTriangulation()
+    triangulation.triangulate(points)
+    interpolator = LinearInterpolator(triangulation, values)
+    queries = np.random.default_rng(3).random((1000, 2)) * 120 - 10
+    result = interpolator(queries)
+    inside = ~np.isnan(result[:, 0])
+    expected = np.column_stack([2 * queries[:, 0] - queries[:, 1] + 3, queries[:, 1]])
+    assert inside.any() and not inside.all()
+    assert np.allclose(result[inside], expected[inside])
+    grid = interpolator.regrid(np.linspace(20, 80, 7), np.linspace(30, 70, 5))
+    assert grid.shape == (5, 7, 2)
+
+
+def test_constrained_segments_and_holes():
+    """Odcinki wymuszone są krawędziami siatki, a dziura i zewnętrze są puste"""
+    angles = np.linspace(0, 2 * np.pi, 41)[:-1]
+    outer = np.column_stack([50 + 40 * np.cos(angles), 50 + 40 * np.sin(angles)])
+    inner = np.column_stack([50 + 10 * np.cos(angles), 50 + 10 * np.sin(angles)])
+    points = np.vstack([generate_test_points(300, seed=9), outer, inner])
+    ring = np.arange(40)
+    segments = np.vstack([np.column_stack([300 + ring, 300 + (ring + 1) % 40]),
+                          np.column_stack([340 + ring, 340 + (ring + 1) % 40])])
+    triangulation = ConstrainedDelaunayTriangulation(points, segments, holes=[(50, 50)],
+                                                     remove_exterior=True, seed=0)
+    triangulation.insert((50, 20))
+    simplices = triangulation.simplices
+    edges = {tuple(sorted(edge)) for triangle in simplices.tolist()
+             for edge in zip(triangle, triangle[1:] + triangle[:1])}
+    assert all(tuple(sorted(segment)) in edges for segment in segments.tolist())
+    radius = np.hypot(*(triangulation.points[simplices].mean(axis=1) - 50).T)
+    assert radius.min() > 9 and radius.max() < 40
+
+
+def test_refinement_meets_angle_and_area_bounds():
+    """Po poprawie wszystkie trójkąty spełniają kąt minimalny i ograniczenie pola"""
+    points = generate_test_points(100, seed=10)
+    triangulation = ConstrainedDelaunayTriangulation(points, seed=0)
+    before = TriangulationStatistics().calculate_statistics(points, triangulation.simplices)
+    stats = DelaunayRefinement(min_angle=25, max_area=20).refine(triangulation)
+    assert stats['angle_min'] >= 25 and stats['areas'].max() <= 20
+    assert np.isclose(stats['area_total'], before['area_total'])
+    assert stats['points_added'] > 0
+    # Przekazana triangulacja się nie zmienia, poprawiona jest w refinement.triangulation
+    assert not triangulation.remove_exterior and not triangulation.constraints
+    assert len(triangulation.points) == len(points)
+    
+    # Bez ograniczenia kąta poprawiane jest tylko pole
+    refinement = DelaunayRefinement(min_angle=None, max_area=20)
+    stats = refinement.refine(triangulation)
+    assert stats['areas'].max() <= 20 and refinement.points_added > 0
+
+
+def test_edges_and_voronoi_match_scipy():
+    """Krawędzie, brzeg i komórki Voronoi zgodne z scipy.spatial"""
+    from scipy.spatial import ConvexHull, Voronoi
+    points = generate_test_points(300, seed=11)
+    triangulation = BowyerWatsonTriangulation()
+    simplices = triangulation.triangulate(points)
+    edges = triangulation.get_edges()
+    assert len(edges) == len(points) + len(simplices) - 1
+    assert len(boundary_edges(simplices)) == len(ConvexHull(points).vertices)
+
+    voronoi = VoronoiDiagram.from_triangulation(triangulation)
+    reference = Voronoi(points)
+    for p in range(len(points)):
+        region = reference.regions[reference.point_region[p]]
+        assert voronoi.unbounded[p] == (-1 in region)
+        if not voronoi.unbounded[p]:
+            cell = voronoi.vertices[voronoi.region(p)]
+            assert np.allclose(np.sort(cell, axis=0), np.sort(reference.vertices[region], axis=0))
+    ridges = reference.ridge_points[(reference.ridge_points == 0).any(axis=1)]
+    assert np.array_equal(np.sort(voronoi.cell_neighbors(0)), np.sort(ridges.sum(axis=1)))
+
+
+def test_triangulate_many_matches_separate_calls():
+    """Wynik spakowany odpowiada osobnym triangulacjom i ich statystykom"""
+    rng = np.random.default_rng(12)
+    point_sets = [rng.random((size, 2)) for size in (3, 40, 2, 120)]
+    batch = triangulate_many(point_sets)
+    assert len(batch) == 4 and len(batch[2]) == 0
+    for i, points in enumerate(point_sets):
+        expected = BowyerWatsonTriangulation().triangulate(points)
+        assert np.array_equal(batch[i], expected)
+        if len(expected):
+            stats = TriangulationStatistics().calculate_statistics(points, expected)
+            assert np.isclose(batch.statistics['quality_mean'][i], stats['quality_mean'])
+            assert np.isclose(batch.statistics['angle_min'][i], stats['angle_min'])
+
+
+def test_streaming_matches_in_memory_triangulation(tmp_path):
+    """Triangulacja strumieniowa daje te same trójkąty, trzymając w pamięci tylko front"""
+    rng = np.random.default_rng(11)
+    points = rng.random((3000, 2)) * 100
+    points = points[np.argsort(points[:, 0])]
+    chunks = [points[start:start + 300] for start in range(0, len(points), 300)]
+    path = tmp_path / 'stream.bwmesh'
+    summary = StreamingTriangulation().triangulate_stream(chunks, str(path))
+    assert summary['peak_vertices'] < len(points) / 2
+
+    stream = np.sort(np.asarray(load_mesh(str(path)).simplices), axis=1)
+    reference = np.sort(BowyerWatsonTriangulation().triangulate(points), axis=1)
+    assert set(map(tuple, stream)) == set(map(tuple, reference))
+
+
+def test_alpha_shape_sweep_matches_filtering():
+    """Seria alfa zgadza się z filtrowaniem trójkątów po promieniu okręgu opisanego"""
+    rng = np.random.default_rng(5)
+    points = np.vstack([rng.normal(center, 3, (150, 2)) for center in ([25, 25], [75, 75])])
+    simplices = BowyerWatsonTriangulation().triangulate(points)
+    shape = AlphaShape(points, simplices)
+    alphas = [0.5, 3.0, 10.0, np.inf]
+    sweep = shape.sweep(alphas)
+    for i, alpha in enumerate(alphas):
+        kept = [simplex for simplex in simplices if Triangle(*points[simplex]).circumradius <= alpha]
+        assert sweep['num_triangles'][i] == len(kept)
+        assert sweep['components'][i] == shape.components(alpha)[0]
+        edges = boundary_edges(np.array(kept).reshape(-1, 3))
+        lengths = np.hypot(*(points[edges[:, 0]] - points[edges[:, 1]]).T).sum()
+        assert np.isclose(sweep['perimeter'][i], lengths)
+        assert sum(len(loop) for loop in shape.polygons(alpha)) == len(edges)
+    # Dwa odległe klastry: przy alfa = 10 dwie części, przy inf - otoczka wypukła
+    assert list(sweep['components'][2:]) == [2, 1]
+    assert len(shape.polygons(np.inf)) == 1
+
+
+def flip_convex_edge(points, simplices, neighbors, triangles):
+    """Odwraca pierwszą krawędź wewnętrzną wypukłego czworokąta przy jednym z trójkątów (w miejscu)"""
+    for t in triangles:
+        for i in np.flatnonzero(neighbors[t] >= 0):
+            u = neighbors[t, i]
+            j = list(neighbors[u]).index(t)
+            a, b, c, d = simplices[t, i], simplices[t, (i + 1) % 3], simplices[t, (i + 2) % 3], simplices[u, j]
+            flipped = np.array([[a, b, d], [d, c, a]])
+            if all((points[f[1], 0] - points[f[0], 0]) * (points[f[2], 1] - points[f[0], 1])
+                   - (points[f[2], 0] - points[f[0], 0]) * (points[f[1], 1] - points[f[0], 1]) > 0
+                   for f in flipped):
+                simplices[t], simplices[u] = flipped
+                return t, u
+
+
+def test_verifier_accepts_delaunay_and_rejects_flipped_edge():
+    """Weryfikator akceptuje triangulację (także z remisami na siatce) i wykrywa odwróconą krawędź"""
+    grid = np.array([(x, y) for x in range(12) for y in range(12)], dtype=float)
+    for points in (generate_test_points(500, seed=3), np.vstack([grid, grid[:5]])):
+        triangulation = BowyerWatsonTriangulation()
+        simplices = triangulation.triangulate(points)
+        result = verify_triangulation(points, simplices, triangulation.neighbors, compare=True)
+        assert result['valid'] and result['ties_only']
+
+    # Odwrócenie krawędzi wypukłego czworokąta: poprawna topologia, zły okrąg
+    points = generate_test_points(200, seed=4)
+    triangulation = BowyerWatsonTriangulation()
+    simplices = triangulation.triangulate(points).copy()
+    flip_convex_edge(points, simplices, triangulation.neighbors, range(len(simplices)))
+    result = verify_triangulation(points, simplices, compare=True)
+    assert result['delaunay_violations'] == 1 and not result['valid']
+    assert result['not_ccw'] == 0 and result['area_error'] < 1e-9
+
+
+def test_reference_errors_do_not_hide_other_differences():
+    """Błąd scipy tłumaczy tylko różnice przy łamiących krawędziach, nie różnice w innym miejscu"""
+    points = generate_test_points(300, seed=6)
+    triangulation = BowyerWatsonTriangulation()
+    simplices = triangulation.triangulate(points)
+    neighbors = triangulation.neighbors
+    by_x = np.argsort(points[simplices].mean(axis=1)[:, 0])
+    # Wynik odniesienia z odwróconą krawędzią po lewej stronie
+    reference = simplices.copy()
+    flip_convex_edge(points, reference, neighbors, by_x)
+    reference = SimpleNamespace(simplices=reference, neighbors=neighbors_from_simplices(reference))
+    result = compare_with_scipy(points, simplices, reference)
+    assert result['reference_violations'] == 1 and result['reference_errors_only']
+
+    # Różnica po prawej stronie nie jest tłumaczona błędem odniesienia
+    ours = simplices.copy()
+    flip_convex_edge(points, ours, neighbors, by_x[::-1])
+    result = compare_with_scipy(points, ours, reference)
+    assert result['reference_violations'] == 1 and not result['reference_errors_only']
+
+
+def test_lawson_engine_matches_bowyer_watson():
+    """Silnik z zamianami krawędzi daje tę samą triangulację i jest porównywany obok pozostałych"""
+    for order in (None, 'hilbert'):
+        points = generate_test_points(400, seed=8)
+        lawson = LawsonTriangulation(order=order)
+        simplices = lawson.triangulate(points)
+        reference = BowyerWatsonTriangulation(order=order).triangulate(points)
+        assert set(map(tuple, np.sort(simplices, axis=1))) == set(map(tuple, np.sort(reference, axis=1)))
+        assert verify_triangulation(points, simplices, lawson.neighbors)['valid']
+        assert lawson.flips > 0
+
+    results = run_triangulation_comparison(points, engines=('bowyer_watson', 'lawson', 'scipy'))
+    assert all(results[engine]['time'] > 0 for engine in results)
+    assert len(results['lawson']['simplices']) == len(results['scipy']['simplices'])
+
+
+def test_lawson_accepts_profiler_and_scan_search():
+    """Silnik z zamianami przyjmuje profiler i search='scan' jak BowyerWatsonTriangulation"""
+    points = generate_test_points(300, seed=13)
+    expected = LawsonTriangulation().triangulate(points)
+    profiler = InsertionProfiler()
+    profiled = LawsonTriangulation(profiler=profiler)
+    assert np.array_equal(profiled.triangulate(points), expected)
+    summary = profiler.summary()
+    assert summary['insertions'] == len(points) - 3
+    assert all(summary['phases'][phase] > 0 for phase in ('locate', 'cavity', 'insert'))
+    assert summary['cavity_sizes']['total'] == summary['insertions'] + profiled.flips
+
+    scanned = LawsonTriangulation(search='scan').triangulate(points)
+    assert set(map(tuple, np.sort(scanned, axis=1))) == set(map(tuple, np.sort(expected, axis=1)))
+
+
+def test_core_import_is_light_and_cli_runs_headless(tmp_path):
+    """Rdzeń importuje się bez scipy i matplotlib w budżecie czasu, CLI i main() działają bez GUI"""
+    result = measure_import_time()
+    assert result['heavy_modules'] == []
+    assert result['import_time'] < IMPORT_BUDGET
+    figures = main(tmp_path / 'figures')
+    assert len(figures) == 3 and all(os.path.exists(path) for path in figures)
+
+    points = generate_test_points(300, seed=9)
+    np.save(tmp_path / 'points.npy', points)
+    assert triangulate_main([str(tmp_path / 'points.npy'), '--output', str(tmp_path / 'mesh.bin'),
+                             '--statistics', str(tmp_path / 'stats.json')]) == 0
+    mesh = load_mesh(tmp_path / 'mesh.bin')
+    reference = BowyerWatsonTriangulation(order='hilbert').triangulate(points)
+    assert set(map(tuple, np.sort(mesh.simplices, axis=1))) == set(map(tuple, np.sort(reference, axis=1)))
+    assert mesh.has_statistics
+    with open(tmp_path / 'stats.json') as file:
+        assert json.load(file)['num_triangles'] == len(reference)
+
+
+def test_plots_use_collections_or_raster_images():
+    """Siatka wektorowo jako jedna kolekcja (każda krawędź raz), przy lod=True jako obraz"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.collections import LineCollection, PolyCollection
+    from matplotlib.figure import Figure
+    from matplotlib.image import AxesImage
+    from visualization import Visualizer
+    points = generate_test_points(200, seed=13)
+    triangulation = BowyerWatsonTriangulation()
+    simplices = triangulation.triangulate(points)
+    quality = TriangulationStatistics().calculate_statistics(points, simplices)['quality_values']
+    visualizer = Visualizer()
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    vector, colored, raster, raster_colored = fig.subplots(2, 2).flat
+    visualizer.plot_triangulation(points, simplices, vector)
+    visualizer.plot_triangulation_colored_by_quality(points, simplices, quality, colored)
+    visualizer.plot_triangulation(points, simplices, raster, lod=True)
+    visualizer.plot_triangulation_colored_by_quality(points, simplices, quality, raster_colored,
+                                                     lod=True)
+    fig.canvas.draw()
+
+    lines = [c for c in vector.collections if isinstance(c, LineCollection)]
+    assert len(lines) == 1 and len(lines[0].get_segments()) == len(triangulation.get_edges())
+    polygons = [c for c in colored.collections if isinstance(c, PolyCollection)]
+    assert len(polygons) == 1 and len(polygons[0].get_paths()) == len(simplices)
+    for ax in (raster, raster_colored):
+        assert len(ax.images) == 1 and isinstance(ax.images[0], AxesImage)
+        assert not any(isinstance(c, (LineCollection, PolyCollection)) for c in ax.collections)
+    # Powyżej max_vector_triangles obraz jest wybierany automatycznie
+    visualizer.max_vector_triangles = len(simplices) - 1
+    assert len(visualizer.plot_triangulation(points, simplices, fig.add_subplot()).images) == 1
+
+
+def test_report_keeps_same_named_files_apart(tmp_path):
+    """Raport dwóch plików o tej samej nazwie: osobne zbiory, podsumowanie JSON/CSV i rysunki"""
+    import csv
+    from report import dataset_names, main as report_main
+    paths = []
+    for folder, seed in (('a', 1), ('b', 2)):
+        os.makedirs(tmp_path / folder)
+        paths.append(str(tmp_path / folder / 'points.npy'))
+        np.save(paths[-1], generate_test_points(60, seed=seed))
+    assert list(dataset_names(paths)) == ['a_points', 'b_points']
+
+    output = tmp_path / 'report'
+    report_main(paths + ['--output', str(output), '--summary', 'json', 'csv', '--workers', '1'])
+    with open(output / 'summary.json') as file:
+        rows = json.load(file)
+    with open(output / 'summary.csv', newline='') as file:
+        table = list(csv.DictReader(file))
+    assert [(line['dataset'], line['engine'], float(line['num_triangles'])) for line in table] == \
+        [(row['dataset'], row['engine'], row['num_triangles']) for row in rows]
+    assert sorted((row['dataset'], row['engine']) for row in rows) == [
+        ('a_points', 'bowyer_watson'), ('a_points', 'scipy'),
+        ('b_points', 'bowyer_watson'), ('b_points', 'scipy')]
+    assert all(row['num_triangles'] > 0 and 'error' not in row for row in rows)
+    assert os.path.exists(output / 'a_points.png') and os.path.exists(output / 'b_points.png')
 
 
 if __name__ == "__main__":
@@ -87,4 +603,4 @@ if __name__ == "__main__":
     print("\n2. Test różnych konfiguracji punktów...")
     test_random_points()
     
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,144 @@
+"""
+Indeksowa, tablicowa struktura siatki trójkątów
+"""
+from array import array
+
+import numpy as np
+
+# Wierzchołek w nieskończoności - trójkąty-duchy domykają otoczkę wypukłą
+GHOST = -1
+# Znacznik zwolnionego miejsca w tablicy trójkątów
+FREE = -2
+
+
+class TriangleMesh:
+    """Siatka trójkątów przechowywana w płaskich tablicach int32.
+
+    Trójkąt ``t`` zajmuje pozycje ``3*t .. 3*t+2`` w tablicy ``triangles``
+    (wierzchołki w kolejności przeciwnej do ruchu wskazówek zegara),
+    a ``neighbors[3*t + i]`` to trójkąt leżący naprzeciw wierzchołka ``i``.
+    Każda krawędź otoczki ma po drugiej stronie trójkąt-ducha ``(u, v, GHOST)``,
+    dzięki czemu każdy trójkąt ma zawsze trzech sąsiadów.
+    """
+
+    def __init__(self, points):
+        self._points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        # Listy floatów - szybki dostęp skalarny w pętli wstawiania
+        self.xs = self._points[:, 0].tolist()
+        self.ys = self._points[:, 1].tolist()
+        self.triangles = array('i')
+        self.neighbors = array('i')
+        self.free = []
+
+    @property
+    def points(self):
+        """Współrzędne wierzchołków jako tablica (n, 2)"""
+        if len(self._points) != len(self.xs):
+            self._points = np.column_stack([self.xs, self.ys]).reshape(-1, 2)
+        return self._points
+
+    def add_point(self, x, y):
+        """Dopisuje wierzchołek, zwraca jego indeks"""
+        self.xs.append(float(x))
+        self.ys.append(float(y))
+        return len(self.xs) - 1
+
+    def __len__(self):
+        """Liczba zajętych miejsc (łącznie z duchami)"""
+        return len(self.triangles) // 3 - len(self.free)
+
+    def add_triangle(self, a, b, c, na=GHOST, nb=GHOST, nc=GHOST):
+        """Dodaje trójkąt (a, b, c), zwraca jego indeks"""
+        if self.free:
+            t = self.free.pop()
+            k = 3 * t
+            self.triangles[k] = a
+            self.triangles[k + 1] = b
+            self.triangles[k + 2] = c
+            self.neighbors[k] = na
+            self.neighbors[k + 1] = nb
+            self.neighbors[k + 2] = nc
+            return t
+        t = len(self.triangles) // 3
+        self.triangles.extend((a, b, c))
+        self.neighbors.extend((na, nb, nc))
+        return t
+
+    def remove_triangle(self, t):
+        """Zwalnia miejsce trójkąta t"""
+        k = 3 * t
+        self.triangles[k] = FREE
+        self.triangles[k + 1] = FREE
+        self.triangles[k + 2] = FREE
+        self.free.append(t)
+
+    def is_ghost(self, t):
+        """Czy trójkąt t jest trójkątem-duchem (duch zawsze na pozycji 2)"""
+        return self.triangles[3 * t + 2] == GHOST
+
+    def is_alive(self, t):
+        return self.triangles[3 * t] != FREE
+
+    def link(self, t, i, u, j):
+        """Łączy krawędź naprzeciw wierzchołka i w t z krawędzią naprzeciw j w u"""
+        self.neighbors[3 * t + i] = u
+        self.neighbors[3 * u + j] = t
+
+    def neighbor_index(self, t, u):
+        """Pozycja w t, naprzeciw której leży sąsiad u"""
+        k = 3 * t
+        nbr = self.neighbors
+        if nbr[k] == u:
+            return 0
+        if nbr[k + 1] == u:
+            return 1
+        return 2
+
+    def live_triangles(self):
+        """Iteruje po indeksach zajętych miejsc"""
+        tri = self.triangles
+        for t in range(len(tri) // 3):
+            if tri[3 * t] != FREE:
+                yield t
+
+    def _arrays(self):
+        tri = np.frombuffer(self.triangles, dtype=np.int32).reshape(-1, 3).copy()
+        nbr = np.frombuffer(self.neighbors, dtype=np.int32).reshape(-1, 3).copy()
+        return tri, nbr
+
+    def export(self):
+        """Zwraca (simplices, neighbors) w formacie scipy.spatial.Delaunay"""
+        tri, nbr = self._arrays()
+        solid = (tri >= 0).all(axis=1)
+        # Przenumerowanie miejsc na zwarte indeksy, duchy i wolne -> -1
+        remap = np.full(len(tri) + 1, -1, dtype=np.int32)
+        remap[:-1][solid] = np.arange(np.count_nonzero(solid), dtype=np.int32)
+        simplices = tri[solid]
+        neighbors = remap[nbr[solid]]
+        return simplices, neighbors
+
+    @property
+    def nbytes(self):
+        """Pamięć zajmowana przez topologię siatki w bajtach"""
+        return (self.triangles.itemsize * len(self.triangles)
+                + self.neighbors.itemsize * len(self.neighbors))
+
+
+def neighbors_from_simplices(simplices):
+    """Tablica sąsiadów (m, 3) w formacie scipy dla simplices zorientowanych CCW"""
+    simplices = np.asarray(simplices, dtype=np.int64).reshape(-1, 3)
+    if len(simplices) == 0:
+        return np.empty((0, 3), dtype=np.int32)
+    n = int(simplices.max()) + 1
+    # Krawędź naprzeciw wierzchołka i to (s[i+1], s[i+2]), sąsiad ma ją odwróconą
+    start = simplices[:, [1, 2, 0]].ravel()
+    end = simplices[:, [2, 0, 1]].ravel()
+    keys = start * n + end
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    reverse = end * n + start
+    pos = np.minimum(np.searchsorted(sorted_keys, reverse), len(keys) - 1)
+    found = sorted_keys[pos] == reverse
+    neighbors = np.full(len(keys), -1, dtype=np.int32)
+    neighbors[found] = order[pos[found]] // 3
+    return neighbors.reshape(-1, 3)
@@ -0,0 +1,127 @@
+"""
+Triangulacja z wiersza poleceń bez interfejsu graficznego
+
+    python triangulate.py points.npy --output mesh.bin --statistics stats.json
+
+Import rdzenia (silniki, statystyki, zapis siatki) wymaga tylko NumPy;
+scipy jest ładowane dopiero dla --engine scipy i --verify, a matplotlib
+wcale. --import-time mierzy czas importu rdzenia w świeżym interpreterze
+i kończy się błędem po przekroczeniu IMPORT_BUDGET.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from delaunay_triangulation import ENGINE_OPTIONS, ENGINES, triangulate_with
+from insertion_order import ORDERS
+from statistics_collector import TriangulationStatistics
+
+# Moduły biblioteki (bez warstwy rysunków - visualization, report - i pomiarów)
+# oraz zależności, których ich import nie może pociągać
+CORE_MODULES = ('predicates', 'triangle_mesh', 'insertion_order', 'bowyer_watson',
+                'lawson_triangulation', 'incremental_triangulation', 'constrained_triangulation',
+                'refinement', 'streaming_triangulation', 'batch_triangulation',
+                'parallel_triangulation', 'statistics_collector', 'mesh_io', 'mesh_topology',
+                'point_location', 'interpolation', 'alpha_shapes', 'verification',
+                'triangulation_cache', 'delaunay_triangulation', 'triangulate')
+HEAVY_MODULES = ('scipy', 'matplotlib')
+# Budżet czasu importu wszystkich modułów rdzenia w sekundach (razem z NumPy)
+IMPORT_BUDGET = 1.5
+
+SUMMARY_FIELDS = ('num_triangles', 'quality_mean', 'quality_median', 'quality_std',
+                  'quality_min', 'quality_max', 'area_mean', 'area_std', 'area_total',
+                  'angle_min', 'angle_max', 'angle_mean')
+
+
+def load_points(path):
+    """Punkty (n, 2) z pliku .npy lub tekstowego (x, y w wierszu, .csv z przecinkami)"""
+    if str(path).endswith('.npy'):
+        return np.load(path).astype(np.float64).reshape(-1, 2)
+    return np.loadtxt(path, delimiter=',' if str(path).endswith('.csv') else None,
+                      ndmin=2)[:, :2]
+
+
+def export(path, points, simplices, neighbors, statistics=False):
+    """Zapis wyniku wg rozszerzenia: .npz, .npy i .csv (simplices), inne - plik mesh_io"""
+    path = str(path)
+    if path.endswith('.npz'):
+        np.savez(path, points=points, simplices=simplices, neighbors=neighbors)
+    elif path.endswith('.npy'):
+        np.save(path, np.asarray(simplices))
+    elif path.endswith('.csv'):
+        np.savetxt(path, simplices, fmt='%d', delimiter=',')
+    else:
+        from mesh_io import save_mesh
+        save_mesh(path, points, simplices, neighbors, statistics)
+
+
+def measure_import_time(modules=CORE_MODULES):
+    """Czas importu modułów w świeżym interpreterze i załadowane przy tym ciężkie zależności"""
+    code = ("import json, sys, time\n"
+            "start = time.perf_counter()\n"
+            + "".join(f"import {module}\n" for module in modules)
+            + "elapsed = time.perf_counter() - start\n"
+            f"heavy = sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)\n"
+            "print(json.dumps([elapsed, heavy]))\n")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    elapsed, heavy = json.loads(output)
+    return {'import_time': elapsed, 'heavy_modules': heavy, 'budget': IMPORT_BUDGET}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Triangulacja Delaunay'a z pliku punktów")
+    parser.add_argument('points', nargs='?', help="plik .npy lub tekstowy (.csv, .txt)")
+    parser.add_argument('--engine', choices=list(ENGINES), default='bowyer_watson')
+    parser.add_argument('--order', choices=ORDERS, default=ENGINE_OPTIONS['order'])
+    parser.add_argument('--output', help="plik wynikowy: .npz, .npy, .csv albo plik siatki mesh_io")
+    parser.add_argument('--statistics', nargs='?', const='-', metavar='PATH',
+                        help="podsumowanie statystyk jako JSON (bez ścieżki - na stdout)")
+    parser.add_argument('--verify', action='store_true', help="weryfikacja własności Delaunay'a")
+    parser.add_argument('--import-time', action='store_true',
+                        help=f"czas importu rdzenia względem budżetu {IMPORT_BUDGET} s")
+    args = parser.parse_args(argv)
+
+    if args.import_time:
+        result = measure_import_time()
+        print(json.dumps(result))
+        return 0 if result['import_time'] <= IMPORT_BUDGET and not result['heavy_modules'] else 1
+    if args.points is None:
+        parser.error("brak pliku punktów")
+
+    points = load_points(args.points)
+    result = triangulate_with(args.engine, points, order=args.order)
+    simplices, neighbors = result['simplices'], result['neighbors']
+    summary = {'n_points': len(points), 'engine': args.engine, 'time': result['time']}
+
+    # Kolumny jakości liczone raz - do podsumowania i do pliku siatki
+    quality = False
+    if args.statistics is not None:
+        quality = TriangulationStatistics().calculate_batch(points, simplices)
+    if args.output:
+        export(args.output, points, simplices, neighbors, quality)
+    if args.statistics is not None:
+        stats = TriangulationStatistics().summarize_batch(*quality)
+        summary.update((field, float(stats[field])) for field in SUMMARY_FIELDS)
+        summary['num_triangles'] = int(stats['num_triangles'])
+    if args.verify:
+        from verification import verify_triangulation
+        check = verify_triangulation(points, simplices, neighbors)
+        summary['valid'] = bool(check['valid'])
+        summary['delaunay_violations'] = int(check['delaunay_violations'])
+
+    text = json.dumps(summary, indent=2)
+    if args.statistics not in (None, '-'):
+        with open(args.statistics, 'w') as file:
+            file.write(text + '\n')
+    else:
+        print(text)
+    return 0 if summary.get('valid', True) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
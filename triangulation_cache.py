@@ -0,0 +1,128 @@
+"""
+Pamięć podręczna wyników triangulacji adresowana zawartością
+
+Kluczem jest skrót bajtów tablicy punktów i opcji metody. Wpisy (tablice
+numpy i wartości skalarne) trzymane są w pamięci z usuwaniem najdawniej
+używanych (LRU) po przekroczeniu budżetu bajtów, opcjonalnie także na dysku.
+"""
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+
+def cache_key(points, engine, **options):
+    """Skrót bajtów punktów (float64) oraz nazwy i opcji metody"""
+    points = np.ascontiguousarray(points, dtype=np.float64)
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr((points.shape, engine, sorted(options.items()))).encode())
+    digest.update(points.data)
+    return digest.hexdigest()
+
+
+def _entry_nbytes(entry):
+    return sum(value.nbytes if isinstance(value, np.ndarray) else 8 for value in entry.values())
+
+
+class TriangulationCache:
+    """Pamięć LRU z budżetem bajtów i opcjonalną warstwą dyskową (pliki .npz)"""
+
+    def __init__(self, max_bytes=256 * 2**20, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self._entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries or (self.directory is not None
+                                        and os.path.exists(self._path(key)))
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def _store(self, key, entry):
+        # Tablice tylko do odczytu - wynik jest współdzielony między wywołaniami
+        for value in entry.values():
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+        nbytes = _entry_nbytes(entry)
+        if nbytes > self.max_bytes:
+            return
+        if key in self._entries:
+            self.nbytes -= _entry_nbytes(self._entries.pop(key))
+        self._entries[key] = entry
+        self.nbytes += nbytes
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= _entry_nbytes(evicted)
+            self.evictions += 1
+
+    def get(self, key):
+        """Wpis (słownik) lub None"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        if self.directory is not None and os.path.exists(self._path(key)):
+            with np.load(self._path(key)) as data:
+                # Tablice 0-wymiarowe to zapisane wartości skalarne
+                entry = {name: data[name][()] if data[name].ndim == 0 else data[name]
+                         for name in data.files}
+            self._store(key, entry)
+            self.disk_hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def put(self, key, entry):
+        """Zapisuje wpis w pamięci i (jeśli skonfigurowano) na dysku"""
+        entry = dict(entry)
+        self._store(key, entry)
+        if self.directory is not None:
+            # Zapis do pliku tymczasowego i podmiana - brak częściowych wpisów
+            handle, temporary = tempfile.mkstemp(dir=self.directory, suffix='.npz')
+            with os.fdopen(handle, 'wb') as file:
+                np.savez(file, **entry)
+            os.replace(temporary, self._path(key))
+        return entry
+
+    def get_or_compute(self, key, compute):
+        """Wpis z pamięci podręcznej albo wynik compute() zapisany pod kluczem"""
+        entry = self.get(key)
+        if entry is None:
+            entry = self.put(key, compute())
+        return entry
+
+    def clear(self, disk=False):
+        self._entries.clear()
+        self.nbytes = 0
+        if disk and self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith('.npz'):
+                    os.remove(os.path.join(self.directory, name))
+
+    def metrics(self):
+        """Liczniki trafień i chybień oraz zajętość pamięci"""
+        requests = self.hits + self.disk_hits + self.misses
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': (self.hits + self.disk_hits) / requests if requests else 0.0,
+            'entries': len(self._entries),
+            'nbytes': self.nbytes,
+            'max_bytes': self.max_bytes
+        }
@@ -0,0 +1,237 @@
+"""
+Automatyczna weryfikacja triangulacji Delaunay'a, liczona wektorowo
+
+Sprawdzane są: orientacja i spójność sąsiedztwa, lokalna własność
+Delaunay'a na każdej krawędzi wewnętrznej (w poprawnej triangulacji
+równoważna pustym okręgom opisanym), pokrycie otoczki wypukłej i obecność
+wszystkich punktów oraz zgodność z scipy.spatial.Delaunay z dokładnością
+do remisów (punktów współokręgowych). scipy jest importowane dopiero
+w check_coverage i compare_with_scipy.
+"""
+import numpy as np
+
+from predicates import incircle_signs, orient2d_signs
+from statistics_collector import TriangulationStatistics
+from triangle_mesh import neighbors_from_simplices
+
+
+def _opposite(simplices, neighbors):
+    """Dla każdej krawędzi wewnętrznej (t < u): t, u, pozycja w t i wierzchołek u naprzeciw t.
+
+    Zwraca też liczbę krawędzi, których sąsiedztwo nie jest wzajemne
+    lub nie dzieli tych samych wierzchołków.
+    """
+    m = len(simplices)
+    t, i = np.nonzero(neighbors >= 0)
+    u = neighbors[t, i]
+    once = t < u
+    t, i, u = t[once], i[once], u[once]
+    back = neighbors[u] == t[:, None]
+    j = np.argmax(back, axis=1)
+    # Krawędź (v[i+1], v[i+2]) w t musi być krawędzią (v[j+2], v[j+1]) w u
+    same_edge = ((simplices[t, (i + 1) % 3] == simplices[u, (j + 2) % 3])
+                 & (simplices[t, (i + 2) % 3] == simplices[u, (j + 1) % 3]))
+    valid = back.any(axis=1) & same_edge
+    # Sąsiedzi wskazujący na t z drugiej strony, ale nie przez t
+    mutual = np.zeros((m, 3), dtype=bool)
+    mutual[t[valid], i[valid]] = True
+    inward = np.zeros((m, 3), dtype=bool)
+    inward[u[valid], j[valid]] = True
+    broken = np.count_nonzero((neighbors >= 0) & ~mutual & ~inward)
+    return t[valid], u[valid], i[valid], simplices[u[valid], j[valid]], broken
+
+
+def _prepare(points, simplices, neighbors):
+    points = np.asarray(points, dtype=np.float64)
+    simplices = np.asarray(simplices, dtype=np.int64).reshape(-1, 3)
+    if neighbors is None:
+        neighbors = neighbors_from_simplices(simplices)
+    return points, simplices, np.asarray(neighbors, dtype=np.int64).reshape(-1, 3)
+
+
+def _topology(points, simplices, pairs):
+    orientation = orient2d_signs(points[simplices[:, 0]], points[simplices[:, 1]],
+                                 points[simplices[:, 2]])
+    return {
+        'not_ccw': int(np.count_nonzero(orientation <= 0)),
+        'broken_neighbors': int(pairs[4])
+    }
+
+
+def _violations(points, simplices, pairs):
+    t, u, _, apex, _ = pairs
+    corners = points[simplices[t]]
+    violated = incircle_signs(corners[:, 0], corners[:, 1], corners[:, 2], points[apex]) > 0
+    return np.column_stack([t[violated], u[violated]])
+
+
+def check_topology(points, simplices, neighbors=None):
+    """Trójkąty zdegenerowane lub zorientowane CW i niespójne sąsiedztwo"""
+    points, simplices, neighbors = _prepare(points, simplices, neighbors)
+    return _topology(points, simplices, _opposite(simplices, neighbors))
+
+
+def check_empty_circumcircles(points, simplices, neighbors=None):
+    """Krawędzie wewnętrzne naruszające warunek Delaunay'a jako pary trójkątów (k, 2).
+
+    Dla każdej krawędzi jeden test incircle: wierzchołek sąsiada naprzeciw
+    krawędzi względem okręgu opisanego trójkąta. Punkty na okręgu (remisy)
+    nie są naruszeniem.
+    """
+    points, simplices, neighbors = _prepare(points, simplices, neighbors)
+    return _violations(points, simplices, _opposite(simplices, neighbors))
+
+
+def check_coverage(points, simplices):
+    """Czy każdy punkt (poza powtórzonymi) jest wierzchołkiem i czy trójkąty pokrywają otoczkę.
+
+    Pole łączne (jak ``area_total`` z TriangulationStatistics) porównywane jest
+    z polem otoczki wypukłej; przy poprawnej orientacji i spójnym sąsiedztwie
+    równość pól wyklucza dziury i nakładanie się trójkątów.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    simplices = np.asarray(simplices, dtype=np.int64).reshape(-1, 3)
+    used = np.zeros(len(points), dtype=bool)
+    used[simplices.ravel()] = True
+    missing = 0
+    if not used.all():
+        # Nieużyte punkty są dopuszczalne tylko jako kopie użytych
+        _, first, inverse = np.unique(points, axis=0, return_index=True, return_inverse=True)
+        represented = np.zeros(len(first), dtype=bool)
+        represented[inverse.ravel()[used]] = True
+        missing = int(np.count_nonzero(~represented[inverse.ravel()]))
+
+    from scipy.spatial import ConvexHull
+
+    # Pola liczone względem lokalnego początku układu - przy dużym przesunięciu
+    # (np. współrzędne ~1e12) różnice bezwzględnych współrzędnych tracą cyfry
+    local = points - points.min(axis=0) if len(points) else points
+    _, areas, _ = TriangulationStatistics().calculate_batch(local, simplices)
+    area_total = float(areas.sum())
+    hull_area = float(ConvexHull(local).volume) if len(simplices) else 0.0
+    return {
+        'missing_points': missing,
+        'area_total': area_total,
+        'hull_area': hull_area,
+        'area_error': abs(area_total - hull_area) / hull_area if hull_area else 0.0
+    }
+
+
+def _canonical_keys(simplices, n):
+    """Klucze trójkątów niezależne od kolejności wierzchołków"""
+    rows = np.sort(np.asarray(simplices, dtype=np.int64).reshape(-1, 3), axis=1)
+    if n ** 3 < 2 ** 63:
+        return (rows[:, 0] * n + rows[:, 1]) * n + rows[:, 2]
+    return np.ascontiguousarray(rows).view([('', np.int64)] * 3).ravel()
+
+
+def _cocircular(points, simplices, neighbors, triangles):
+    """Maska trójkątów mających krawędź, przez którą sąsiad leży na ich okręgu (remis)"""
+    if len(triangles) == 0:
+        return np.zeros(0, dtype=bool)
+    corners = simplices[triangles]
+    rows = neighbors[triangles]
+    tie = np.zeros(len(triangles), dtype=bool)
+    for i in range(3):
+        u = rows[:, i]
+        inner = np.flatnonzero(u >= 0)
+        if len(inner) == 0:
+            continue
+        back = neighbors[u[inner]] == triangles[inner, None]
+        apex = simplices[u[inner], np.argmax(back, axis=1)]
+        c = points[corners[inner]]
+        tie[inner] |= incircle_signs(c[:, 0], c[:, 1], c[:, 2], points[apex]) == 0
+    return tie
+
+
+def compare_with_scipy(points, simplices, reference=None):
+    """Porównanie kanoniczne (posortowane wierzchołki) z scipy.spatial.Delaunay.
+
+    Różne trójkąty są dopuszczalne tylko wewnątrz komórek z co najmniej
+    czterema punktami na jednym okręgu: każdy z nich musi mieć sąsiada
+    leżącego na swoim okręgu, w obu triangulacjach. Qhull nie liczy
+    dokładnie, więc przy punktach prawie współokręgowych różnice mogą
+    wynikać z błędów scipy - ``reference_violations`` to liczba krawędzi
+    wyniku scipy łamiących warunek Delaunay'a, a ``reference_errors_only``
+    mówi, czy każdy spójny obszar różnic zawiera trójkąt scipy przy takiej
+    krawędzi (albo składa się z samych remisów), a nasze różniące się trójkąty
+    mają wierzchołki tylko z tych obszarów.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    simplices = np.asarray(simplices, dtype=np.int64).reshape(-1, 3)
+    if reference is None:
+        from scipy.spatial import Delaunay
+        reference = Delaunay(points)
+    expected = np.asarray(reference.simplices, dtype=np.int64)
+    expected_neighbors = np.asarray(reference.neighbors, dtype=np.int64)
+    # scipy nie gwarantuje orientacji CCW - odwrócenie z zamianą sąsiadów
+    clockwise = orient2d_signs(points[expected[:, 0]], points[expected[:, 1]],
+                               points[expected[:, 2]]) < 0
+    expected[clockwise] = expected[clockwise][:, [0, 2, 1]]
+    expected_neighbors[clockwise] = expected_neighbors[clockwise][:, [0, 2, 1]]
+
+    ours = _canonical_keys(simplices, len(points))
+    theirs = _canonical_keys(expected, len(points))
+    only_ours = np.flatnonzero(~np.isin(ours, theirs))
+    only_reference = np.flatnonzero(~np.isin(theirs, ours))
+    identical = len(only_ours) == 0 and len(only_reference) == 0
+    tie_ours = _cocircular(points, simplices, neighbors_from_simplices(simplices), only_ours)
+    tie_reference = _cocircular(points, expected, expected_neighbors, only_reference)
+    ties_only = bool(tie_ours.all() and tie_reference.all())
+    reference_violations = 0
+    reference_errors_only = ties_only
+    if not ties_only:
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        violated = _violations(points, expected, _opposite(expected, expected_neighbors))
+        reference_violations = len(violated)
+        # Obszary różnic: trójkąty scipy spoza naszego wyniku połączone krawędziami
+        index = np.full(len(expected) + 1, -1, dtype=np.int64)
+        index[only_reference] = np.arange(len(only_reference))
+        pairs = np.column_stack([np.repeat(np.arange(len(only_reference)), 3),
+                                 index[expected_neighbors[only_reference].ravel()]])
+        pairs = pairs[pairs[:, 1] >= 0]
+        k = len(only_reference)
+        _, labels = connected_components(coo_matrix(
+            (np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(k, k)), directed=False)
+        suspect = np.isin(only_reference, violated.ravel())
+        explained = np.zeros(labels.max() + 1 if k else 0, dtype=bool)
+        explained[labels[suspect]] = True
+        unexplained = np.bincount(labels[~tie_reference], minlength=len(explained)) > 0
+        near = np.zeros(len(points), dtype=bool)
+        near[expected[only_reference].ravel()] = True
+        reference_errors_only = bool(
+            (explained | ~unexplained).all()
+            and (tie_ours | near[simplices[only_ours]].all(axis=1)).all())
+    return {
+        'identical': identical,
+        'only_ours': len(only_ours),
+        'only_reference': len(only_reference),
+        'ties_only': ties_only,
+        'reference_violations': reference_violations,
+        'reference_errors_only': reference_errors_only
+    }
+
+
+def verify_triangulation(points, simplices, neighbors=None, compare=False, tolerance=1e-9):
+    """Pełna weryfikacja, słownik wyników z kluczem ``valid``.
+
+    ``compare=True`` dodaje porównanie z scipy.spatial.Delaunay (wymaga jego
+    triangulacji - droższe niż pozostałe testy); różnice są akceptowane, gdy
+    są remisami albo leżą przy krawędziach, na których wynik scipy łamie
+    warunek Delaunay'a.
+    """
+    points, simplices, neighbors = _prepare(points, simplices, neighbors)
+    pairs = _opposite(simplices, neighbors)
+    result = _topology(points, simplices, pairs)
+    result['delaunay_violations'] = len(_violations(points, simplices, pairs))
+    result.update(check_coverage(points, simplices))
+    result['valid'] = (result['not_ccw'] == 0 and result['broken_neighbors'] == 0
+                       and result['delaunay_violations'] == 0 and result['missing_points'] == 0
+                       and result['area_error'] <= tolerance)
+    if compare:
+        comparison = compare_with_scipy(points, simplices)
+        result.update(comparison)
+        result['valid'] = result['valid'] and comparison['reference_errors_only']
+    return result
@@ -3,24 +3,71 @@ Moduł do wizualizacji triangulacji i statystyk
 """
 import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.patches import Polygon
+from matplotlib.collections import LineCollection, PolyCollection
+
+from mesh_topology import unique_edges
 
 class Visualizer:
     """Klasa do wizualizacji triangulacji"""
     
-    def plot_triangulation(self, points, simplices, ax=None, title="Triangulacja Delaunay'a"):
-        """Rysuje triangulację"""
+    # Powyżej tylu trójkątów siatka jest rysowana jako obraz o stałej rozdzielczości
+    max_vector_triangles = 200_000
+    raster_resolution = 1024
+    
+    def _use_raster(self, simplices, lod):
+        if lod is None:
+            return len(simplices) > self.max_vector_triangles
+        return lod
+    
+    def _raster(self, points, simplices, weights=None, chunk_size=1_000_000):
+        """Obraz siatki: liczba (lub średnia wag) trójkątów na piksel, wg środków ciężkości.
+        
+        Trójkąty są przetwarzane porcjami, więc działa także dla np.memmap z mesh_io.
+        """
+        lo = points.min(axis=0)
+        hi = points.max(axis=0)
+        # Kilka trójkątów na piksel, aby obraz nie był szumem pojedynczych trójkątów
+        bins = int(min(self.raster_resolution, max(1, np.sqrt(len(simplices) / 4))))
+        extent_range = [[lo[0], hi[0]], [lo[1], hi[1]]]
+        counts = np.zeros((bins, bins))
+        sums = np.zeros((bins, bins))
+        for i in range(0, len(simplices), chunk_size):
+            centroids = points[simplices[i:i + chunk_size]].mean(axis=1)
+            counts += np.histogram2d(centroids[:, 0], centroids[:, 1], bins=bins,
+                                     range=extent_range)[0]
+            if weights is not None:
+                sums += np.histogram2d(centroids[:, 0], centroids[:, 1], bins=bins,
+                                       range=extent_range, weights=weights[i:i + chunk_size])[0]
+        if weights is None:
+            image = counts
+        else:
+            with np.errstate(invalid='ignore'):
+                image = sums / counts
+        image = np.ma.masked_where(counts == 0, image)
+        return image.T, (lo[0], hi[0], lo[1], hi[1])
+    
+    def plot_triangulation(self, points, simplices, ax=None, title="Triangulacja Delaunay'a",
+                           lod=None):
+        """Rysuje triangulację.
+        
+        Krawędzie są jedną kolekcją linii; przy ``lod=True`` (domyślnie powyżej
+        ``max_vector_triangles`` trójkątów) rysowana jest gęstość siatki jako obraz.
+        """
         if ax is None:
             fig, ax = plt.subplots(figsize=(10, 10))
-        
-        # Rysowanie trójkątów
-        for simplex in simplices:
-            triangle = points[simplex]
-            poly = Polygon(triangle, fill=False, edgecolor='b', linewidth=1)
-            ax.add_patch(poly)
-        
-        # Rysowanie punktów
-        ax.scatter(points[:, 0], points[:, 1], c='r', s=30, zorder=5)
+        points = np.asarray(points)
+        
+        if self._use_raster(simplices, lod):
+            image, extent = self._raster(points, simplices)
+            ax.imshow(image, origin='lower', extent=extent, cmap='Blues',
+                      interpolation='nearest', aspect='auto')
+        else:
+            # Rysowanie krawędzi (każda raz) i punktów
+            if len(simplices):
+                edges = unique_edges(simplices)
+                ax.add_collection(LineCollection(points[edges], colors='b', linewidths=1))
+            ax.scatter(points[:, 0], points[:, 1], c='r', s=30, zorder=5)
+            ax.autoscale_view()
         
         ax.set_aspect('equal')
         ax.set_title(title)
@@ -73,9 +120,16 @@ class Visualizer:
         
         return ax
     
-    def plot_statistics_comparison(self, stats_dict):
-        """Porównuje statystyki różnych metod"""
-        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+    def plot_statistics_comparison(self, stats_dict, fig=None):
+        """Porównuje statystyki różnych metod.
+        
+        Z ``fig`` (matplotlib.figure.Figure) rysuje na niej bez plt.show().
+        """
+        interactive = fig is None
+        if interactive:
+            fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+        else:
+            axes = fig.subplots(2, 2)
         fig.suptitle('Porównanie statystyk triangulacji')
         
         methods = list(stats_dict.keys())
@@ -116,32 +170,39 @@ class Visualizer:
         ax.set_ylabel('Maksymalny kąt [°]')
         ax.set_title('Największy kąt w triangulacji')
         
-        plt.tight_layout()
-        plt.show()
+        if interactive:
+            plt.tight_layout()
+            plt.show()
+        return fig
     
     def plot_triangulation_colored_by_quality(self, points, simplices, quality_values, 
-                                            ax=None, title="Triangulacja z jakością kształtów"):
+                                            ax=None, title="Triangulacja z jakością kształtów",
+                                            lod=None):
         """Rysuje triangulację z kolorami odpowiadającymi jakości kształtów"""
         if ax is None:
             fig, ax = plt.subplots(figsize=(10, 10))
         
         # Normalizacja kolorów
         from matplotlib.colors import Normalize
-        from matplotlib.cm import ScalarMappable
         
         norm = Normalize(vmin=0, vmax=1)
-        sm = ScalarMappable(norm=norm, cmap='viridis')
-        
-        # Rysowanie trójkątów z kolorami
-        for simplex, quality in zip(simplices, quality_values):
-            triangle = points[simplex]
-            color = sm.to_rgba(quality)
-            poly = Polygon(triangle, facecolor=color, edgecolor='black', 
-                          linewidth=0.5, alpha=0.8)
-            ax.add_patch(poly)
-        
-        # Rysowanie punktów
-        ax.scatter(points[:, 0], points[:, 1], c='red', s=20, zorder=5)
+        points = np.asarray(points)
+        
+        if self._use_raster(simplices, lod):
+            # Średnia jakość trójkątów w pikselu
+            image, extent = self._raster(points, simplices, quality_values)
+            sm = ax.imshow(image, origin='lower', extent=extent, cmap='viridis', norm=norm,
+                           interpolation='nearest', aspect='auto')
+        else:
+            # Wszystkie trójkąty jako jedna kolekcja kolorowana jakością
+            sm = PolyCollection(points[simplices], array=np.asarray(quality_values),
+                                cmap='viridis', norm=norm, edgecolor='black',
+                                linewidth=0.5, alpha=0.8)
+            ax.add_collection(sm)
+            
+            # Rysowanie punktów
+            ax.scatter(points[:, 0], points[:, 1], c='red', s=20, zorder=5)
+            ax.autoscale_view()
         
         ax.set_aspect('equal')
         ax.set_title(title)
@@ -149,7 +210,7 @@ class Visualizer:
         ax.set_ylabel('Y')
         
         # Kolorowa skala
-        cbar = plt.colorbar(sm, ax=ax)
+        cbar = ax.figure.colorbar(sm, ax=ax)
         cbar.set_label('Jakość kształtu')
         
         return ax
\ No newline at end of file